@@ -0,0 +1,29 @@
+"""
+Streaming Exports
+/export endpoints ka common response - body chunks mein jaati hai
+(StreamingResponse), file ka naam Content-Disposition mein.
+Rows app.services.exports ke producers se aati hain.
+"""
+from datetime import date
+from typing import Optional, Sequence
+
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+
+from app.services.exports import EXPORT_FORMATS, EXPORT_MEDIA_TYPES, ExportBatches, encode_export
+
+ExportFormatQuery = Query("csv", alias="format", pattern="^(" + "|".join(EXPORT_FORMATS) + ")$")
+
+
+def export_filename(name: str, fmt: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> str:
+    """bookings_2025-04-01_2026-03-31.csv - range na ho toh sirf naam"""
+    parts = [name] + [day.isoformat() for day in (start_date, end_date) if day]
+    return "_".join(parts) + "." + fmt
+
+
+def export_response(batches: ExportBatches, columns: Sequence[str], fmt: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        encode_export(batches, columns, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,139 @@
+"""
+Idempotency Keys
+POST /bookings aur POST /payments par `Idempotency-Key` header. Pehli
+request ka response (status + body) TTL tak yaad rehta hai; same key ka
+retry handler dobara chalaye bina wahi response replay karta hai.
+Ek saath aaye duplicates ek hi in-flight Flight par wait karte hain, isliye
+sirf ek handler chalta hai. Pehli request cancel ho (client disconnect) toh
+wait kar raha duplicate khud handler chalata hai.
+
+Store process-local hai (OrderedDict, insertion order = expiry order).
+Sirf 2xx response yaad rehta hai - 4xx (jaise inventory full par 409) aur 5xx
+ka retry handler dobara chalata hai, kyunki baad mein woh succeed ho sakta hai.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Annotated, Awaitable, Callable, Hashable, Optional, Tuple, Type
+
+from fastapi import Header, HTTPException, Response, status
+from pydantic import BaseModel
+
+from app.core.config import get_settings
+from app.services.cache import Flight, FlightCancelled
+
+settings = get_settings()
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+IdempotencyKey = Annotated[
+    Optional[str],
+    Header(alias="Idempotency-Key", min_length=1, max_length=255,
+           description="Retry-safe POST - same key par pehla response replay hota hai")
+]
+
+# (status_code, body bytes)
+StoredResponse = Tuple[int, bytes]
+
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    flight: "Flight[StoredResponse]"
+    expires_at: float
+
+
+class IdempotencyStore:
+    """Key -> stored response, TTL aur max size ke saath"""
+
+    def __init__(self, ttl_seconds: int, max_keys: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.expires_at > now and len(self._entries) <= self.max_keys:
+                break
+            # In-flight entry size limit ki wajah se nahi hatni chahiye
+            if not entry.flight.done() and entry.expires_at > now:
+                break
+            self._entries.popitem(last=False)
+
+    async def run(
+        self,
+        scope: Hashable,
+        key: Optional[str],
+        request_body: BaseModel,
+        handler: Callable[[], Awaitable[object]],
+        response_model: Type[BaseModel],
+        status_code: int = status.HTTP_200_OK,
+    ) -> Response:
+        """
+        handler() ko idempotently chalata hai. key None ho toh seedha chalta hai.
+        Same key + alag body par 422.
+        """
+        if key is None:
+            return _encode(await handler(), response_model, status_code)
+
+        self._evict()
+        store_key = (scope, key)
+        fingerprint = hashlib.sha256(request_body.model_dump_json().encode()).hexdigest()
+
+        while (entry := self._entries.get(store_key)) is not None:
+            if entry.fingerprint != fingerprint:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Idempotency-Key was already used with a different request body"
+                )
+            # Pehli request abhi chal rahi ho toh uske khatam hone ka intezaar
+            try:
+                stored_status, body = await entry.flight.wait()
+            except FlightCancelled:
+                # Pehli request cancel - entry hat chuki, ab yeh request khud chalegi
+                continue
+            return Response(
+                content=body,
+                status_code=stored_status,
+                media_type="application/json",
+                headers={REPLAYED_HEADER: "true"}
+            )
+
+        flight: "Flight[StoredResponse]" = Flight()
+        self._entries[store_key] = _Entry(fingerprint, flight, time.monotonic() + self.ttl_seconds)
+        try:
+            response = _encode(await handler(), response_model, status_code)
+        except BaseException as exc:
+            # 4xx / 5xx - waiting duplicates ko wahi error (cancel par woh khud chalte hain)
+            self._drop(store_key, flight)
+            flight.fail(exc)
+            raise
+        if not 200 <= response.status_code < 300:
+            self._drop(store_key, flight)
+        flight.resolve((response.status_code, response.body))
+        return response
+
+    def _drop(self, store_key: Hashable, flight: Flight) -> None:
+        """Non-2xx result yaad nahi rakhte - agla retry handler dobara chalata hai"""
+        entry = self._entries.get(store_key)
+        if entry is not None and entry.flight is flight:
+            del self._entries[store_key]
+
+
+def _encode(result: object, response_model: Type[BaseModel], status_code: int) -> Response:
+    """Handler result ko response_model ke hisaab se ek baar serialize karo"""
+    if isinstance(result, Response):
+        return result
+    # Handler pehle se response_model deta ho toh dobara validate nahi
+    model = result if isinstance(result, response_model) else response_model.model_validate(result)
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json"
+    )
+
+
+idempotency_store = IdempotencyStore(settings.IDEMPOTENCY_TTL_SECONDS, settings.IDEMPOTENCY_MAX_KEYS)
@@ -0,0 +1,106 @@
+"""
+Keyset (Cursor) Pagination
+List endpoints (created_at DESC, id DESC) order mein page karte hain.
+Cursor opaque hai - last row ka (created_at, id) base64 mein. Agla page
+index seek se shuru hota hai, isliye deep pages bhi offset jitne slow nahi.
+
+Response body plain list rehta hai (frontend compatible); next cursor
+aur optional total headers mein jaate hain.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import and_, func, or_, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_ESTIMATED_HEADER = "X-Total-Count-Estimated"
+PAGE_HEADERS = [NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_ESTIMATED_HEADER]
+
+# Isse zyada rows exact count nahi hoti - estimate milta hai
+TOTAL_COUNT_CAP = 1000
+
+CursorQuery = Query(None, description="Previous response ka X-Next-Cursor header")
+TotalQuery = Query(False, description="X-Total-Count header bhejo (bade results par estimate)")
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Cursor se (created_at, id) - kharab cursor par 400"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), row_id
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_page(query, model, cursor: Optional[str], limit: int):
+    """
+    Query par cursor seek + order + limit lagata hai. Ek extra row fetch
+    hoti hai taaki pata chale agla page hai ya nahi (paginate() dekho).
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id)
+        ))
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def paginate(rows: Sequence, limit: int, key=lambda row: row) -> Tuple[List, Optional[str]]:
+    """Extra row hata kar (page, next_cursor). key: row -> model instance"""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = key(rows[-1])
+    return rows, encode_cursor(last.created_at, last.id)
+
+
+async def estimate_total(session: AsyncSession, query) -> Tuple[int, bool]:
+    """
+    Filtered (un-paged) query ka total. TOTAL_COUNT_CAP tak exact count,
+    usse upar PostgreSQL planner ka estimate - full scan kabhi nahi.
+    Returns: (count, estimated)
+    """
+    capped = query.order_by(None).limit(TOTAL_COUNT_CAP + 1).subquery()
+    count = (await session.execute(select(func.count()).select_from(capped))).scalar() or 0
+    if count <= TOTAL_COUNT_CAP:
+        return count, False
+
+    bind = session.get_bind()
+    if bind.dialect.name == "postgresql":
+        try:
+            compiled = query.order_by(None).compile(
+                dialect=bind.dialect, compile_kwargs={"literal_binds": True}
+            )
+        except Exception:
+            # Kuch bind types literal render nahi hote - capped count hi sahi
+            return count, True
+        plan = (await session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))).scalar()
+        return max(int(plan[0]["Plan"]["Plan Rows"]), count), True
+    return count, True
+
+
+def page_headers(next_cursor: Optional[str], total: Optional[Tuple[int, bool]] = None) -> Dict[str, str]:
+    headers = {}
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    if total is not None:
+        headers[TOTAL_COUNT_HEADER] = str(total[0])
+        headers[TOTAL_ESTIMATED_HEADER] = "true" if total[1] else "false"
+    return headers
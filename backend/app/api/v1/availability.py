@@ -1,15 +1,15 @@
 """
 Availability Router
-Real-time room inventory calculation.
+Real-time room inventory - inventory ledger se padhta hai.
 """
 from typing import List, Dict, Any
 from datetime import date, timedelta, datetime
 from fastapi import APIRouter, Query, Depends
-from sqlmodel import select, and_, or_
+from sqlmodel import select
 
 from app.api.deps import CurrentUser, DbSession
 from app.models.room import RoomType
-from app.models.booking import Booking, BookingStatus
+from app.services.inventory import get_booked_counts
 
 router = APIRouter(prefix="/availability", tags=["Availability"])
 
@@ -30,18 +30,8 @@ async def get_availability(
     )
     room_types = room_types_result.scalars().all()
     
-    # 2. Get overlapping bookings
-    # Status should NOT be cancelled
-    bookings_result = await session.execute(
-        select(Booking).where(
-            Booking.hotel_id == current_user.hotel_id,
-            Booking.status != BookingStatus.CANCELLED,
-            or_(
-                and_(Booking.check_in <= end_date, Booking.check_out > start_date)
-            )
-        )
-    )
-    bookings = bookings_result.scalars().all()
+    # 2. Booked counts ledger se - ek indexed range read
+    booked_counts = await get_booked_counts(session, current_user.hotel_id, start_date, end_date)
     
     # 3. Generate date range
     delta = (end_date - start_date).days
@@ -59,17 +49,7 @@ async def get_availability(
         }
         
         for day in date_range:
-            # Count booked rooms for this room type on this day
-            booked_count = 0
-            for booking in bookings:
-                # Check if booking covers this day
-                # Booking includes check_in, excludes check_out (generally)
-                # Logic: check_in <= day < check_out
-                if booking.check_in <= day < booking.check_out:
-                    # Count how many rooms of this type are in this booking
-                    for booked_room in booking.rooms:
-                        if booked_room.get("room_type_id") == room.id:
-                            booked_count += 1
+            booked_count = max(0, booked_counts.get((room.id, day), 0))
             
             # Simple simulation for "blocked" if needed, or add BlockedDates table later
             # For now, just inventory - booked
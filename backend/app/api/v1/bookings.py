@@ -3,26 +3,35 @@ Bookings Router
 Booking CRUD aur guest management.
 Bookings page ke liye.
 """
+import io
 from typing import List, Optional
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, status, Query
+from datetime import date, datetime
+from fastapi import APIRouter, HTTPException, status, Query, Response, UploadFile, File
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
-import uuid
 
 from app.api.deps import CurrentUser, DbSession
+from app.api.export import ExportFormatQuery, export_filename, export_response
+from app.api.idempotency import IdempotencyKey, idempotency_store
+from app.api.pagination import (
+    CursorQuery, TotalQuery, estimate_total, keyset_page, page_headers, paginate
+)
+from app.core.database import run_transaction
 from app.models.booking import (
-    Booking, BookingCreate, BookingRead, BookingUpdate,
+    Booking, BookingCreate, BookingImportResult, BookingRead, BookingUpdate,
     Guest, GuestCreate, GuestRead, BookingStatus
 )
+from app.services.booking_import import IMPORT_FORMATS, import_bookings, import_format, iter_import_rows_threaded
+from app.services.bookings import create_booking_record
+from app.services.inventory import InsufficientInventory, sync_booking_status
+from app.services.daily_stats import sync_booking_stats
+from app.services.exports import BOOKING_EXPORT_COLUMNS, booking_export_rows
+from app.services.pricing import load_quoter, price_rooms
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
 
-
-def generate_booking_number() -> str:
-    """Unique booking number generate karta hai"""
-    timestamp = datetime.utcnow().strftime("%Y%m%d")
-    unique_part = str(uuid.uuid4())[:6].upper()
-    return f"BK{timestamp}{unique_part}"
+booking_list_adapter = TypeAdapter(List[BookingRead])
 
 
 @router.get("", response_model=List[BookingRead])
@@ -30,113 +39,202 @@ async def get_bookings(
     current_user: CurrentUser,
     session: DbSession,
     status_filter: Optional[BookingStatus] = Query(None, alias="status"),
-    limit: int = Query(50, le=100),
-    offset: int = Query(0, ge=0)
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = CursorQuery,
+    include_total: bool = TotalQuery
 ):
     """
-    Hotel ki saari bookings get karo.
-    Optional status filter ke saath.
+    Hotel ki bookings, newest first - cursor paginated.
+    Agla page: X-Next-Cursor header ko `cursor` mein bhejo.
     """
-    query = select(Booking).where(Booking.hotel_id == current_user.hotel_id)
-    
+    filters = [Booking.hotel_id == current_user.hotel_id]
     if status_filter:
-        query = query.where(Booking.status == status_filter)
+        filters.append(Booking.status == status_filter)
     
-    query = query.offset(offset).limit(limit).order_by(Booking.created_at.desc())
+    # Guest join mein hi aa jaata hai - per booking extra query nahi
+    query = (
+        select(Booking, Guest)
+        .join(Guest, Guest.id == Booking.guest_id)
+        .where(*filters)
+    )
+    result = await session.execute(keyset_page(query, Booking, cursor, limit))
+    rows, next_cursor = paginate(result.all(), limit, key=lambda row: row[0])
+    bookings = [BookingRead.from_rows(booking, guest) for booking, guest in rows]
     
-    result = await session.execute(query)
-    bookings = result.scalars().all()
+    total = None
+    if include_total:
+        total = await estimate_total(session, select(Booking.id).where(*filters))
     
-    # Guest data attach karo
-    booking_responses = []
-    for booking in bookings:
-        guest_result = await session.execute(
-            select(Guest).where(Guest.id == booking.guest_id)
-        )
-        guest = guest_result.scalar_one_or_none()
-        booking_dict = booking.model_dump()
-        booking_dict["guest"] = guest.model_dump() if guest else {}
-        booking_responses.append(booking_dict)
+    # Ek hi baar serialize - response_model ka dobara validation nahi
+    return Response(
+        content=booking_list_adapter.dump_json(bookings),
+        media_type="application/json",
+        headers=page_headers(next_cursor, total)
+    )
+
+
+# ============== Guest Endpoints ==============
+# /{booking_id} se pehle register hona zaroori hai, warna "guests" booking id ban jaata hai
+
+@router.get("/guests", response_model=List[GuestRead], tags=["Guests"])
+async def get_guests(
+    current_user: CurrentUser,
+    session: DbSession,
+    response: Response,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = CursorQuery,
+    include_total: bool = TotalQuery
+):
+    """Hotel ke guests, newest first - cursor paginated"""
+    query = select(Guest).where(Guest.hotel_id == current_user.hotel_id)
+    result = await session.execute(keyset_page(query, Guest, cursor, limit))
+    guests, next_cursor = paginate(result.scalars().all(), limit)
     
-    return booking_responses
+    total = None
+    if include_total:
+        total = await estimate_total(
+            session, select(Guest.id).where(Guest.hotel_id == current_user.hotel_id)
+        )
+    response.headers.update(page_headers(next_cursor, total))
+    return guests
 
 
 @router.post("", response_model=BookingRead, status_code=status.HTTP_201_CREATED)
 async def create_booking(
     booking_data: BookingCreate,
     current_user: CurrentUser,
-    session: DbSession
+    session: DbSession,
+    idempotency_key: IdempotencyKey = None
 ):
     """
     New booking create karo.
-    Guest bhi saath mein create hota hai.
+    Guest bhi saath mein create hota hai. Inventory atomically reserve hoti hai -
+    koi raat full ho toh 409. Idempotency-Key header ke saath retry safe hai.
     """
-    # Create or find guest
-    guest_data = booking_data.guest
-    
-    # Check if guest exists by email
-    result = await session.execute(
-        select(Guest).where(
-            Guest.email == guest_data.email,
-            Guest.hotel_id == current_user.hotel_id
+    # Rollback ke baad ORM objects expire ho jaate hain - id pehle hi nikaal lo
+    hotel_id = current_user.hotel_id
+    return await idempotency_store.run(
+        scope=(hotel_id, "POST /bookings"),
+        key=idempotency_key,
+        request_body=booking_data,
+        handler=lambda: _create_booking(session, hotel_id, booking_data),
+        response_model=BookingRead,
+        status_code=status.HTTP_201_CREATED
+    )
+
+
+async def _create_booking(session: AsyncSession, hotel_id: str, booking_data: BookingCreate) -> BookingRead:
+    if booking_data.check_out <= booking_data.check_in:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="check_out must be after check_in"
         )
+    
+    # Server-side pricing - client ka total_price trust nahi karte
+    room_type_ids = {room.get("room_type_id") for room in booking_data.rooms}
+    quoter = await load_quoter(
+        session, hotel_id, booking_data.check_in, booking_data.check_out,
+        room_type_ids=[rt_id for rt_id in room_type_ids if rt_id]
     )
-    guest = result.scalar_one_or_none()
+    if not booking_data.rooms or not room_type_ids <= quoter.room_types.keys():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Every room must reference a room type of this hotel"
+        )
+    # Anjaan plan par base_price ka quote aur booking mein non-existent plan id - hold endpoint jaisa 400
+    rate_plan_ids = {room.get("rate_plan_id") for room in booking_data.rooms if room.get("rate_plan_id")}
+    if not rate_plan_ids <= quoter.plans.keys():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Rate plan not available"
+        )
+    rooms = price_rooms(quoter, booking_data.rooms, booking_data.check_in, booking_data.check_out)
     
-    if not guest:
-        guest = Guest(
-            **guest_data.model_dump(),
-            hotel_id=current_user.hotel_id
+    try:
+        booking, guest = await run_transaction(
+            session, lambda: create_booking_record(session, hotel_id, booking_data, rooms)
+        )
+    except InsufficientInventory:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Not enough rooms available for the selected dates"
         )
-        session.add(guest)
-        await session.flush()
     
-    # Create booking
-    booking = Booking(
-        hotel_id=current_user.hotel_id,
-        guest_id=guest.id,
-        booking_number=generate_booking_number(),
-        check_in=booking_data.check_in,
-        check_out=booking_data.check_out,
-        rooms=booking_data.rooms,
-        special_requests=booking_data.special_requests,
-        promo_code=booking_data.promo_code,
-        total_amount=sum(room.get("total_price", 0) for room in booking_data.rooms),
-        status=BookingStatus.PENDING
+    return BookingRead.from_rows(booking, guest)
+
+
+@router.post("/import", response_model=BookingImportResult)
+async def import_bookings_file(
+    current_user: CurrentUser,
+    session: DbSession,
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Query(None, alias="format", pattern="^(" + "|".join(IMPORT_FORMATS) + ")$")
+):
+    """
+    PMS migration - purani bookings JSONL ya CSV mein bulk import karo.
+    File stream hoti hai (read + parse threadpool mein) aur batches mein commit
+    hoti hai; invalid rows aur fail hue batches ki rows errors mein aati hain.
+    Format na do toh extension se (.csv, warna jsonl).
+    """
+    fmt = import_format(file.filename, file_format)
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return await import_bookings(session, current_user.hotel_id, iter_import_rows_threaded(stream, fmt))
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Import file must be UTF-8 encoded"
+        )
+    finally:
+        # UploadFile apni file khud band karta hai
+        stream.detach()
+
+
+@router.get("/export")
+async def export_bookings(
+    current_user: CurrentUser,
+    start_date: Optional[date] = Query(None, description="check_in se (inclusive)"),
+    end_date: Optional[date] = Query(None, description="check_in tak (inclusive)"),
+    status_filter: Optional[BookingStatus] = Query(None, alias="status"),
+    file_format: str = ExportFormatQuery
+):
+    """
+    Bookings ka poora export (CSV / JSONL), check_in order mein.
+    Rows cursor se stream hoti hain - saal bhar ka data bhi memory mein nahi aata.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
+        )
+    return export_response(
+        booking_export_rows(current_user.hotel_id, start_date, end_date, status_filter),
+        BOOKING_EXPORT_COLUMNS,
+        file_format,
+        export_filename("bookings", file_format, start_date, end_date)
     )
-    session.add(booking)
-    await session.commit()
-    await session.refresh(booking)
-    await session.refresh(guest)
-    
-    response = booking.model_dump()
-    response["guest"] = guest.model_dump()
-    return response
 
 
 @router.get("/{booking_id}", response_model=BookingRead)
 async def get_booking(booking_id: str, current_user: CurrentUser, session: DbSession):
     """Single booking get karo"""
     result = await session.execute(
-        select(Booking).where(
+        select(Booking, Guest)
+        .join(Guest, Guest.id == Booking.guest_id)
+        .where(
             Booking.id == booking_id,
             Booking.hotel_id == current_user.hotel_id
         )
     )
-    booking = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not booking:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Booking not found"
         )
     
-    guest_result = await session.execute(select(Guest).where(Guest.id == booking.guest_id))
-    guest = guest_result.scalar_one_or_none()
-    
-    response = booking.model_dump()
-    response["guest"] = guest.model_dump() if guest else {}
-    return response
+    return BookingRead.from_rows(*row)
 
 
 @router.patch("/{booking_id}", response_model=BookingRead)
@@ -148,42 +246,40 @@ async def update_booking(
 ):
     """Booking status/details update karo"""
     result = await session.execute(
-        select(Booking).where(
+        select(Booking, Guest)
+        .join(Guest, Guest.id == Booking.guest_id)
+        .where(
             Booking.id == booking_id,
             Booking.hotel_id == current_user.hotel_id
         )
     )
-    booking = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not booking:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Booking not found"
         )
+    booking, guest = row
     
+    previous_status = booking.status
     update_data = booking_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(booking, field, value)
     
     booking.updated_at = datetime.utcnow()
     session.add(booking)
-    await session.commit()
-    await session.refresh(booking)
     
-    guest_result = await session.execute(select(Guest).where(Guest.id == booking.guest_id))
-    guest = guest_result.scalar_one_or_none()
+    # Cancel / no-show aur unke restore par ledger adjust karo
+    try:
+        await sync_booking_status(session, booking, previous_status)
+        await sync_booking_stats(session, booking, previous_status)
+    except InsufficientInventory:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Not enough rooms available to restore this booking"
+        )
+    await session.commit()
     
-    response = booking.model_dump()
-    response["guest"] = guest.model_dump() if guest else {}
-    return response
-
-
-# ============== Guest Endpoints ==============
-
-@router.get("/guests", response_model=List[GuestRead], tags=["Guests"])
-async def get_guests(current_user: CurrentUser, session: DbSession):
-    """Hotel ke saare guests get karo"""
-    result = await session.execute(
-        select(Guest).where(Guest.hotel_id == current_user.hotel_id)
-    )
-    return result.scalars().all()
+    return BookingRead.from_rows(booking, guest)
@@ -1,17 +1,26 @@
 """
 Dashboard Router
 Dashboard stats aur reports ke liye.
+Auto-refresh polling har tab se aata hai - isliye results per hotel
+DASHBOARD_CACHE_TTL_SECONDS tak cache rehte hain.
 """
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, time, timedelta
 from fastapi import APIRouter
 from sqlmodel import select, func
 
 from app.api.deps import CurrentUser, DbSession
-from app.models.booking import Booking, BookingStatus
+from app.core.config import get_settings
+from app.models.booking import Booking, BookingStatus, Guest
 from app.models.room import RoomType
+from app.services.cache import TTLCache
+
+settings = get_settings()
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
+# (kind, hotel_id, date) -> response
+dashboard_cache: TTLCache = TTLCache(settings.DASHBOARD_CACHE_TTL_SECONDS)
+
 
 @router.get("/stats")
 async def get_dashboard_stats(current_user: CurrentUser, session: DbSession):
@@ -19,93 +28,83 @@ async def get_dashboard_stats(current_user: CurrentUser, session: DbSession):
     Dashboard ke liye summary stats.
     Frontend DashboardStats interface se match karta hai.
     """
+    hotel_id = current_user.hotel_id
     today = date.today()
-    
-    # Today's arrivals (check-ins)
-    arrivals_result = await session.execute(
-        select(func.count(Booking.id)).where(
-            Booking.hotel_id == current_user.hotel_id,
-            Booking.check_in == today,
-            Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING])
-        )
-    )
-    today_arrivals = arrivals_result.scalar() or 0
-    
-    # Today's departures (check-outs)
-    departures_result = await session.execute(
-        select(func.count(Booking.id)).where(
-            Booking.hotel_id == current_user.hotel_id,
-            Booking.check_out == today,
-            Booking.status == BookingStatus.CHECKED_IN
-        )
-    )
-    today_departures = departures_result.scalar() or 0
-    
-    # Currently checked in (occupancy)
-    occupancy_result = await session.execute(
-        select(func.count(Booking.id)).where(
-            Booking.hotel_id == current_user.hotel_id,
-            Booking.status == BookingStatus.CHECKED_IN
-        )
-    )
-    current_occupancy = occupancy_result.scalar() or 0
-    
-    # Today's revenue (bookings created today)
-    revenue_result = await session.execute(
-        select(func.sum(Booking.total_amount)).where(
-            Booking.hotel_id == current_user.hotel_id,
-            func.date(Booking.created_at) == today
-        )
+    return await dashboard_cache.get_or_load(
+        ("stats", hotel_id, today), lambda: _load_stats(session, hotel_id, today)
     )
-    today_revenue = revenue_result.scalar() or 0
+
+
+async def _load_stats(session, hotel_id: str, today: date) -> dict:
+    """Saare counters ek statement mein - FILTER aggregates, ek hi pass"""
+    day_start = datetime.combine(today, time.min)
+    day_end = day_start + timedelta(days=1)
     
-    # Pending bookings
-    pending_result = await session.execute(
-        select(func.count(Booking.id)).where(
-            Booking.hotel_id == current_user.hotel_id,
-            Booking.status == BookingStatus.PENDING
-        )
+    total_rooms = (
+        select(func.coalesce(func.sum(RoomType.total_inventory), 0))
+        .where(RoomType.hotel_id == hotel_id, RoomType.is_active == True)
+        .scalar_subquery()
     )
-    pending_bookings = pending_result.scalar() or 0
-    
-    # Total rooms
-    rooms_result = await session.execute(
-        select(func.sum(RoomType.total_inventory)).where(
-            RoomType.hotel_id == current_user.hotel_id,
-            RoomType.is_active == True
-        )
+    result = await session.execute(
+        select(
+            # Today's arrivals (check-ins)
+            func.count(Booking.id).filter(
+                Booking.check_in == today,
+                Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING])
+            ),
+            # Today's departures (check-outs)
+            func.count(Booking.id).filter(
+                Booking.check_out == today,
+                Booking.status == BookingStatus.CHECKED_IN
+            ),
+            # Currently checked in (occupancy)
+            func.count(Booking.id).filter(Booking.status == BookingStatus.CHECKED_IN),
+            # Today's revenue (bookings created today)
+            func.coalesce(
+                func.sum(Booking.total_amount).filter(
+                    Booking.created_at >= day_start,
+                    Booking.created_at < day_end
+                ),
+                0
+            ),
+            # Pending bookings
+            func.count(Booking.id).filter(Booking.status == BookingStatus.PENDING),
+            total_rooms,
+        ).where(Booking.hotel_id == hotel_id)
     )
-    total_rooms = rooms_result.scalar() or 0
+    arrivals, departures, occupancy, revenue, pending, rooms = result.one()
     
     return {
-        "today_arrivals": today_arrivals,
-        "today_departures": today_departures,
-        "current_occupancy": current_occupancy,
-        "today_revenue": float(today_revenue),
-        "pending_bookings": pending_bookings,
-        "total_rooms": total_rooms
+        "today_arrivals": arrivals,
+        "today_departures": departures,
+        "current_occupancy": occupancy,
+        "today_revenue": float(revenue),
+        "pending_bookings": pending,
+        "total_rooms": rooms or 0
     }
 
 
 @router.get("/recent-bookings")
 async def get_recent_bookings(current_user: CurrentUser, session: DbSession):
     """Recent 5 bookings for dashboard"""
-    from app.models.booking import Guest
-    
+    hotel_id = current_user.hotel_id
+    return await dashboard_cache.get_or_load(
+        ("recent", hotel_id, date.today()), lambda: _load_recent_bookings(session, hotel_id)
+    )
+
+
+async def _load_recent_bookings(session, hotel_id: str) -> list:
+    # Guest join mein hi - per booking alag query nahi
     result = await session.execute(
-        select(Booking)
-        .where(Booking.hotel_id == current_user.hotel_id)
-        .order_by(Booking.created_at.desc())
+        select(Booking, Guest)
+        .outerjoin(Guest, Guest.id == Booking.guest_id)
+        .where(Booking.hotel_id == hotel_id)
+        .order_by(Booking.created_at.desc(), Booking.id.desc())
         .limit(5)
     )
-    bookings = result.scalars().all()
     
     response = []
-    for booking in bookings:
-        guest_result = await session.execute(
-            select(Guest).where(Guest.id == booking.guest_id)
-        )
-        guest = guest_result.scalar_one_or_none()
+    for booking, guest in result.all():
         booking_dict = booking.model_dump()
         booking_dict["guest"] = guest.model_dump() if guest else {}
         response.append(booking_dict)
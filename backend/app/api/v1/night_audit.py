@@ -0,0 +1,54 @@
+"""
+Night Audit Router
+Business day close karna - no-shows, departures roll aur din ka snapshot.
+Saare hotels ke liye: python manage.py night-audit
+"""
+from datetime import date
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Query, status
+from sqlmodel import select
+
+from app.api.deps import CurrentUser, DbSession
+from app.models.night_audit import NightAudit, NightAuditRead, NightAuditRequest
+from app.services.night_audit import default_business_date, run_night_audit
+
+router = APIRouter(prefix="/night-audit", tags=["Night Audit"])
+
+
+@router.post("", response_model=NightAuditRead)
+async def close_business_day(
+    audit_request: NightAuditRequest,
+    current_user: CurrentUser,
+    session: DbSession
+):
+    """
+    Business day close karo (default: kal).
+    Un-arrived bookings NO_SHOW, overdue CHECKED_IN -> CHECKED_OUT, phir snapshot.
+    Dobara chalana safe hai - snapshot refresh ho jaata hai.
+    """
+    business_date = audit_request.business_date or default_business_date()
+    # Aaj abhi khatam nahi hua - close karne par aaj ke arrivals no-show ho jaate
+    if business_date >= date.today():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only a past business day can be closed"
+        )
+    hotel_id = current_user.hotel_id
+    return await run_night_audit(session, hotel_id, business_date)
+
+
+@router.get("", response_model=List[NightAuditRead])
+async def get_closed_days(
+    current_user: CurrentUser,
+    session: DbSession,
+    limit: int = Query(30, ge=1, le=366)
+):
+    """Closed business days ke snapshots, latest pehle"""
+    result = await session.execute(
+        select(NightAudit)
+        .where(NightAudit.hotel_id == current_user.hotel_id)
+        .order_by(NightAudit.business_date.desc())
+        .limit(limit)
+    )
+    return result.scalars().all()
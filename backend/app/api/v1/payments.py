@@ -1,97 +1,133 @@
 """
 Payments Router
 """
-from typing import List
-from fastapi import APIRouter, HTTPException, status
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.api.deps import CurrentUser, DbSession
+from app.api.export import ExportFormatQuery, export_filename, export_response
+from app.api.idempotency import IdempotencyKey, idempotency_store
+from app.api.pagination import (
+    CursorQuery, TotalQuery, estimate_total, keyset_page, page_headers, paginate
+)
 from app.models.payment import Payment, PaymentCreate, PaymentRead
 from app.models.booking import Booking, Guest
+from app.services.exports import PAYMENT_EXPORT_COLUMNS, payment_export_rows
 
 router = APIRouter(prefix="/payments", tags=["Payments"])
 
 @router.get("", response_model=List[PaymentRead])
-async def get_payments(current_user: CurrentUser, session: DbSession):
-    """Get all payments for the hotel"""
-    # Simple query - just get payments for this hotel
-    query = select(Payment).where(Payment.hotel_id == current_user.hotel_id)
-    result = await session.execute(query)
-    payments = result.scalars().all()
+async def get_payments(
+    current_user: CurrentUser,
+    session: DbSession,
+    response: Response,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = CursorQuery,
+    include_total: bool = TotalQuery
+):
+    """Hotel ke payments, newest first - cursor paginated"""
+    # Booking aur guest info ek hi join mein - per payment queries nahi
+    query = (
+        select(Payment, Booking.booking_number, Guest.first_name, Guest.last_name)
+        .outerjoin(Booking, Booking.id == Payment.booking_id)
+        .outerjoin(Guest, Guest.id == Booking.guest_id)
+        .where(Payment.hotel_id == current_user.hotel_id)
+    )
+    result = await session.execute(keyset_page(query, Payment, cursor, limit))
+    rows, next_cursor = paginate(result.all(), limit, key=lambda row: row[0])
     
-    # Enrich with booking and guest info
     enriched_payments = []
-    for payment in payments:
+    for payment, booking_number, first_name, last_name in rows:
         p_dict = payment.model_dump()
-        
-        # Get booking info
-        booking_result = await session.execute(
-            select(Booking).where(Booking.id == payment.booking_id)
-        )
-        booking = booking_result.scalar_one_or_none()
-        
-        if booking:
-            p_dict["booking_number"] = booking.booking_number
-            
-            # Get guest info
-            guest_result = await session.execute(
-                select(Guest).where(Guest.id == booking.guest_id)
-            )
-            guest = guest_result.scalar_one_or_none()
-            
-            if guest:
-                p_dict["guest_name"] = f"{guest.first_name} {guest.last_name}"
-            else:
-                p_dict["guest_name"] = "Unknown Guest"
-        else:
-            p_dict["booking_number"] = "N/A"
-            p_dict["guest_name"] = "Unknown Guest"
-            
+        p_dict["booking_number"] = booking_number or "N/A"
+        p_dict["guest_name"] = f"{first_name} {last_name}" if first_name is not None else "Unknown Guest"
         enriched_payments.append(p_dict)
-        
+    
+    total = None
+    if include_total:
+        total = await estimate_total(
+            session, select(Payment.id).where(Payment.hotel_id == current_user.hotel_id)
+        )
+    response.headers.update(page_headers(next_cursor, total))
     return enriched_payments
 
+@router.get("/export")
+async def export_payments(
+    current_user: CurrentUser,
+    start_date: Optional[date] = Query(None, description="created_at din se (inclusive)"),
+    end_date: Optional[date] = Query(None, description="created_at din tak (inclusive)"),
+    file_format: str = ExportFormatQuery
+):
+    """Payments ka poora export (CSV / JSONL), purane pehle - cursor se stream"""
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
+        )
+    return export_response(
+        payment_export_rows(current_user.hotel_id, start_date, end_date),
+        PAYMENT_EXPORT_COLUMNS,
+        file_format,
+        export_filename("payments", file_format, start_date, end_date)
+    )
+
 @router.post("", response_model=PaymentRead)
 async def create_payment(
     payment_data: PaymentCreate,
     current_user: CurrentUser,
-    session: DbSession
+    session: DbSession,
+    idempotency_key: IdempotencyKey = None
 ):
-    """Record a new payment"""
-    # Verify booking exists and belongs to hotel
+    """Record a new payment - Idempotency-Key header ke saath retry safe"""
+    hotel_id = current_user.hotel_id
+    return await idempotency_store.run(
+        scope=(hotel_id, "POST /payments"),
+        key=idempotency_key,
+        request_body=payment_data,
+        handler=lambda: _create_payment(session, hotel_id, payment_data),
+        response_model=PaymentRead
+    )
+
+
+async def _create_payment(session: AsyncSession, hotel_id: str, payment_data: PaymentCreate) -> dict:
+    # Verify booking exists and belongs to hotel - guest naam bhi saath mein
     result = await session.execute(
-        select(Booking).where(
+        select(Booking.booking_number, Guest.first_name, Guest.last_name)
+        .join(Guest, Guest.id == Booking.guest_id)
+        .where(
             Booking.id == payment_data.booking_id,
-            Booking.hotel_id == current_user.hotel_id
+            Booking.hotel_id == hotel_id
         )
     )
-    booking = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not booking:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Booking not found"
         )
+    booking_number, first_name, last_name = row
         
     payment = Payment(
         **payment_data.model_dump(),
-        hotel_id=current_user.hotel_id
+        hotel_id=hotel_id
     )
     session.add(payment)
-    await session.commit()
-    await session.refresh(payment)
     
-    # Also update booking paid amount
-    booking.paid_amount += payment.amount
-    session.add(booking)
+    # Paid amount atomic increment - concurrent payments ek doosre ko overwrite na karein
+    await session.execute(
+        update(Booking)
+        .where(Booking.id == payment_data.booking_id)
+        .values(paid_amount=Booking.paid_amount + payment.amount)
+        .execution_options(synchronize_session=False)
+    )
     await session.commit()
-
-    # Get guest info for response
-    guest_result = await session.execute(select(Guest).where(Guest.id == booking.guest_id))
-    guest = guest_result.scalar_one_or_none()
     
     response = payment.model_dump()
-    response["booking_number"] = booking.booking_number
-    response["guest_name"] = f"{guest.first_name} {guest.last_name}"
+    response["booking_number"] = booking_number
+    response["guest_name"] = f"{first_name} {last_name}"
     return response
-
@@ -1,17 +1,36 @@
 
 from typing import List, Optional
-from datetime import date
-from fastapi import APIRouter, HTTPException, Query, Depends
-from sqlmodel import select, and_
+from datetime import date, datetime, timedelta
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from sqlmodel import select
 
-from app.core.database import get_session
+from app.core.database import get_session, run_transaction
 from app.api.deps import DbSession
+from app.models.booking import BookingCreate, BookingRead, BookingSource
 from app.models.hotel import Hotel, HotelRead
-from app.models.room import RoomType, RoomTypeRead
-from app.models.booking import Booking
+from app.models.inventory import HoldBookingCreate, HoldCreate, HoldRead, HoldStatus, InventoryHold
+from app.models.room import RoomType, PublicRoomSearchRead, FlexibleStayRead
+from app.services.bookings import create_booking_record
+from app.services.holds import HoldLimitExceeded, HoldUnavailable, create_hold, hold_sweeper, release_hold
+from app.services.inventory import InsufficientInventory, get_booked_counts, search_free_inventory
+from app.services.occupancy import sliding_min, sliding_sum
+from app.services.pricing import load_quoter, price_rooms
 
 router = APIRouter(prefix="/public", tags=["Public"])
 
+# Flexible search window ki upper limit - ek response mein itne din tak
+MAX_FLEXIBLE_RANGE_DAYS = 62
+# Public (bina login) stay ki lambai - stay dates CTE aur quote isse bade nahi hote
+MAX_STAY_NIGHTS = 30
+
+
+def _check_stay(check_in: date, check_out: date) -> None:
+    if check_out <= check_in:
+        raise HTTPException(status_code=400, detail="check_out must be after check_in")
+    if (check_out - check_in).days > MAX_STAY_NIGHTS:
+        raise HTTPException(status_code=400, detail=f"Stay cannot exceed {MAX_STAY_NIGHTS} nights")
+
+
 @router.get("/hotels/slug/{hotel_slug}", response_model=HotelRead)
 async def get_public_hotel_by_slug(hotel_slug: str, session: DbSession):
     """
@@ -37,7 +56,7 @@ async def get_public_hotel(hotel_id: str, session: DbSession):
         raise HTTPException(status_code=404, detail="Hotel not found")
     return hotel
 
-@router.get("/hotels/{hotel_id}/rooms", response_model=List[RoomTypeRead])
+@router.get("/hotels/{hotel_id}/rooms", response_model=List[PublicRoomSearchRead])
 async def search_public_rooms(
     hotel_id: str,
     session: DbSession,
@@ -47,57 +66,221 @@ async def search_public_rooms(
 ):
     """
     Search available rooms for a hotel.
-    Real availability check logic.
+    Stay ki har raat ka free inventory dekha jaata hai - ek hi SQL aggregate
+    (stay dates x room types LEFT JOIN inventory ledger), Python mein counting nahi.
+    Stay MAX_STAY_NIGHTS se lambi ho toh 400.
     """
-    # 1. Get all room types for this hotel
-    query = select(RoomType).where(
-        RoomType.hotel_id == hotel_id,
-        RoomType.is_active == True
+    _check_stay(check_in, check_out)
+    
+    results = await search_free_inventory(session, hotel_id, check_in, check_out, guests)
+    if not results:
+        return []
+    
+    # Stay price quote engine se - sabse sasta active rate plan
+    quoter = await load_quoter(
+        session, hotel_id, check_in, check_out,
+        room_type_ids=[room_type.id for room_type, _ in results]
     )
-    result = await session.execute(query)
-    room_types = result.scalars().all()
+    nights = (check_out - check_in).days
     
+    response = []
+    for room_type, free_rooms in results:
+        rate_plan_id, total_price = quoter.best_quote(room_type.id, check_in, check_out)
+        rate_plan = quoter.plans.get(rate_plan_id)
+        response.append(PublicRoomSearchRead(
+            **room_type.model_dump(),
+            available_rooms=free_rooms,
+            rate_plan_id=rate_plan_id,
+            rate_plan_name=rate_plan.name if rate_plan else None,
+            price_per_night=total_price / nights,
+            total_price=total_price
+        ))
+    return response
+
+
+@router.get("/hotels/{hotel_id}/rooms/flexible", response_model=List[FlexibleStayRead])
+async def search_flexible_stays(
+    hotel_id: str,
+    session: DbSession,
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    nights: int = Query(..., ge=1, le=MAX_STAY_NIGHTS),
+    guests: int = Query(2)
+):
+    """
+    Flexible-date search - "March mein koi bhi 3 raatein".
+    start_date se end_date (dono included) ke andar har feasible
+    (check_in, room type) window uske stay price ke saath return karta hai.
+    Har room type ka per-night free array inventory ledger (booked + held) ke
+    ek range read se banta hai - /rooms search aur holds jaisa hi source - phir
+    sliding window minimum se saare check-ins ek saath check hote hain.
+    """
+    days = (end_date - start_date).days + 1
+    if days < nights:
+        raise HTTPException(status_code=400, detail="Date range is shorter than the number of nights")
+    if days > MAX_FLEXIBLE_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range cannot exceed {MAX_FLEXIBLE_RANGE_DAYS} days"
+        )
+    
+    result = await session.execute(
+        select(RoomType).where(
+            RoomType.hotel_id == hotel_id,
+            RoomType.is_active == True,
+            RoomType.max_occupancy >= guests
+        )
+    )
+    room_types = result.scalars().all()
     if not room_types:
         return []
-
-    # 2. Filter by occupancy
-    available_rooms = []
     
-    # Pre-fetch bookings for this range to calculate availability
-    # This is a basic availability check. 
-    # In a real system, you'd check day-by-day inventory.
-    # Here we just check if "total_inventory - overlapping_bookings > 0"
+    # end_date tak ki raatein (aakhri check-in + nights - 1 = end_date)
+    blocked = await get_booked_counts(session, hotel_id, start_date, end_date)
+    range_end = end_date + timedelta(days=1)
+    quoter = await load_quoter(session, hotel_id, start_date, range_end, room_type_ids=[rt.id for rt in room_types])
     
-    # Get bookings overlapping with requested dates for this hotel
-    booking_query = select(Booking).where(
-        Booking.hotel_id == hotel_id,
-        Booking.status.in_(["confirmed", "checked_in"]),
-        and_(
-            Booking.check_in < check_out,
-            Booking.check_out > check_in
-        )
+    stays = []
+    for rt in room_types:
+        free = [
+            rt.total_inventory - blocked.get((rt.id, start_date + timedelta(days=i)), 0)
+            for i in range(days)
+        ]
+        window_free = sliding_min(free, nights)
+        
+        # Har rate plan ka window price, phir har window ka sabse sasta plan
+        best_price = None
+        best_plan = None
+        for plan_id in quoter.plans_for(rt.id) or [None]:
+            prices = sliding_sum(quoter.nightly_prices(rt.id, plan_id, start_date, range_end), nights)
+            if best_price is None:
+                best_price, best_plan = prices, [plan_id] * len(prices)
+                continue
+            for i, price in enumerate(prices):
+                if price < best_price[i]:
+                    best_price[i], best_plan[i] = price, plan_id
+        
+        for offset, available in enumerate(window_free):
+            if available <= 0:
+                continue
+            stay_check_in = start_date + timedelta(days=offset)
+            stays.append(FlexibleStayRead(
+                check_in=stay_check_in,
+                check_out=stay_check_in + timedelta(days=nights),
+                room_type_id=rt.id,
+                room_type_name=rt.name,
+                available_rooms=available,
+                rate_plan_id=best_plan[offset],
+                price_per_night=best_price[offset] / nights,
+                total_price=best_price[offset]
+            ))
+    
+    stays.sort(key=lambda stay: (stay.check_in, stay.total_price))
+    return stays
+
+
+# ============== Holds (public booking flow) ==============
+
+async def _get_hold(session, hotel_id: str, hold_id: str) -> InventoryHold:
+    hold = await session.get(InventoryHold, hold_id)
+    if not hold or hold.hotel_id != hotel_id:
+        raise HTTPException(status_code=404, detail="Hold not found")
+    return hold
+
+
+@router.post("/hotels/{hotel_id}/holds", response_model=HoldRead, status_code=201)
+async def create_public_hold(hotel_id: str, hold_data: HoldCreate, session: DbSession, request: Request):
+    """
+    Guest details bharte waqt room HOLD_TTL_MINUTES ke liye reserve karo.
+    Inventory na ho toh 409, client (IP) ke active holds / held rooms cap
+    par ho toh 429. Response ka expires_at countdown ke liye.
+    """
+    _check_stay(hold_data.check_in, hold_data.check_out)
+    
+    quoter = await load_quoter(
+        session, hotel_id, hold_data.check_in, hold_data.check_out,
+        room_type_ids=[hold_data.room_type_id]
     )
-    booking_result = await session.execute(booking_query)
-    existing_bookings = booking_result.scalars().all()
+    room_type = quoter.room_types.get(hold_data.room_type_id)
+    if not room_type or not room_type.is_active:
+        raise HTTPException(status_code=404, detail="Room type not found")
+    if hold_data.rate_plan_id and hold_data.rate_plan_id not in quoter.plans:
+        raise HTTPException(status_code=400, detail="Rate plan not available")
     
-    # Map bookings to room types
-    # Booking schema has 'rooms' JSON which contains list of booked rooms
-    # We need to count how many of specific room_type_id are taken
+    rate_plan_id = hold_data.rate_plan_id
+    if rate_plan_id:
+        stay_price = quoter.quote(room_type.id, rate_plan_id, hold_data.check_in, hold_data.check_out)
+    else:
+        rate_plan_id, stay_price = quoter.best_quote(room_type.id, hold_data.check_in, hold_data.check_out)
     
-    booked_counts = {} # {room_type_id: count}
+    # Proxy ke peeche uvicorn --proxy-headers se asli client IP aata hai
+    client_ip = request.client.host if request.client else None
+    try:
+        hold = await run_transaction(session, lambda: create_hold(
+            session, hotel_id, hold_data.room_type_id, rate_plan_id,
+            hold_data.check_in, hold_data.check_out, hold_data.rooms, client_ip
+        ))
+    except InsufficientInventory:
+        raise HTTPException(status_code=409, detail="Not enough rooms available for the selected dates")
+    except HoldLimitExceeded:
+        raise HTTPException(status_code=429, detail="Too many active holds - complete or release an existing hold first")
     
-    for booking in existing_bookings:
-        for r_booked in booking.rooms:
-            # r_booked structure matches the JSON schema we saved: {room_type_id: ..., ...}
-            rt_id = r_booked.get("room_type_id")
-            if rt_id:
-                booked_counts[rt_id] = booked_counts.get(rt_id, 0) + 1
+    hold_sweeper.schedule(hold)
+    return HoldRead(**hold.model_dump(), total_price=stay_price * hold.rooms)
+
+
+@router.get("/hotels/{hotel_id}/holds/{hold_id}", response_model=HoldRead)
+async def get_public_hold(hotel_id: str, hold_id: str, session: DbSession):
+    """Hold ka status aur expiry"""
+    hold = await _get_hold(session, hotel_id, hold_id)
+    return HoldRead(**hold.model_dump())
 
-    for rt in room_types:
-        if rt.max_occupancy >= guests:
-            # Check inventory
-            taken = booked_counts.get(rt.id, 0)
-            if rt.total_inventory > taken:
-                available_rooms.append(rt)
 
-    return available_rooms
+@router.delete("/hotels/{hotel_id}/holds/{hold_id}", status_code=204)
+async def release_public_hold(hotel_id: str, hold_id: str, session: DbSession):
+    """Guest ne flow chhod diya - rooms turant wapas inventory mein"""
+    await _get_hold(session, hotel_id, hold_id)
+    await run_transaction(session, lambda: release_hold(session, hotel_id, hold_id))
+
+
+@router.post("/hotels/{hotel_id}/holds/{hold_id}/book", response_model=BookingRead, status_code=201)
+async def book_public_hold(hotel_id: str, hold_id: str, booking_data: HoldBookingCreate, session: DbSession):
+    """
+    Hold se booking - rooms aur dates hold se aate hain, price server-side.
+    Hold expire / use ho chuka ho toh 410.
+    """
+    hold = await _get_hold(session, hotel_id, hold_id)
+    if hold.status != HoldStatus.ACTIVE or hold.expires_at <= datetime.utcnow():
+        raise HTTPException(status_code=410, detail="Hold has expired")
+    quoter = await load_quoter(
+        session, hotel_id, hold.check_in, hold.check_out, room_type_ids=[hold.room_type_id]
+    )
+    room_type = quoter.room_types[hold.room_type_id]
+    rate_plan = quoter.plans.get(hold.rate_plan_id)
+    rooms = price_rooms(quoter, [
+        {
+            "room_type_id": room_type.id,
+            "room_type_name": room_type.name,
+            "rate_plan_id": hold.rate_plan_id,
+            "rate_plan_name": rate_plan.name if rate_plan else None,
+        }
+        for _ in range(hold.rooms)
+    ], hold.check_in, hold.check_out)
+    
+    create_data = BookingCreate(
+        check_in=hold.check_in,
+        check_out=hold.check_out,
+        guest=booking_data.guest,
+        rooms=rooms,
+        special_requests=booking_data.special_requests,
+        promo_code=booking_data.promo_code
+    )
+    try:
+        booking, guest = await run_transaction(session, lambda: create_booking_record(
+            session, hotel_id, create_data, rooms,
+            hold_id=hold_id, source=BookingSource.BOOKING_ENGINE
+        ))
+    except HoldUnavailable:
+        raise HTTPException(status_code=410, detail="Hold has expired")
+    
+    return BookingRead.from_rows(booking, guest)
@@ -1,16 +1,23 @@
 """
 Rates Router
-Manage Rate Plans
+Manage Rate Plans aur room rates
 """
 from typing import List
-from fastapi import APIRouter, HTTPException, status
+from datetime import date, timedelta
+from fastapi import APIRouter, HTTPException, status, UploadFile, File, Query
 from sqlmodel import select
 
 from app.api.deps import CurrentUser, DbSession
-from app.models.rates import RatePlan, RatePlanCreate, RatePlanRead
+from app.models.rates import RatePlan, RatePlanCreate, RatePlanRead, RateBulkRequest, RateBulkResult
+from app.services.inventory import get_booked_counts
+from app.services.pricing import load_quoter
+from app.services.rate_upload import apply_rate_rows, parse_csv_rows
 
 router = APIRouter(prefix="/rates", tags=["Rates"])
 
+# Calendar ek request mein kitne din tak
+MAX_CALENDAR_DAYS = 366
+
 @router.get("/plans", response_model=List[RatePlanRead])
 async def get_rate_plans(current_user: CurrentUser, session: DbSession):
     """Get all rate plans"""
@@ -55,3 +62,100 @@ async def delete_rate_plan(plan_id: str, current_user: CurrentUser, session: DbS
     session.delete(rate_plan)
     await session.commit()
     return {"message": "Rate plan deleted"}
+
+
+@router.post("/bulk", response_model=RateBulkResult)
+async def bulk_upload_rates(
+    bulk_data: RateBulkRequest,
+    current_user: CurrentUser,
+    session: DbSession
+):
+    """
+    Rate matrix JSON mein upload karo.
+    Existing ranges ke saath merge + compact, ek transaction mein.
+    Invalid rows errors mein aati hain, baaki apply ho jaati hain.
+    """
+    result = await apply_rate_rows(session, current_user.hotel_id, bulk_data.rates)
+    await session.commit()
+    return result
+
+
+@router.post("/bulk/csv", response_model=RateBulkResult)
+async def bulk_upload_rates_csv(
+    current_user: CurrentUser,
+    session: DbSession,
+    file: UploadFile = File(...)
+):
+    """
+    Rate matrix CSV mein upload karo.
+    Columns: room_type_id, rate_plan_id, date_from, date_to, price (ya single `date`).
+    """
+    try:
+        rows = parse_csv_rows(await file.read())
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV must be UTF-8 encoded"
+        )
+    
+    result = await apply_rate_rows(session, current_user.hotel_id, rows)
+    await session.commit()
+    return result
+
+
+@router.get("/calendar")
+async def get_rate_calendar(
+    current_user: CurrentUser,
+    session: DbSession,
+    start_date: date = Query(...),
+    end_date: date = Query(...)
+):
+    """
+    Rates/Availability grid ke liye columnar calendar.
+    Ek `dates` axis, aur har room type ke liye us axis ke parallel arrays:
+    booked, available, aur har active rate plan ka price.
+    Inventory ledger ka ek range read + rates ka ek load - per-day dicts nahi.
+    """
+    days = (end_date - start_date).days + 1
+    if days <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must not be before start_date"
+        )
+    if days > MAX_CALENDAR_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range cannot exceed {MAX_CALENDAR_DAYS} days"
+        )
+    
+    range_end = end_date + timedelta(days=1)
+    quoter = await load_quoter(session, current_user.hotel_id, start_date, range_end)
+    booked_counts = await get_booked_counts(session, current_user.hotel_id, start_date, end_date)
+    dates = [start_date + timedelta(days=i) for i in range(days)]
+    
+    room_types = []
+    for rt in quoter.room_types.values():
+        booked = [max(0, booked_counts.get((rt.id, day), 0)) for day in dates]
+        room_types.append({
+            "id": rt.id,
+            "name": rt.name,
+            "total_inventory": rt.total_inventory,
+            "base_price": rt.base_price,
+            "booked": booked,
+            "available": [max(0, rt.total_inventory - count) for count in booked],
+            "plans": [
+                {
+                    "rate_plan_id": plan.id,
+                    "rate_plan_name": plan.name,
+                    "price": quoter.nightly_prices(rt.id, plan.id, start_date, range_end)
+                }
+                for plan in quoter.plans.values()
+            ]
+        })
+    
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "dates": [day.isoformat() for day in dates],
+        "room_types": room_types
+    }
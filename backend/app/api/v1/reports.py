@@ -1,99 +1,62 @@
 """
 Reports/Analytics Endpoints
 Real-time dashboard statistics.
+Dashboard / occupancy daily_hotel_stats (pre-aggregated) se padhte hain;
+lambi ranges /reports/jobs se background mein.
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import date, timedelta, datetime
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Response, status
 from sqlmodel import select, func, and_
 
 from app.api.deps import CurrentUser, DbSession
-from app.models.booking import Booking, BookingStatus
+from app.api.export import ExportFormatQuery, export_filename, export_response
+from app.models.booking import Booking, BookingRoom, BookingStatus
+from app.models.report_job import ReportJobCreate, ReportJobRead, ReportJobStatus, ReportKind
 from app.models.room import RoomType
+from app.core.config import get_settings
+from app.services.exports import OCCUPANCY_EXPORT_COLUMNS, occupancy_export_rows
+from app.services.pace import DEFAULT_PACE_DAYS_OUT, build_pace_report, pace_range
+from app.services.report_jobs import ReportJobLimitExceeded, report_jobs
+from app.services.reports import (
+    REVENUE_GROUPS, build_dashboard_report, build_occupancy_report, build_revenue_report, report_range
+)
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
+settings = get_settings()
+
+INLINE_RANGE_HINT = " - use POST /reports/jobs for longer ranges"
+
+
+def _check_range(start_date: date, end_date: date) -> None:
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
+        )
+
+
+def _check_span(span: int, max_days: int, hint: str = "") -> None:
+    """Range cap - inline endpoints REPORT_INLINE_MAX_RANGE_DAYS, jobs REPORT_JOB_MAX_RANGE_DAYS"""
+    if span > max_days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Report range cannot exceed {max_days} days{hint}"
+        )
+
 
 @router.get("/dashboard")
 async def get_dashboard_stats(
     current_user: CurrentUser,
     session: DbSession,
-    days: int = 30
+    days: int = Query(30, ge=0)
 ):
     """
     Get consolidated dashboard stats for the last N days.
+    daily_hotel_stats se N+1 rows - bookings scan nahi. N REPORT_INLINE_MAX_RANGE_DAYS tak.
     """
-    end_date = date.today()
-    start_date = end_date - timedelta(days=days)
-    
-    # 1. Fetch relevant bookings
-    query = select(Booking).where(
-        Booking.hotel_id == current_user.hotel_id,
-        Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.CHECKED_IN, BookingStatus.CHECKED_OUT]),
-        Booking.check_in >= start_date,
-        Booking.check_in <= end_date
-    )
-    result = await session.execute(query)
-    bookings = result.scalars().all()
-    
-    # 2. Total Revenue & Bookings
-    total_revenue = sum(b.total_amount for b in bookings)
-    total_bookings = len(bookings)
-    
-    # 3. Calculate Daily Stats for Charts
-    # Initialize dictionary for last N days
-    daily_stats = {}
-    for i in range(days + 1):
-        d = start_date + timedelta(days=i)
-        daily_stats[d] = {"date": d.isoformat(), "revenue": 0, "occupancy": 0, "bookings": 0}
-        
-    # Get Total Inventory for Occupancy Calc
-    # This is a simplification (assumes inventory constant)
-    inventory_result = await session.execute(
-        select(func.sum(RoomType.total_inventory)).where(RoomType.hotel_id == current_user.hotel_id)
-    )
-    total_inventory = inventory_result.scalar() or 0
-    
-    # Aggregate data
-    for booking in bookings:
-        # For revenue attribute to check-in date (simple attribution)
-        if booking.check_in in daily_stats:
-            daily_stats[booking.check_in]["revenue"] += booking.total_amount
-            daily_stats[booking.check_in]["bookings"] += 1
-            
-            # For occupancy, we should ideally span the range, but for simple chart:
-            # We count nights falling in this range? 
-            # Let's simple it: Count check-ins as "occupancy" activity for valid chart (trend)
-            # Or better: Check nights.
-            
-    # Accurate Occupancy Loop
-    # Loop dates, count rooms occupied
-    if total_inventory > 0:
-        for d_key in daily_stats.keys():
-            occupied = 0
-            for b in bookings:
-                if b.check_in <= d_key < b.check_out:
-                    # Count rooms in this booking
-                    # Each booking has 'rooms' list
-                    occupied += len(b.rooms)
-            
-            daily_stats[d_key]["occupancy"] = min(100, int((occupied / total_inventory) * 100))
-
-    # Convert to list sorted by date
-    chart_data = sorted(daily_stats.values(), key=lambda x: x["date"])
-    
-    # Occupancy Rate (Average of period)
-    avg_occupancy = sum(d["occupancy"] for d in chart_data) / len(chart_data) if chart_data else 0
-    
-    return {
-        "summary": {
-            "totalRevenue": total_revenue,
-            "totalBookings": total_bookings,
-            "occupancyRate": int(avg_occupancy),
-            "netProfit": total_revenue * 0.7 # Mock profit margin
-        },
-        "revenueChart": chart_data,
-        "occupancyChart": chart_data
-    }
+    _check_span(days, settings.REPORT_INLINE_MAX_RANGE_DAYS, INLINE_RANGE_HINT)
+    return await build_dashboard_report(session, current_user.hotel_id, days)
 
 @router.get("/occupancy")
 async def get_occupancy_report(
@@ -104,69 +67,190 @@ async def get_occupancy_report(
 ):
     """
     Get occupancy report for a date range.
+    Default last 30 days. REPORT_INLINE_MAX_RANGE_DAYS se lambi range par 400 - POST /reports/jobs.
+    """
+    start_date, end_date = report_range(start_date, end_date)
+    _check_range(start_date, end_date)
+    _check_span((end_date - start_date).days, settings.REPORT_INLINE_MAX_RANGE_DAYS, INLINE_RANGE_HINT)
+    return await build_occupancy_report(session, current_user.hotel_id, start_date, end_date)
+
+@router.get("/revenue")
+async def get_revenue_report(
+    current_user: CurrentUser,
+    session: DbSession,
+    start_date: date = Query(default=None),
+    end_date: date = Query(default=None),
+    group_by: str = Query("room_type", pattern="^(" + "|".join(REVENUE_GROUPS) + ")$")
+):
+    """
+    ADR, RevPAR aur occupancy - room type ya rate plan wise, kisi bhi range ke liye.
+    Revenue stay-night par (har raat ka hissa), check-in date par poora nahi.
+    Range REPORT_INLINE_MAX_RANGE_DAYS tak, usse lambi POST /reports/jobs se.
+    """
+    start_date, end_date = report_range(start_date, end_date)
+    _check_range(start_date, end_date)
+    _check_span((end_date - start_date).days, settings.REPORT_INLINE_MAX_RANGE_DAYS, INLINE_RANGE_HINT)
+    return await build_revenue_report(session, current_user.hotel_id, start_date, end_date, group_by)
+
+@router.get("/pace")
+async def get_pace_report(
+    current_user: CurrentUser,
+    session: DbSession,
+    start_date: date = Query(default=None),
+    end_date: date = Query(default=None),
+    days_out: List[int] = Query(default=list(DEFAULT_PACE_DAYS_OUT)),
+    room_type_id: Optional[str] = None
+):
+    """
+    Booking pace - har stay date ke liye 30 / 14 / 7 (ya diye gaye) din pehle
+    kitne room-nights on the books the, pichhle saal ke same weekday ke saath.
+    Sirf nightly pace snapshots se - bookings table nahi. Default aaj se 30 din aage.
+    """
+    start_date, end_date = pace_range(start_date, end_date)
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
+        )
+    if not days_out or any(lead < 0 or lead >= settings.PACE_HORIZON_DAYS for lead in days_out):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"days_out must be between 0 and {settings.PACE_HORIZON_DAYS - 1}"
+        )
+    return await build_pace_report(session, current_user.hotel_id, start_date, end_date, days_out, room_type_id)
+
+
+# ============== Background Report Jobs ==============
+
+@router.post("/jobs", response_model=ReportJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def submit_report_job(job_data: ReportJobCreate, current_user: CurrentUser):
+    """
+    Report background mein chalao (dashboard / occupancy / revenue) - turant job milta hai, GET /jobs/{id} se
+    status, done hone par /jobs/{id}/result. Same report pehle se chal raha ho
+    (ya abhi-abhi bana ho aur stats nahi badle) toh wahi job milta hai.
+    Range REPORT_JOB_MAX_RANGE_DAYS se lambi ho toh 400, pending jobs zyada hon toh 429.
+    """
+    if job_data.kind == ReportKind.DASHBOARD:
+        span = job_data.days
+        params = {"days": job_data.days}
+    else:
+        start_date, end_date = report_range(job_data.start_date, job_data.end_date)
+        _check_range(start_date, end_date)
+        span = (end_date - start_date).days
+        params = {"start_date": start_date, "end_date": end_date}
+        if job_data.kind == ReportKind.REVENUE:
+            params["group_by"] = job_data.group_by
+    _check_span(span, settings.REPORT_JOB_MAX_RANGE_DAYS)
+    try:
+        return report_jobs.submit(current_user.hotel_id, job_data.kind, params).read()
+    except ReportJobLimitExceeded:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many report jobs in progress - wait for running jobs to finish"
+        )
+
+
+def _get_job(current_user, job_id: str):
+    job = report_jobs.get(current_user.hotel_id, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report job not found or expired"
+        )
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=ReportJobRead)
+async def get_report_job(job_id: str, current_user: CurrentUser):
+    """Job ka status - queued / running / done / failed"""
+    return _get_job(current_user, job_id).read()
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_report_job_result(job_id: str, current_user: CurrentUser):
+    """Report JSON (inline endpoint jaisa shape) - job done na ho toh 409"""
+    job = _get_job(current_user, job_id)
+    if job.status != ReportJobStatus.DONE:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=job.error or f"Report job is {job.status.value}"
+        )
+    return Response(content=job.result, media_type="application/json")
+
+
+@router.get("/occupancy/export")
+async def export_occupancy(
+    current_user: CurrentUser,
+    start_date: date = Query(default=None),
+    end_date: date = Query(default=None),
+    file_format: str = ExportFormatQuery
+):
+    """
+    Daily occupancy export (CSV / JSONL) - har din ek row, /occupancy jaisa
+    plus revenue / arrivals / departures / cancellations. Default pichhle 30 din.
+    """
+    start_date, end_date = report_range(start_date, end_date)
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
+        )
+    
+    return export_response(
+        occupancy_export_rows(current_user.hotel_id, start_date, end_date),
+        OCCUPANCY_EXPORT_COLUMNS,
+        file_format,
+        export_filename("occupancy", file_format, start_date, end_date)
+    )
+
+
+@router.get("/room-types")
+async def get_room_type_report(
+    current_user: CurrentUser,
+    session: DbSession,
+    start_date: date = Query(default=None),
+    end_date: date = Query(default=None)
+):
+    """
+    Room type wise rooms sold aur revenue (check-in date ke hisaab se).
+    booking_rooms par ek hi GROUP BY.
     """
-    # Default to last 30 days if not specified
     if not end_date:
         end_date = date.today()
     if not start_date:
         start_date = end_date - timedelta(days=30)
     
-    # Get total inventory
-    inventory_result = await session.execute(
-        select(func.sum(RoomType.total_inventory)).where(RoomType.hotel_id == current_user.hotel_id)
-    )
-    total_inventory = inventory_result.scalar() or 0
-    
-    if total_inventory == 0:
-        return {
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat(),
-            "total_inventory": 0,
-            "average_occupancy": 0,
-            "daily_occupancy": []
-        }
-    
-    # Get bookings in range
-    query = select(Booking).where(
-        Booking.hotel_id == current_user.hotel_id,
-        Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.CHECKED_IN, BookingStatus.CHECKED_OUT]),
-        Booking.check_out > start_date,
-        Booking.check_in < end_date
+    query = (
+        select(
+            RoomType.id,
+            RoomType.name,
+            func.count(BookingRoom.id),
+            func.count(func.distinct(BookingRoom.booking_id)),
+            func.coalesce(func.sum(BookingRoom.total_price), 0)
+        )
+        .join(BookingRoom, BookingRoom.room_type_id == RoomType.id)
+        .join(Booking, Booking.id == BookingRoom.booking_id)
+        .where(
+            RoomType.hotel_id == current_user.hotel_id,
+            Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.CHECKED_IN, BookingStatus.CHECKED_OUT]),
+            BookingRoom.check_in >= start_date,
+            BookingRoom.check_in <= end_date
+        )
+        .group_by(RoomType.id, RoomType.name)
     )
     result = await session.execute(query)
-    bookings = result.scalars().all()
-    
-    # Calculate daily occupancy
-    daily_occupancy = []
-    current_date = start_date
-    total_occupancy = 0
-    days_count = 0
-    
-    while current_date <= end_date:
-        occupied = 0
-        for booking in bookings:
-            if booking.check_in <= current_date < booking.check_out:
-                occupied += len(booking.rooms) if hasattr(booking, 'rooms') else 1
-        
-        occupancy_rate = min(100, int((occupied / total_inventory) * 100))
-        daily_occupancy.append({
-            "date": current_date.isoformat(),
-            "occupied_rooms": occupied,
-            "available_rooms": total_inventory - occupied,
-            "occupancy_rate": occupancy_rate
-        })
-        
-        total_occupancy += occupancy_rate
-        days_count += 1
-        current_date += timedelta(days=1)
-    
-    average_occupancy = int(total_occupancy / days_count) if days_count > 0 else 0
     
     return {
         "start_date": start_date.isoformat(),
         "end_date": end_date.isoformat(),
-        "total_inventory": total_inventory,
-        "average_occupancy": average_occupancy,
-        "daily_occupancy": daily_occupancy
+        "room_types": [
+            {
+                "room_type_id": room_type_id,
+                "room_type_name": name,
+                "rooms_sold": rooms_sold,
+                "bookings": bookings_count,
+                "revenue": float(revenue)
+            }
+            for room_type_id, name, rooms_sold, bookings_count, revenue in result.all()
+        ]
     }
-
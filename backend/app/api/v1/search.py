@@ -0,0 +1,28 @@
+"""
+Search Router
+Front desk search - guest naam/email/phone aur booking number.
+Indexed search service (FTS5 / pg_trgm) se ranked, limited results.
+"""
+from fastapi import APIRouter, Query
+
+from app.api.deps import CurrentUser, DbSession
+from app.models.booking import SearchResults
+from app.services.search import search_bookings, search_guests
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("", response_model=SearchResults)
+async def search(
+    current_user: CurrentUser,
+    session: DbSession,
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Guests aur bookings search karo.
+    Guests: naam, email ya phone (prefix match). Bookings: booking number prefix (BK...).
+    """
+    guests = await search_guests(session, current_user.hotel_id, q, limit)
+    bookings = await search_bookings(session, current_user.hotel_id, q, limit)
+    return SearchResults(guests=guests, bookings=bookings)
@@ -35,6 +35,42 @@ class Settings(BaseSettings):
     # CORS - Frontend URL allow karna hai
     CORS_ORIGINS: list[str] = ["http://localhost:5173", "http://127.0.0.1:5173", "http://localhost:3000", "http://localhost:8080", "http://127.0.0.1:8080"]
 
+    # Public booking flow - room itne minute hold rehta hai
+    HOLD_TTL_MINUTES: int = 15
+    # Sweeper doosre workers ke expired holds ke liye itne seconds mein DB dekhta hai
+    HOLD_SWEEP_INTERVAL_SECONDS: int = 60
+    # Ek client (IP) ek hotel mein ek saath itne active holds / itne held rooms tak
+    HOLD_MAX_ACTIVE_PER_CLIENT: int = 3
+    HOLD_MAX_ROOMS_PER_CLIENT: int = 10
+
+    # Idempotency-Key responses itni der yaad rehte hain (process-local store)
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 60 * 60
+    IDEMPOTENCY_MAX_KEYS: int = 10000
+
+    # Dashboard stats / recent bookings per hotel itne seconds cache (tabs ki polling)
+    DASHBOARD_CACHE_TTL_SECONDS: int = 15
+    # Reports ke closed din - itne (hotel, day) stats rows process memory mein
+    REPORT_DAY_CACHE_MAX_ENTRIES: int = 200000
+    # ... aur itne seconds tak - manage.py (alag process) ke stats writes isse der se nahi dikhte
+    REPORT_DAY_CACHE_TTL_SECONDS: int = 300
+
+    # Background report jobs - ek saath kitne, result kitni der, max kitne jobs yaad
+    REPORT_JOB_CONCURRENCY: int = 2
+    REPORT_JOB_RESULT_TTL_SECONDS: int = 60 * 60
+    REPORT_JOB_MAX_JOBS: int = 1000
+    # Done job ka result naye submit ko itni der tak hi milta hai (aur stats na badle hon)
+    REPORT_JOB_REUSE_SECONDS: int = 60
+    # Ek hotel ke itne queued / running jobs se zyada nahi; range itne din tak
+    REPORT_JOB_MAX_PENDING_PER_HOTEL: int = 5
+    REPORT_JOB_MAX_RANGE_DAYS: int = 3660
+    # Inline /reports (dashboard, occupancy, revenue) itne din tak - lambi range /reports/jobs se
+    REPORT_INLINE_MAX_RANGE_DAYS: int = 366
+
+    # Pace snapshot night audit par aage ki itni raaton ka on-the-books rakhta hai
+    PACE_HORIZON_DAYS: int = 365
+
+    # manage.py night-audit - ek saath kitne hotels ka audit chalta hai
+    NIGHT_AUDIT_CONCURRENCY: int = 4
     
     class Config:
         env_file = ".env"
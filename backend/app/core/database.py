@@ -3,12 +3,22 @@ Database Configuration
 SQLModel + Async SQLAlchemy setup.
 Development mein SQLite, Production mein PostgreSQL use karo.
 """
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, TypeVar
+
 from sqlmodel import SQLModel
+from sqlalchemy import Enum, func, inspect, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.dialects import postgresql, sqlite
 
 from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
 # Async engine banate hain - SQLite ke liye aiosqlite driver
@@ -30,6 +40,57 @@ async_session = sessionmaker(
 )
 
 
+# Deadlock / serialization failure / SQLite lock - transaction dobara chalane se theek ho jaate hain
+RETRYABLE_SQLSTATES = {"40001", "40P01"}
+
+
+def is_retryable_error(exc: DBAPIError) -> bool:
+    """Transient concurrency error hai ya nahi (retry safe hai)"""
+    orig = getattr(exc, "orig", None)
+    sqlstate = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    if sqlstate in RETRYABLE_SQLSTATES:
+        return True
+    return "database is locked" in str(orig)
+
+
+T = TypeVar("T")
+
+# Deadlock / lock timeout par write transaction kitni baar try hota hai
+MAX_WRITE_ATTEMPTS = 3
+
+
+async def run_transaction(session: AsyncSession, work: Callable[[], Awaitable[T]]) -> T:
+    """
+    work() (jo khud commit karta hai) chalata hai. Transient concurrency error
+    par rollback karke thode jitter ke baad poora transaction dobara; koi bhi
+    aur exception rollback ke baad upar jaata hai.
+    Note: rollback session ke ORM objects expire kar deta hai - work() ko
+    jo values chahiye (jaise hotel_id) pehle hi nikaal lo.
+    """
+    for attempt in range(1, MAX_WRITE_ATTEMPTS + 1):
+        try:
+            return await work()
+        except DBAPIError as exc:
+            await session.rollback()
+            if attempt == MAX_WRITE_ATTEMPTS or not is_retryable_error(exc):
+                raise
+            await asyncio.sleep(random.uniform(0.01, 0.05) * attempt)
+        except Exception:
+            await session.rollback()
+            raise
+
+
+def dialect_insert(table):
+    """
+    Current dialect ka INSERT construct return karta hai.
+    PostgreSQL aur SQLite dono ON CONFLICT support karte hain, isliye
+    upserts ek hi statement mein ho jaate hain.
+    """
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
 async def init_db():
     """
     Database tables create karta hai agar exist nahi karte.
@@ -37,6 +98,81 @@ async def init_db():
     """
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_create_missing_indexes)
+    await _add_missing_enum_values()
+
+
+def _add_missing_columns(conn):
+    """
+    Purani tables mein model ke naye columns ALTER TABLE se add karta hai.
+    Sirf nullable ya server_default wale columns ke liye chalta hai - NOT NULL
+    bina default wala column purani rows par fail hota, woh skip + warning.
+    """
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    for table in SQLModel.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable and column.server_default is None:
+                logger.warning(
+                    "Skipping column %s.%s: NOT NULL without server_default "
+                    "cannot be added to an existing table", table.name, column.name
+                )
+                continue
+            column_sql = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column_sql}")
+
+
+def _create_missing_indexes(conn):
+    """
+    create_all purani tables par naye indexes nahi banata (migrations nahi hain),
+    isliye model mein add hue indexes yahan alag se ban jaate hain.
+    Unique index ke liye purana data duplicate ho toh skip - data fix hone ke
+    baad (jaise merge_duplicate_guests) agle startup par ban jaata hai.
+    """
+    inspector = inspect(conn)
+    for table in SQLModel.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            if index.unique and _has_duplicates(conn, index):
+                logger.warning("Skipping unique index %s: %s has duplicate rows", index.name, table.name)
+                continue
+            index.create(conn)
+
+
+def _has_duplicates(conn, index) -> bool:
+    columns = list(index.columns)
+    query = select(*columns).group_by(*columns).having(func.count() > 1).limit(1)
+    return conn.execute(query).first() is not None
+
+
+async def _add_missing_enum_values():
+    """
+    PostgreSQL native enum types mein model ke naye values (jaise NO_SHOW) add
+    karta hai. ADD VALUE ke liye autocommit - naya value usi transaction mein use nahi ho sakta.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    enums = {
+        column.type.name: column.type.enums
+        for table in SQLModel.metadata.sorted_tables
+        for column in table.columns
+        if isinstance(column.type, Enum) and column.type.native_enum and column.type.name
+    }
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for type_name, values in enums.items():
+            for value in values:
+                await conn.exec_driver_sql(
+                    f"ALTER TYPE {type_name} ADD VALUE IF NOT EXISTS '{value}'"
+                )
 
 
 async def get_session() -> AsyncSession:
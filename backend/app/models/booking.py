@@ -4,7 +4,7 @@ Complete booking flow ke liye.
 Frontend Booking, Guest, BookingRoom interfaces se match.
 """
 from sqlmodel import SQLModel, Field, Relationship, Column
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index
 from typing import Optional, List, TYPE_CHECKING
 from datetime import datetime, date
 from enum import Enum
@@ -22,6 +22,7 @@ class BookingStatus(str, Enum):
     CANCELLED = "cancelled"
     CHECKED_IN = "checked_in"
     CHECKED_OUT = "checked_out"
+    NO_SHOW = "no_show"
 
 
 class BookingSource(str, Enum):
@@ -46,6 +47,12 @@ class GuestBase(SQLModel):
 class Guest(GuestBase, table=True):
     """Guest table - Frontend Guest interface se match"""
     __tablename__ = "guests"
+    __table_args__ = (
+        # Keyset pagination (created_at DESC, id DESC) ke liye
+        Index("ix_guests_hotel_created_id", "hotel_id", "created_at", "id"),
+        # Ek hotel mein ek email = ek guest - upsert ka conflict target
+        Index("uq_guests_hotel_email", "hotel_id", "email", unique=True),
+    )
     
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     hotel_id: str = Field(foreign_key="hotels.id", index=True)
@@ -67,17 +74,34 @@ class GuestRead(GuestBase):
     created_at: datetime
 
 
-class BookingRoom(SQLModel):
-    """Embedded booking room - Frontend BookingRoom se match"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+class BookingRoomBase(SQLModel):
+    """Booking room fields - Frontend BookingRoom se match"""
     room_type_id: str
-    room_type_name: str
-    rate_plan_id: str
-    rate_plan_name: str
+    room_type_name: Optional[str] = None
+    rate_plan_id: Optional[str] = None
+    rate_plan_name: Optional[str] = None
     guests: int = 1
     children: int = 0
-    price_per_night: float
-    total_price: float
+    price_per_night: float = 0
+    total_price: float = 0
+
+
+class BookingRoom(BookingRoomBase, table=True):
+    """
+    Booking ke rooms ka normalized table.
+    Booking.rooms JSON frontend ke liye rehta hai; room type wise
+    aggregation (availability, revenue) is table par SQL mein hota hai.
+    """
+    __tablename__ = "booking_rooms"
+    __table_args__ = (
+        Index("ix_booking_rooms_hotel_room_type_dates", "hotel_id", "room_type_id", "check_in", "check_out"),
+    )
+    
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    booking_id: str = Field(foreign_key="bookings.id", index=True)
+    hotel_id: str = Field(foreign_key="hotels.id")
+    check_in: date
+    check_out: date
 
 
 class BookingBase(SQLModel):
@@ -98,6 +122,12 @@ class Booking(BookingBase, table=True):
     Rooms JSON array mein store hote hain.
     """
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Keyset pagination (created_at DESC, id DESC) ke liye
+        Index("ix_bookings_hotel_created_id", "hotel_id", "created_at", "id"),
+        # Export (check_in, id order) aur check_in range reports - sort ke bina index scan
+        Index("ix_bookings_hotel_check_in_id", "hotel_id", "check_in", "id"),
+    )
     
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     hotel_id: str = Field(foreign_key="hotels.id", index=True)
@@ -135,6 +165,18 @@ class BookingRead(BookingBase):
     rooms: List[dict]
     created_at: datetime
     updated_at: datetime
+    
+    @classmethod
+    def from_rows(cls, booking: "Booking", guest: "Guest") -> "BookingRead":
+        """
+        DB rows se seedha response - model_dump() -> dict -> re-validate
+        round trip ke bina. Data DB se aaya hai, isliye validation skip.
+        """
+        data = {name: getattr(booking, name) for name in cls.model_fields if name != "guest"}
+        data["guest"] = GuestRead.model_construct(
+            **{name: getattr(guest, name) for name in GuestRead.model_fields}
+        )
+        return cls.model_construct(**data)
 
 
 class BookingUpdate(SQLModel):
@@ -142,3 +184,59 @@ class BookingUpdate(SQLModel):
     status: Optional[BookingStatus] = None
     paid_amount: Optional[float] = None
     special_requests: Optional[str] = None
+
+
+class BookingSearchHit(SQLModel):
+    """Search result mein booking - guest naam ke saath"""
+    id: str
+    booking_number: str
+    status: BookingStatus
+    check_in: date
+    check_out: date
+    total_amount: float
+    guest_id: str
+    guest_name: str
+
+
+class SearchResults(SQLModel):
+    """GET /search response - guests aur bookings alag ranked lists"""
+    guests: List[GuestRead] = []
+    bookings: List[BookingSearchHit] = []
+
+
+class BookingImportRow(SQLModel):
+    """
+    Bulk import ki ek row - purane PMS ka booking.
+    Prices file se aate hain (quote nahi hota), status/booking_number bhi.
+    """
+    booking_number: Optional[str] = None
+    check_in: date
+    check_out: date
+    status: BookingStatus = BookingStatus.CONFIRMED
+    source: BookingSource = BookingSource.MANUAL
+    guest: GuestCreate
+    rooms: List[dict]
+    total_amount: Optional[float] = Field(default=None, ge=0)
+    paid_amount: float = Field(default=0, ge=0)
+    special_requests: Optional[str] = None
+    promo_code: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class ImportRowError(SQLModel):
+    row: int
+    error: str
+
+
+class BookingImportResult(SQLModel):
+    """
+    Bulk import ka result - errors pehle MAX_REPORTED_ERRORS tak hi list hote hain.
+    batches_failed: jo batches commit nahi hue (unki har row errors mein)
+    """
+    rows_received: int = 0
+    bookings_created: int = 0
+    guests_created: int = 0
+    guests_matched: int = 0
+    error_count: int = 0
+    batches_failed: int = 0
+    errors: List[ImportRowError] = []
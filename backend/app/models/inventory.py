@@ -0,0 +1,116 @@
+"""
+Inventory Ledger Model
+Har room type aur stay date ke liye booked rooms ka materialized count.
+Booking create/update/cancel ke saath same transaction mein update hota hai,
+isliye availability ek simple indexed range read ban jaati hai.
+Public booking flow ke temporary holds bhi yahin hain.
+"""
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Index, UniqueConstraint
+from datetime import datetime, date
+from enum import Enum
+from typing import Optional
+import uuid
+
+from app.models.booking import GuestCreate
+
+
+class InventoryLedger(SQLModel, table=True):
+    """
+    Ledger row - ek room type, ek raat.
+    booked = us raat ke liye non-cancelled bookings mein kitne rooms hain.
+    held = us raat ke active (expire nahi hue) holds mein kitne rooms hain.
+    """
+    __tablename__ = "inventory_ledger"
+    __table_args__ = (
+        UniqueConstraint("room_type_id", "stay_date", name="uq_inventory_ledger_room_type_date"),
+        Index("ix_inventory_ledger_hotel_room_type_date", "hotel_id", "room_type_id", "stay_date"),
+    )
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    hotel_id: str = Field(foreign_key="hotels.id")
+    room_type_id: str = Field(foreign_key="room_types.id")
+    stay_date: date
+    booked: int = Field(default=0)
+    # Active holds ke rooms - availability = total - booked - held
+    held: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class LedgerMismatch(SQLModel):
+    """Verify command ka output - ledger aur bookings/holds mein farak"""
+    hotel_id: str
+    room_type_id: str
+    stay_date: date
+    ledger: int
+    expected: int
+    ledger_held: int = 0
+    expected_held: int = 0
+
+
+class HoldStatus(str, Enum):
+    """Hold lifecycle"""
+    ACTIVE = "active"
+    CONVERTED = "converted"
+    EXPIRED = "expired"
+    RELEASED = "released"
+
+
+class InventoryHold(SQLModel, table=True):
+    """
+    Public flow ka temporary hold - guest details bharte waqt room
+    expires_at tak reserved rehta hai (ledger.held mein count hota hai).
+    """
+    __tablename__ = "inventory_holds"
+    __table_args__ = (
+        # Sweeper aur startup load sirf active holds expiry order mein padhte hain
+        Index("ix_inventory_holds_status_expires", "status", "expires_at"),
+        # Per-client cap ka count
+        Index("ix_inventory_holds_hotel_client_status", "hotel_id", "client_ip", "status"),
+    )
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    hotel_id: str = Field(foreign_key="hotels.id", index=True)
+    room_type_id: str = Field(foreign_key="room_types.id")
+    rate_plan_id: Optional[str] = None
+    check_in: date
+    check_out: date
+    rooms: int = Field(default=1)
+    status: HoldStatus = Field(default=HoldStatus.ACTIVE)
+    expires_at: datetime
+    booking_id: Optional[str] = Field(default=None, foreign_key="bookings.id")
+    # Public endpoint unauthenticated hai - per-client cap isi se
+    client_ip: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class HoldCreate(SQLModel):
+    """Public hold request"""
+    room_type_id: str
+    rate_plan_id: Optional[str] = None
+    check_in: date
+    check_out: date
+    # Ek hold mein max rooms - per-client total HOLD_MAX_ROOMS_PER_CLIENT alag se
+    rooms: int = Field(default=1, ge=1, le=10)
+
+
+class HoldRead(SQLModel):
+    """Hold response - frontend countdown ke liye expires_at"""
+    id: str
+    hotel_id: str
+    room_type_id: str
+    rate_plan_id: Optional[str]
+    check_in: date
+    check_out: date
+    rooms: int
+    status: HoldStatus
+    expires_at: datetime
+    booking_id: Optional[str]
+    total_price: Optional[float] = None
+
+
+class HoldBookingCreate(SQLModel):
+    """Hold se booking - sirf guest details, rooms/dates hold se aate hain"""
+    guest: GuestCreate
+    special_requests: Optional[str] = None
+    promo_code: Optional[str] = None
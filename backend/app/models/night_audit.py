@@ -0,0 +1,46 @@
+"""
+Night Audit Model
+Har hotel ke har business day ka closing snapshot. Audit chalne ke baad
+woh din "closed" maana jaata hai - row hi closed-day marker hai.
+"""
+from sqlmodel import SQLModel, Field
+from sqlalchemy import UniqueConstraint
+from datetime import datetime, date
+from typing import Optional
+import uuid
+
+
+class NightAuditBase(SQLModel):
+    """Din ke closing numbers"""
+    business_date: date
+    rooms_available: int = 0
+    rooms_sold: int = 0
+    room_revenue: float = 0
+    arrivals: int = 0
+    departures: int = 0
+    # Is audit ne kitni bookings transition kin
+    no_shows: int = 0
+    checked_out: int = 0
+
+
+class NightAudit(NightAuditBase, table=True):
+    """Snapshot table - (hotel_id, business_date) unique, audit dobara chale toh overwrite"""
+    __tablename__ = "night_audits"
+    __table_args__ = (
+        UniqueConstraint("hotel_id", "business_date", name="uq_night_audits_hotel_date"),
+    )
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    hotel_id: str = Field(foreign_key="hotels.id")
+    closed_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class NightAuditRead(NightAuditBase):
+    id: str
+    hotel_id: str
+    closed_at: datetime
+
+
+class NightAuditRequest(SQLModel):
+    """POST /night-audit - date na do toh kal ka din close hota hai"""
+    business_date: Optional[date] = None
@@ -0,0 +1,34 @@
+"""
+Pace Snapshot Model
+Har raat (night audit par) on-the-books room-nights ki photo - baad mein
+"30 / 14 / 7 din pehle kitna bika tha" isi se, bookings se nahi (status
+badalne par purani history overwrite ho jaati hai).
+
+Compact: ek row = ek hotel, ek room type, ek snapshot_date; aage ki stay
+dates ke counts JSON arrays mein (index 0 = first_stay_date).
+"""
+from sqlmodel import SQLModel, Field
+from sqlalchemy import JSON, Column, UniqueConstraint
+from datetime import datetime, date
+from typing import List
+import uuid
+
+
+class PaceSnapshot(SQLModel, table=True):
+    """
+    rooms[i] / revenue[i] = first_stay_date + i raat ke liye snapshot_date ko
+    on-the-books rooms aur unka room revenue (confirmed / checked_in / checked_out).
+    """
+    __tablename__ = "pace_snapshots"
+    __table_args__ = (
+        UniqueConstraint("hotel_id", "snapshot_date", "room_type_id", name="uq_pace_snapshots_hotel_date_room"),
+    )
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    hotel_id: str = Field(foreign_key="hotels.id")
+    room_type_id: str
+    snapshot_date: date
+    first_stay_date: date
+    rooms: List[int] = Field(default_factory=list, sa_column=Column(JSON))
+    revenue: List[float] = Field(default_factory=list, sa_column=Column(JSON))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
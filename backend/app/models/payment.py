@@ -2,6 +2,7 @@
 Payment Models
 """
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 from typing import Optional
 from datetime import datetime
 from enum import Enum
@@ -24,6 +25,10 @@ class PaymentBase(SQLModel):
 
 class Payment(PaymentBase, table=True):
     __tablename__ = "payments"
+    __table_args__ = (
+        # Keyset pagination (created_at DESC, id DESC) ke liye
+        Index("ix_payments_hotel_created_id", "hotel_id", "created_at", "id"),
+    )
     
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     hotel_id: str = Field(foreign_key="hotels.id", index=True)
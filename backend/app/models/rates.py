@@ -69,3 +69,25 @@ class RoomRateRead(SQLModel):
     date_from: date
     date_to: date
     price: float
+
+
+class RateBulkRequest(SQLModel):
+    """
+    Bulk rates upload - har row ek RoomRateCreate jaisa dict.
+    Rows raw rakhe hain taaki ek kharab row poora batch fail na kare.
+    """
+    rates: List[dict]
+
+
+class RateRowError(SQLModel):
+    row: int
+    error: str
+
+
+class RateBulkResult(SQLModel):
+    """Bulk upload ka result - per-row errors ke saath"""
+    rows_received: int
+    rows_applied: int
+    ranges_deleted: int
+    ranges_written: int
+    errors: List[RateRowError]
@@ -0,0 +1,48 @@
+"""
+Report Job Models
+Lambi range ki reports background mein - submit, status poll, result fetch.
+Jobs process memory mein rehte hain (table nahi), result TTL tak.
+"""
+from sqlmodel import SQLModel, Field
+from datetime import datetime, date
+from typing import Literal, Optional
+from enum import Enum
+
+
+class ReportKind(str, Enum):
+    DASHBOARD = "dashboard"
+    OCCUPANCY = "occupancy"
+    REVENUE = "revenue"
+
+
+class ReportJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ReportJobCreate(SQLModel):
+    """
+    POST /reports/jobs - inline endpoint jaise hi params:
+    dashboard ke liye `days`, occupancy / revenue ke liye start_date / end_date,
+    revenue ke liye group_by (room_type / rate_plan) bhi.
+    """
+    kind: ReportKind
+    days: int = Field(default=30, ge=0)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    group_by: Literal["room_type", "rate_plan"] = "room_type"
+
+
+class ReportJobRead(SQLModel):
+    id: str
+    kind: ReportKind
+    status: ReportJobStatus
+    params: dict
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    # Result itne baje tak milega, uske baad job hat jaata hai
+    expires_at: Optional[datetime] = None
+    error: Optional[str] = None
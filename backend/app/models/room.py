@@ -6,7 +6,7 @@ Frontend RoomType interface se match karta hai.
 from sqlmodel import SQLModel, Field, Relationship, Column
 from sqlalchemy import JSON
 from typing import Optional, List, TYPE_CHECKING
-from datetime import datetime
+from datetime import datetime, date
 import uuid
 
 if TYPE_CHECKING:
@@ -81,6 +81,27 @@ class RoomTypeRead(RoomTypeBase):
     updated_at: datetime
 
 
+class PublicRoomSearchRead(RoomTypeRead):
+    """Public search response - Frontend PublicRoomSearch se match"""
+    available_rooms: int
+    rate_plan_id: Optional[str] = None
+    rate_plan_name: Optional[str] = None
+    price_per_night: float
+    total_price: float
+
+
+class FlexibleStayRead(SQLModel):
+    """Flexible search ka ek feasible window - check_in + room type"""
+    check_in: date
+    check_out: date
+    room_type_id: str
+    room_type_name: str
+    available_rooms: int
+    rate_plan_id: Optional[str] = None
+    price_per_night: float
+    total_price: float
+
+
 class RoomTypeUpdate(SQLModel):
     """Partial update"""
     name: Optional[str] = None
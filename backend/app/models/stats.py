@@ -0,0 +1,67 @@
+"""
+Daily Stats Model
+Har hotel ke har din ka pre-aggregated fact row. Booking writes ke saath
+usi transaction mein incrementally update hota hai, isliye reports N din
+ke liye N rows padhti hain - bookings scan nahi.
+
+StayNightRevenue: wahi cheez room type / rate plan grain par - har booked
+room ka revenue uski raaton mein barabar bata hua (ADR / RevPAR ke liye).
+"""
+from sqlmodel import SQLModel, Field
+from sqlalchemy import UniqueConstraint
+from datetime import datetime, date
+import uuid
+
+
+class DailyHotelStats(SQLModel, table=True):
+    """
+    Ek hotel, ek din. Sirf confirmed / checked_in / checked_out bookings count hoti hain.
+    - rooms_sold: us raat occupied rooms
+    - revenue, arrivals: check_in din par (booking total_amount)
+    - room_revenue: us raat ka room revenue (har room ka total_price / nights)
+    - departures: check_out din par
+    - cancellations: cancelled bookings, unke check_in din par
+    """
+    __tablename__ = "daily_hotel_stats"
+    __table_args__ = (
+        UniqueConstraint("hotel_id", "stat_date", name="uq_daily_hotel_stats_hotel_date"),
+    )
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    hotel_id: str = Field(foreign_key="hotels.id")
+    stat_date: date
+    rooms_sold: int = Field(default=0)
+    revenue: float = Field(default=0)
+    # Baad mein aaya column - purani table par ALTER TABLE ke liye server_default
+    room_revenue: float = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    arrivals: int = Field(default=0)
+    departures: int = Field(default=0)
+    cancellations: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+# Rate plan ke bina booked rooms - unique key mein NULL nahi chalta
+NO_RATE_PLAN = ""
+
+
+class StayNightRevenue(SQLModel, table=True):
+    """
+    Stay-night fact: ek hotel, ek raat, ek room type, ek rate plan.
+    rooms_sold us raat ke rooms, room_revenue unka nightly revenue.
+    """
+    __tablename__ = "stay_night_revenue"
+    __table_args__ = (
+        UniqueConstraint(
+            "hotel_id", "stay_date", "room_type_id", "rate_plan_id",
+            name="uq_stay_night_revenue_hotel_date_room_plan"
+        ),
+    )
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    hotel_id: str = Field(foreign_key="hotels.id")
+    stay_date: date
+    room_type_id: str
+    rate_plan_id: str = Field(default=NO_RATE_PLAN)
+    rooms_sold: int = Field(default=0)
+    room_revenue: float = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
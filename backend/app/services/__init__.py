@@ -0,0 +1 @@
+# Services - Inventory aur shared domain logic
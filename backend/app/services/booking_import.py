@@ -0,0 +1,402 @@
+"""
+Bulk Booking Import
+Naye hotel ki onboarding - purane PMS ki saalon ki history (JSONL ya CSV)
+ek stream mein load hoti hai. POST /bookings ki tarah har row par guest
+lookup + flush + commit nahi:
+
+- Rows file se stream hoti hain, IMPORT_BATCH_SIZE ke batches mein
+- Guests (hotel_id, email) par memory mein dedupe - har batch ke naye
+  emails ka ek bulk upsert (ON CONFLICT), baaki dict se
+- Bookings, booking_rooms ek-ek bulk insert (PostgreSQL par COPY, SQLite
+  par executemany), ledger ek upsert - phir batch commit
+- Kharab rows errors mein report hoti hain, import nahi rukta
+
+Search index triggers / GIN index se sync rehta hai; booking index batch ke
+baad invalidate hota hai. Booking number pehle se ho toh row skip hoti hai,
+isliye beech mein ruka import dobara chalana safe hai. File mein number na ho
+toh row ke content ka hash number banta hai - dobara chalane par wahi number.
+Koi batch fail ho toh uski rows errors mein aati hain, baaki import chalta hai.
+"""
+import csv
+import hashlib
+import json
+import logging
+from datetime import datetime
+from itertools import islice
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy import Table
+from starlette.concurrency import iterate_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.booking import (
+    Booking, BookingImportResult, BookingImportRow, BookingRoom, Guest, ImportRowError
+)
+from app.models.room import RoomType
+from app.services.booking_rooms import build_booking_rooms
+from app.services.daily_stats import StatDeltas, add_booking_contribution, apply_stat_deltas, new_deltas
+from app.services.guests import upsert_guests
+from app.services.inventory import add_booked_stays, holds_inventory, room_type_counts
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("jsonl", "csv")
+IMPORT_BATCH_SIZE = 1000
+
+# Lakhon kharab rows ka poora list response mein nahi - count sab ka
+MAX_REPORTED_ERRORS = 1000
+
+GUEST_COLUMNS = ("first_name", "last_name", "email", "phone", "nationality", "id_type", "id_number", "address")
+ROOM_COLUMNS = ("room_type_id", "rate_plan_id", "rooms", "guests")
+
+# (row_number, data, parse error)
+ParsedRow = Tuple[int, Optional[dict], Optional[str]]
+
+ProgressCallback = Callable[[BookingImportResult], None]
+
+# Rows without booking_number: prefix + row content ke sha256 ke itne hex chars (96 bits)
+IMPORT_NUMBER_PREFIX = "IM"
+IMPORT_NUMBER_HEX_CHARS = 24
+
+
+def import_format(filename: Optional[str], requested: Optional[str] = None) -> str:
+    """Explicit format, warna file extension se (.csv -> csv, baaki jsonl)"""
+    if requested:
+        return requested
+    return "csv" if (filename or "").lower().endswith(".csv") else "jsonl"
+
+
+def _csv_booking(row: dict) -> dict:
+    """
+    Flat CSV row -> JSONL jaisa shape. Ek row = ek booking: guest columns
+    alag, aur `rooms` (count) utne hi same room_type_id ke rooms.
+    """
+    row = {key.strip(): (value or "").strip() for key, value in row.items() if key}
+    data = {
+        key: value for key, value in row.items()
+        if value and key not in GUEST_COLUMNS and key not in ROOM_COLUMNS
+    }
+    data["guest"] = {key: row[key] for key in GUEST_COLUMNS if row.get(key)}
+
+    count = int(row.get("rooms") or 1)
+    if count < 1:
+        raise ValueError("rooms must be at least 1")
+    room = {"room_type_id": row.get("room_type_id") or None, "rate_plan_id": row.get("rate_plan_id") or None}
+    if row.get("guests"):
+        room["guests"] = int(row["guests"])
+    data["rooms"] = [dict(room) for _ in range(count)]
+    return data
+
+
+def iter_import_rows(stream: TextIO, fmt: str) -> Iterator[ParsedRow]:
+    """
+    File ko line by line parse karta hai - poori file memory mein nahi aati.
+    Row numbers 1 se (CSV header ke baad), khaali lines skip.
+    """
+    if fmt == "csv":
+        for row_number, row in enumerate(csv.DictReader(stream), start=1):
+            try:
+                yield row_number, _csv_booking(row), None
+            except ValueError as exc:
+                yield row_number, None, str(exc)
+        return
+
+    for row_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield row_number, None, f"Invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(data, dict):
+            yield row_number, None, "Each line must be a JSON object"
+            continue
+        yield row_number, data, None
+
+
+def _chunked(rows: Iterator[ParsedRow], size: int) -> Iterator[List[ParsedRow]]:
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+async def iter_import_rows_threaded(stream: TextIO, fmt: str, chunk_size: int = IMPORT_BATCH_SIZE) -> AsyncIterator[ParsedRow]:
+    """
+    iter_import_rows jaisa, par file read + parse threadpool mein (chunk_size rows
+    ek baar mein) - async route mein upload ka sync read event loop block nahi karta.
+    """
+    async for chunk in iterate_in_threadpool(_chunked(iter_import_rows(stream, fmt), chunk_size)):
+        for row in chunk:
+            yield row
+
+
+async def _as_async(rows: Union[Iterable[ParsedRow], AsyncIterable[ParsedRow]]) -> AsyncIterator[ParsedRow]:
+    if hasattr(rows, "__aiter__"):
+        async for row in rows:
+            yield row
+    else:
+        for row in rows:
+            yield row
+
+
+async def _bulk_insert(session: AsyncSession, table: Table, rows: List[dict]) -> None:
+    """PostgreSQL (asyncpg) par COPY, warna executemany insert"""
+    if not rows:
+        return
+    connection = await session.connection()
+    if connection.dialect.name != "postgresql" or connection.dialect.driver != "asyncpg":
+        await session.execute(table.insert(), rows)
+        return
+
+    # COPY binary protocol SQLAlchemy ke type processors bypass karta hai -
+    # enum (name) aur JSON (string) conversion yahan khud
+    dialect = connection.dialect
+    columns = list(table.columns)
+    processors = [column.type.dialect_impl(dialect).bind_processor(dialect) for column in columns]
+    records = [
+        tuple(
+            processor(row.get(column.name)) if processor else row.get(column.name)
+            for column, processor in zip(columns, processors)
+        )
+        for row in rows
+    ]
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        table.name, records=records, columns=[column.name for column in columns]
+    )
+
+
+class BookingImporter:
+    """
+    Ek hotel ka import. Guest dedupe map aur file ke booking numbers
+    poore import mein yaad rehte hain; har batch apna transaction hai.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        hotel_id: str,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        on_progress: Optional[ProgressCallback] = None,
+    ):
+        self.session = session
+        self.hotel_id = hotel_id
+        self.batch_size = batch_size
+        self.on_progress = on_progress
+        self.result = BookingImportResult()
+        self._room_types: Dict[str, str] = {}
+        # email -> guest_id (is hotel ke)
+        self._guest_ids: Dict[str, str] = {}
+        self._booking_numbers: set = set()
+        # Content hash -> file mein ab tak kitni baar (bilkul same rows ko alag number)
+        self._content_seen: Dict[str, int] = {}
+
+    def _error(self, row_number: int, error: str) -> None:
+        self.result.error_count += 1
+        if len(self.result.errors) < MAX_REPORTED_ERRORS:
+            self.result.errors.append(ImportRowError(row=row_number, error=error))
+
+    async def run(self, rows: Union[Iterable[ParsedRow], AsyncIterable[ParsedRow]]) -> BookingImportResult:
+        room_types = await self.session.execute(
+            select(RoomType.id, RoomType.name).where(RoomType.hotel_id == self.hotel_id)
+        )
+        self._room_types = dict(room_types.all())
+
+        batch: List[Tuple[int, BookingImportRow]] = []
+        async for row_number, data, parse_error in _as_async(rows):
+            self.result.rows_received += 1
+            row = self._validate(row_number, data, parse_error)
+            if row is None:
+                continue
+            batch.append((row_number, row))
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = []
+        await self._flush(batch)
+        return self.result
+
+    def _validate(self, row_number: int, data: Optional[dict], parse_error: Optional[str]) -> Optional[BookingImportRow]:
+        if parse_error:
+            self._error(row_number, parse_error)
+            return None
+        try:
+            row = BookingImportRow.model_validate(data)
+        except ValidationError as exc:
+            first = exc.errors()[0]
+            field = ".".join(str(part) for part in first["loc"])
+            self._error(row_number, f"{field}: {first['msg']}")
+            return None
+
+        if row.check_out <= row.check_in:
+            self._error(row_number, "check_out must be after check_in")
+        elif not row.rooms:
+            self._error(row_number, "At least one room is required")
+        elif not {room.get("room_type_id") for room in row.rooms} <= self._room_types.keys():
+            self._error(row_number, "Every room must reference a room type of this hotel")
+        elif row.booking_number and row.booking_number in self._booking_numbers:
+            self._error(row_number, "Duplicate booking_number in file")
+        else:
+            if row.booking_number:
+                self._booking_numbers.add(row.booking_number)
+            else:
+                row.booking_number = self._content_booking_number(data)
+            row.guest.email = row.guest.email.strip()
+            return row
+        return None
+
+    def _content_booking_number(self, data: dict) -> str:
+        """
+        Number-less row ka deterministic number - hotel + row content ka hash.
+        Random suffix nahi: bade imports mein collide nahi hota, aur wahi file
+        dobara chalane par rows "already exists" se skip hoti hain.
+        """
+        content = json.dumps(data, sort_keys=True, default=str)
+        digest = hashlib.sha256(f"{self.hotel_id}\n{content}".encode()).hexdigest()[:IMPORT_NUMBER_HEX_CHARS].upper()
+        seen = self._content_seen.get(digest, 0)
+        self._content_seen[digest] = seen + 1
+        number = f"{IMPORT_NUMBER_PREFIX}{digest}"
+        return f"{number}-{seen + 1}" if seen else number
+
+    def _price_rooms(self, row: BookingImportRow) -> Tuple[List[dict], float]:
+        """
+        History ke prices file se - quote nahi hota. Room prices na hon toh
+        total_amount rooms mein barabar baant dete hain (aur ulta).
+        """
+        nights = (row.check_out - row.check_in).days
+        priced = [dict(room) for room in row.rooms]
+        if row.total_amount is not None and not any(room.get("total_price") for room in priced):
+            for room in priced:
+                room["total_price"] = row.total_amount / len(priced)
+        for room in priced:
+            room["total_price"] = float(room.get("total_price") or 0)
+            room.setdefault("price_per_night", room["total_price"] / nights)
+            room.setdefault("room_type_name", self._room_types[room["room_type_id"]])
+        total = row.total_amount if row.total_amount is not None else sum(room["total_price"] for room in priced)
+        return priced, total
+
+    async def _flush(self, batch: List[Tuple[int, BookingImportRow]]) -> None:
+        if not batch:
+            return
+        session = self.session
+
+        # Pehle ke import / existing bookings wale numbers skip
+        numbers = [row.booking_number for _, row in batch]
+        if numbers:
+            existing = set((await session.execute(
+                select(Booking.booking_number).where(Booking.booking_number.in_(numbers))
+            )).scalars().all())
+            if existing:
+                for row_number, row in batch:
+                    if row.booking_number in existing:
+                        self._error(row_number, "Booking number already exists")
+                batch = [(row_number, row) for row_number, row in batch if row.booking_number not in existing]
+
+        if not batch:
+            return
+
+        # Batch fail ho toh is batch ke guests / counters wapas - rollback ke baad woh rows hain hi nahi
+        known_emails = set(self._guest_ids)
+        guests_created, guests_matched = self.result.guests_created, self.result.guests_matched
+        try:
+            await self._upsert_guests(batch)
+            booking_rows, room_rows, stays, deltas = self._build_rows(batch)
+            await _bulk_insert(session, Booking.__table__, booking_rows)
+            await _bulk_insert(session, BookingRoom.__table__, room_rows)
+            await add_booked_stays(session, stays)
+            await apply_stat_deltas(session, deltas)
+            await session.commit()
+        except Exception as exc:
+            await session.rollback()
+            logger.exception("Booking import batch failed for hotel %s: %s", self.hotel_id, exc)
+            for email in set(self._guest_ids) - known_emails:
+                del self._guest_ids[email]
+            self.result.guests_created, self.result.guests_matched = guests_created, guests_matched
+            self.result.batches_failed += 1
+            for row_number, _ in batch:
+                self._error(row_number, f"Batch failed: {type(exc).__name__}")
+            return
+
+        self.result.bookings_created += len(booking_rows)
+        if self.on_progress:
+            self.on_progress(self.result)
+
+    async def _upsert_guests(self, batch: List[Tuple[int, BookingImportRow]]) -> None:
+        """
+        Batch ke naye emails ka ek bulk upsert - baaki memory se. Upsert ne
+        hamari id lautayi toh guest naya bana, warna pehle se tha.
+        """
+        now = datetime.utcnow()
+        new_guests: Dict[str, dict] = {}
+        for _, row in batch:
+            email = row.guest.email
+            if email in self._guest_ids:
+                self.result.guests_matched += 1
+            elif email in new_guests:
+                # Isi batch mein pehle aa chuka
+                self.result.guests_matched += 1
+            else:
+                guest = Guest(**row.guest.model_dump(), hotel_id=self.hotel_id, created_at=row.created_at or now)
+                new_guests[email] = guest.model_dump()
+
+        upserted = await upsert_guests(self.session, list(new_guests.values()))
+        for email, guest_id in upserted.items():
+            if guest_id == new_guests[email]["id"]:
+                self.result.guests_created += 1
+            else:
+                self.result.guests_matched += 1
+            self._guest_ids[email] = guest_id
+
+    def _build_rows(
+        self, batch: List[Tuple[int, BookingImportRow]]
+    ) -> Tuple[List[dict], List[dict], list, StatDeltas]:
+        """Bookings, booking_rooms, ledger stays aur daily stats deltas - guests upsert hone ke baad"""
+        now = datetime.utcnow()
+        booking_rows: List[dict] = []
+        room_rows: List[dict] = []
+        stays = []
+        deltas = new_deltas()
+        for _, row in batch:
+            created_at = row.created_at or now
+            rooms, total = self._price_rooms(row)
+            booking = Booking(
+                hotel_id=self.hotel_id,
+                guest_id=self._guest_ids[row.guest.email],
+                booking_number=row.booking_number,
+                check_in=row.check_in,
+                check_out=row.check_out,
+                status=row.status,
+                source=row.source,
+                rooms=rooms,
+                total_amount=total,
+                paid_amount=row.paid_amount,
+                special_requests=row.special_requests,
+                promo_code=row.promo_code,
+                created_at=created_at,
+                updated_at=created_at,
+            )
+            booking_rows.append(booking.model_dump())
+            room_rows.extend(room.model_dump() for room in build_booking_rooms(booking))
+            add_booking_contribution(deltas, booking)
+            if holds_inventory(booking.status):
+                stays.extend(
+                    ((self.hotel_id, room_type_id), booking.check_in, booking.check_out, count)
+                    for room_type_id, count in room_type_counts(rooms).items()
+                )
+        return booking_rows, room_rows, stays, deltas
+
+
+async def import_bookings(
+    session: AsyncSession,
+    hotel_id: str,
+    rows: Union[Iterable[ParsedRow], AsyncIterable[ParsedRow]],
+    batch_size: int = IMPORT_BATCH_SIZE,
+    on_progress: Optional[ProgressCallback] = None,
+) -> BookingImportResult:
+    """Parsed rows ko hotel mein import karta hai - har batch ke baad commit"""
+    importer = BookingImporter(session, hotel_id, batch_size, on_progress)
+    return await importer.run(rows)
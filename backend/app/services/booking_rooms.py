@@ -0,0 +1,101 @@
+"""
+Booking Rooms Service
+Booking.rooms JSON ko booking_rooms table mein normalize karta hai.
+Naye bookings create ke time likhe jaate hain; purane bookings ke liye
+backfill hai (manage.py backfill-booking-rooms / startup bootstrap).
+"""
+from typing import List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.booking import Booking, BookingRoom
+
+
+def _as_float(value) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _as_int(value, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def build_booking_rooms(booking: Booking) -> List[BookingRoom]:
+    """Booking ke rooms JSON se BookingRoom rows - room_type_id ke bina wale skip"""
+    rows = []
+    for booked_room in booking.rooms or []:
+        room_type_id = booked_room.get("room_type_id")
+        if not room_type_id:
+            continue
+        rows.append(BookingRoom(
+            booking_id=booking.id,
+            hotel_id=booking.hotel_id,
+            check_in=booking.check_in,
+            check_out=booking.check_out,
+            room_type_id=room_type_id,
+            room_type_name=booked_room.get("room_type_name"),
+            rate_plan_id=booked_room.get("rate_plan_id"),
+            rate_plan_name=booked_room.get("rate_plan_name"),
+            guests=_as_int(booked_room.get("guests"), 1),
+            children=_as_int(booked_room.get("children"), 0),
+            price_per_night=_as_float(booked_room.get("price_per_night")),
+            total_price=_as_float(booked_room.get("total_price")),
+        ))
+    return rows
+
+
+def add_booking_rooms(session: AsyncSession, booking: Booking) -> None:
+    """Booking ke rows session mein add karo - caller ke transaction mein"""
+    session.add_all(build_booking_rooms(booking))
+
+
+async def backfill_booking_rooms(
+    session: AsyncSession,
+    hotel_id: Optional[str] = None,
+    batch_size: int = 500,
+) -> int:
+    """
+    Jin bookings ke booking_rooms rows nahi hain unke liye JSON se rows banata hai.
+    Idempotent hai - dobara chalane par kuch duplicate nahi hota.
+    Caller commit karta hai. Returns: likhi gayi rows ka count.
+    """
+    has_rows = select(BookingRoom.id).where(BookingRoom.booking_id == Booking.id).exists()
+    query = select(Booking).where(~has_rows)
+    if hotel_id:
+        query = query.where(Booking.hotel_id == hotel_id)
+
+    written = 0
+    rows = []
+    result = await session.execute(query)
+    for booking in result.scalars():
+        rows.extend(
+            row.model_dump() for row in build_booking_rooms(booking)
+        )
+        if len(rows) >= batch_size:
+            await session.execute(BookingRoom.__table__.insert(), rows)
+            written += len(rows)
+            rows = []
+    if rows:
+        await session.execute(BookingRoom.__table__.insert(), rows)
+        written += len(rows)
+    return written
+
+
+async def bootstrap_booking_rooms(session: AsyncSession) -> int:
+    """
+    Startup par call hota hai. booking_rooms khaali hai aur bookings hain
+    (purana database) toh ek baar backfill karta hai.
+    """
+    existing = (await session.execute(select(func.count(BookingRoom.id)))).scalar() or 0
+    if existing:
+        return 0
+    written = await backfill_booking_rooms(session)
+    await session.commit()
+    return written
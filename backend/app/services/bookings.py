@@ -0,0 +1,80 @@
+"""
+Booking Write Service
+Booking create ka transaction - inventory reserve (ya hold claim), guest,
+booking aur booking_rooms ek saath. Staff aur public (hold) dono flows
+yahi use karte hain; retry run_transaction() se caller karta hai.
+"""
+from datetime import datetime
+from typing import List, Optional, Tuple
+import uuid
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.booking import Booking, BookingCreate, BookingSource, BookingStatus, Guest
+from app.models.inventory import InventoryHold
+from app.services.booking_rooms import add_booking_rooms
+from app.services.daily_stats import apply_booking_stats
+from app.services.guests import upsert_guest
+from app.services.holds import claim_hold
+from app.services.inventory import apply_booking, convert_held
+
+
+def generate_booking_number() -> str:
+    """Unique booking number generate karta hai"""
+    timestamp = datetime.utcnow().strftime("%Y%m%d")
+    unique_part = str(uuid.uuid4())[:6].upper()
+    return f"BK{timestamp}{unique_part}"
+
+
+async def create_booking_record(
+    session: AsyncSession,
+    hotel_id: str,
+    booking_data: BookingCreate,
+    rooms: List[dict],
+    hold_id: Optional[str] = None,
+    source: BookingSource = BookingSource.DIRECT,
+) -> Tuple[Booking, Guest]:
+    """
+    Inventory + guest + booking ek transaction mein, phir commit.
+    hold_id ho toh naya reservation nahi - hold ke rooms held se booked mein jaate hain.
+    Errors: InsufficientInventory (sold out), HoldUnavailable (hold expire/used).
+    """
+    booking = Booking(
+        hotel_id=hotel_id,
+        booking_number=generate_booking_number(),
+        check_in=booking_data.check_in,
+        check_out=booking_data.check_out,
+        rooms=rooms,
+        special_requests=booking_data.special_requests,
+        promo_code=booking_data.promo_code,
+        total_amount=sum(room["total_price"] for room in rooms),
+        status=BookingStatus.PENDING,
+        source=source
+    )
+    
+    # Sabse pehle inventory - sold out / hold expired ho toh baaki writes hote hi nahi
+    if hold_id:
+        hold = await claim_hold(session, hotel_id, hold_id)
+        await convert_held(session, hold.room_type_id, hold.check_in, hold.check_out, hold.rooms)
+    else:
+        await apply_booking(session, booking)
+    
+    # Existing guest (hotel_id, email) ho toh wahi - ek atomic upsert
+    guest = await upsert_guest(session, hotel_id, booking_data.guest)
+    
+    booking.guest_id = guest.id
+    session.add(booking)
+    add_booking_rooms(session, booking)
+    await apply_booking_stats(session, booking)
+    
+    if hold_id:
+        await session.flush()
+        await session.execute(
+            update(InventoryHold.__table__)
+            .where(InventoryHold.__table__.c.id == hold_id)
+            .values(booking_id=booking.id)
+        )
+    
+    await session.commit()
+    return booking, guest
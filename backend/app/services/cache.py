@@ -0,0 +1,158 @@
+"""
+TTL Cache
+Process-local read cache - dashboard polling jaise hot read paths ke liye.
+Same key ke concurrent misses ek hi loader par wait karte hain (single
+flight - Flight, idempotency store bhi yahi use karta hai), isliye 50 khule
+tabs ka refresh ek hi query banta hai. Loader fail ho toh kuch cache nahi hota.
+
+DayCache: reports ke closed din - is process ke writes par turant invalidate,
+doosre process (manage.py commands) ke writes TTL ke baad dikhte hain.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class FlightCancelled(Exception):
+    """Leader cancel hua (jaise client disconnect) - waiter ko khud dobara load karna hai"""
+
+
+class Flight(Generic[T]):
+    """
+    Ek key ka ek in-flight load: pehla caller (leader) kaam karke resolve() /
+    fail() karta hai, baaki wait() par wahi result / exception paate hain.
+    Leader cancel ho toh waiters ko CancelledError nahi, FlightCancelled milta hai.
+    """
+
+    def __init__(self):
+        self._future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    async def wait(self) -> T:
+        try:
+            # Waiter ka apna cancel leader ke future tak nahi pahunchta
+            return await asyncio.shield(self._future)
+        except asyncio.CancelledError:
+            if self._future.cancelled():
+                raise FlightCancelled() from None
+            raise
+
+    def resolve(self, value: T) -> None:
+        self._future.set_result(value)
+
+    def fail(self, exc: BaseException) -> None:
+        """Exception waiters tak jaata hai; cancel / shutdown par waiters ko FlightCancelled"""
+        if isinstance(exc, Exception):
+            self._future.set_exception(exc)
+            # Koi wait na kar raha ho toh "exception never retrieved" warning na aaye
+            self._future.exception()
+        else:
+            self._future.cancel()
+
+
+class TTLCache(Generic[T]):
+    """Key -> value, har entry ttl_seconds tak; max_entries se zyada par sabse purani hatti hai"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Flight[T]]]" = OrderedDict()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            now = time.monotonic()
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                break
+            try:
+                return await entry[1].wait()
+            except FlightCancelled:
+                # Leader ki entry hat chuki - pehla waiter naya leader banta hai
+                continue
+
+        flight: Flight[T] = Flight()
+        self._entries[key] = (now + self.ttl_seconds, flight)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        try:
+            value = await loader()
+        except BaseException as exc:
+            if self._entries.get(key, (None, None))[1] is flight:
+                del self._entries[key]
+            flight.fail(exc)
+            raise
+        flight.resolve(value)
+        return value
+
+    def invalidate(self, match: Optional[Callable[[Hashable], bool]] = None) -> None:
+        """Saari entries, ya sirf jin keys par match() True ho"""
+        if match is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if match(key)]:
+            del self._entries[key]
+
+
+class DayCache(Generic[T]):
+    """
+    (hotel_id, day) -> value - sirf un din ke liye jo ab nahi badalte (night
+    audit se closed). Is process ke write par invalidate_days(); doosre process
+    ka write invalidate nahi kar sakta, isliye har entry ttl_seconds tak. LRU max_entries.
+    version har invalidate par badhta hai - reader query se pehle version le,
+    beech mein invalidate hua toh put_many() purana data cache nahi karta.
+    """
+
+    def __init__(self, max_entries: int = 100000, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        # key -> (expires_at monotonic, value)
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, T]]" = OrderedDict()
+
+    def get_many(self, hotel_id: str, days: Iterable[Hashable]) -> Tuple[Dict[Hashable, T], List[Hashable]]:
+        """Returns: (mile hue {day: value}, missing / expired days)"""
+        now = time.monotonic()
+        found: Dict[Hashable, T] = {}
+        missing: List[Hashable] = []
+        for day in days:
+            key = (hotel_id, day)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                found[day] = entry[1]
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                missing.append(day)
+        return found, missing
+
+    def put_many(self, hotel_id: str, values: Dict[Hashable, T], version: int) -> None:
+        if version != self.version:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        for day, value in values.items():
+            self._entries[(hotel_id, day)] = (expires_at, value)
+            self._entries.move_to_end((hotel_id, day))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_days(self, keys: Iterable[Tuple[str, Hashable]]) -> None:
+        self.version += 1
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def invalidate(self, match: Optional[Callable[[Tuple[str, Hashable]], bool]] = None) -> None:
+        """Saari entries, ya sirf jin (hotel_id, day) keys par match() True ho"""
+        self.version += 1
+        if match is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if match(key)]:
+            del self._entries[key]
@@ -0,0 +1,436 @@
+"""
+Daily Stats Service
+daily_hotel_stats ko booking writes ke saath sync rakhta hai - ledger ki
+tarah har write apna delta (purani state -1, nayi state +1) ek upsert mein
+likhta hai, same transaction mein. Set-based writes (night audit) apni
+date range rebuild kar lete hain. Poora rebuild: manage.py rebuild-daily-stats.
+Saath mein stay_night_revenue (room type / rate plan grain) bhi isi tarah.
+
+Reads: night audit se closed din nahi badalte - unke rows report_day_cache
+mein. Har request sirf missing closed din + open window (aaj/future) padhti
+hai. Commit hone par stats write wale din cache se nikal jaate hain; doosre
+process (manage.py import / rebuild / audit / dedupe) ke writes cache TTL ke
+baad dikhte hain.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import uuid
+
+from sqlalchemy import delete, event, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from app.core.config import get_settings
+from app.core.database import dialect_insert
+from app.models.booking import Booking, BookingRoom, BookingStatus
+from app.models.night_audit import NightAudit
+from app.models.stats import NO_RATE_PLAN, DailyHotelStats, StayNightRevenue
+from app.services.booking_rooms import build_booking_rooms
+from app.services.cache import DayCache
+from app.services.inventory import stay_nights
+from app.services.occupancy import nightly_amounts_by_key, occupancy_by_key
+
+settings = get_settings()
+
+# Yahi statuses revenue / occupancy mein count hote hain (reports ke saath same)
+REVENUE_STATUSES = (BookingStatus.CONFIRMED, BookingStatus.CHECKED_IN, BookingStatus.CHECKED_OUT)
+
+STAT_FIELDS = ("rooms_sold", "revenue", "room_revenue", "arrivals", "departures", "cancellations")
+NIGHT_FIELDS = ("rooms_sold", "room_revenue")
+
+# (hotel_id, stay_date, room_type_id, rate_plan_id)
+NightKey = Tuple[str, date, str, str]
+
+
+class StatDeltas:
+    """
+    Ek write (ya rebuild) ke stats changes:
+    days: (hotel_id, stat_date) -> {field: delta}, nights: NightKey -> {field: delta}
+    """
+
+    def __init__(self):
+        self.days: Dict[Tuple[str, date], Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.nights: Dict[NightKey, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+# Closed din ke rows - (hotel_id, stat_date) -> row (ya None: us din kuch nahi)
+report_day_cache: "DayCache[Optional[DailyHotelStats]]" = DayCache(
+    settings.REPORT_DAY_CACHE_MAX_ENTRIES, settings.REPORT_DAY_CACHE_TTL_SECONDS
+)
+
+# (hotel_id, start, end) - None matlab us taraf koi limit nahi
+StatRange = Tuple[Optional[str], Optional[date], Optional[date]]
+
+
+def _touched(session: AsyncSession) -> dict:
+    """Is transaction mein likhe gaye stats din - commit par cache invalidate"""
+    return session.sync_session.info.setdefault("daily_stats_touched", {"days": set(), "ranges": []})
+
+
+def _in_range(key: Tuple[str, date], stat_range: StatRange) -> bool:
+    hotel_id, start_date, end_date = stat_range
+    return (
+        (hotel_id is None or key[0] == hotel_id)
+        and (start_date is None or key[1] >= start_date)
+        and (end_date is None or key[1] <= end_date)
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_days(session: Session) -> None:
+    touched = session.info.pop("daily_stats_touched", None)
+    if not touched:
+        return
+    report_day_cache.invalidate_days(touched["days"])
+    for stat_range in touched["ranges"]:
+        report_day_cache.invalidate(lambda key: _in_range(key, stat_range))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_days(session: Session) -> None:
+    # Kuch commit nahi hua - cache sahi hai
+    session.info.pop("daily_stats_touched", None)
+
+
+def occupancy_rate(occupied: int, total_inventory: int) -> int:
+    """Percent, 0-100 (overbooking par bhi 100) - reports aur exports same formula"""
+    return min(100, int((occupied / total_inventory) * 100)) if total_inventory > 0 else 0
+
+
+def new_deltas() -> StatDeltas:
+    return StatDeltas()
+
+
+def add_booking_contribution(
+    deltas: StatDeltas,
+    booking: Booking,
+    status: Optional[BookingStatus] = None,
+    sign: int = 1,
+) -> None:
+    """
+    Booking (given status mein) ka har din par contribution deltas mein jodo.
+    Har room ka total_price uski raaton mein barabar batta hai.
+    """
+    status = status or booking.status
+    hotel_id = booking.hotel_id
+    days = deltas.days
+    if status == BookingStatus.CANCELLED:
+        days[(hotel_id, booking.check_in)]["cancellations"] += sign
+        return
+    if status not in REVENUE_STATUSES:
+        return
+
+    arrival = days[(hotel_id, booking.check_in)]
+    arrival["arrivals"] += sign
+    arrival["revenue"] += sign * booking.total_amount
+    days[(hotel_id, booking.check_out)]["departures"] += sign
+    for room in build_booking_rooms(booking):
+        nights = stay_nights(room.check_in, room.check_out)
+        if not nights:
+            continue
+        nightly_revenue = sign * room.total_price / len(nights)
+        for night in nights:
+            day = days[(hotel_id, night)]
+            day["rooms_sold"] += sign
+            day["room_revenue"] += nightly_revenue
+            fact = deltas.nights[(hotel_id, night, room.room_type_id, room.rate_plan_id or NO_RATE_PLAN)]
+            fact["rooms_sold"] += sign
+            fact["room_revenue"] += nightly_revenue
+
+
+async def apply_stat_deltas(session: AsyncSession, deltas: StatDeltas) -> None:
+    """
+    Deltas ko daily_hotel_stats aur stay_night_revenue mein add karo -
+    har table par ek executemany upsert, koi read nahi
+    """
+    await _apply_night_deltas(session, deltas.nights)
+    rows = []
+    now = datetime.utcnow()
+    for (hotel_id, stat_date), values in deltas.days.items():
+        if not any(values.get(field) for field in STAT_FIELDS):
+            continue
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "hotel_id": hotel_id,
+            "stat_date": stat_date,
+            **{field: values.get(field, 0) for field in STAT_FIELDS},
+            "updated_at": now,
+        })
+    if not rows:
+        return
+    _touched(session)["days"].update((row["hotel_id"], row["stat_date"]) for row in rows)
+
+    stats = DailyHotelStats.__table__
+    stmt = dialect_insert(stats)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["hotel_id", "stat_date"],
+        set_={
+            **{field: stats.c[field] + stmt.excluded[field] for field in STAT_FIELDS},
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    await session.execute(stmt, rows)
+
+
+async def _apply_night_deltas(session: AsyncSession, nights: Dict[NightKey, Dict[str, float]]) -> None:
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "hotel_id": hotel_id,
+            "stay_date": stay_date,
+            "room_type_id": room_type_id,
+            "rate_plan_id": rate_plan_id,
+            **{field: values.get(field, 0) for field in NIGHT_FIELDS},
+            "updated_at": now,
+        }
+        for (hotel_id, stay_date, room_type_id, rate_plan_id), values in nights.items()
+        if any(values.get(field) for field in NIGHT_FIELDS)
+    ]
+    if not rows:
+        return
+
+    facts = StayNightRevenue.__table__
+    stmt = dialect_insert(facts)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["hotel_id", "stay_date", "room_type_id", "rate_plan_id"],
+        set_={
+            **{field: facts.c[field] + stmt.excluded[field] for field in NIGHT_FIELDS},
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    await session.execute(stmt, rows)
+
+
+async def apply_booking_stats(session: AsyncSession, booking: Booking) -> None:
+    """Naya booking - caller ke transaction mein"""
+    deltas = new_deltas()
+    add_booking_contribution(deltas, booking)
+    await apply_stat_deltas(session, deltas)
+
+
+async def sync_booking_stats(
+    session: AsyncSession,
+    booking: Booking,
+    previous_status: BookingStatus,
+) -> None:
+    """Status change ke baad - purana contribution hata kar naya"""
+    if previous_status == booking.status:
+        return
+    deltas = new_deltas()
+    add_booking_contribution(deltas, booking, previous_status, sign=-1)
+    add_booking_contribution(deltas, booking)
+    await apply_stat_deltas(session, deltas)
+
+
+async def compute_daily_stats(
+    session: AsyncSession,
+    hotel_id: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> StatDeltas:
+    """
+    Bookings se stats scratch se - teen GROUP BY queries, JSON parse nahi.
+    Range di ho toh sirf start_date..end_date (inclusive) ke din. Nightly rooms
+    aur revenue difference-array kernel se - per booking loop nahi.
+    """
+    def in_range(column, query):
+        if hotel_id:
+            query = query.where(Booking.hotel_id == hotel_id)
+        if start_date:
+            query = query.where(column >= start_date)
+        if end_date:
+            query = query.where(column <= end_date)
+        return query
+
+    totals = new_deltas()
+
+    by_arrival = await session.execute(in_range(Booking.check_in, (
+        select(
+            Booking.hotel_id,
+            Booking.check_in,
+            func.count(Booking.id).filter(Booking.status.in_(REVENUE_STATUSES)),
+            func.coalesce(func.sum(Booking.total_amount).filter(Booking.status.in_(REVENUE_STATUSES)), 0),
+            func.count(Booking.id).filter(Booking.status == BookingStatus.CANCELLED),
+        )
+        .group_by(Booking.hotel_id, Booking.check_in)
+    )))
+    for row_hotel_id, check_in, arrivals, revenue, cancellations in by_arrival.all():
+        day = totals.days[(row_hotel_id, check_in)]
+        day["arrivals"] += arrivals
+        day["revenue"] += float(revenue)
+        day["cancellations"] += cancellations
+
+    by_departure = await session.execute(in_range(Booking.check_out, (
+        select(Booking.hotel_id, Booking.check_out, func.count(Booking.id))
+        .where(Booking.status.in_(REVENUE_STATUSES))
+        .group_by(Booking.hotel_id, Booking.check_out)
+    )))
+    for row_hotel_id, check_out, departures in by_departure.all():
+        totals.days[(row_hotel_id, check_out)]["departures"] += departures
+
+    # Occupied nights - range se overlap karne wale stays, range ke bahar clip.
+    # Same (room type, rate plan, dates) ke rooms ek group - nightly revenue = total / nights
+    stays_query = (
+        select(
+            BookingRoom.hotel_id, BookingRoom.room_type_id, BookingRoom.rate_plan_id,
+            BookingRoom.check_in, BookingRoom.check_out,
+            func.count(BookingRoom.id), func.coalesce(func.sum(BookingRoom.total_price), 0)
+        )
+        .join(Booking, Booking.id == BookingRoom.booking_id)
+        .where(Booking.status.in_(REVENUE_STATUSES), BookingRoom.check_out > BookingRoom.check_in)
+        .group_by(
+            BookingRoom.hotel_id, BookingRoom.room_type_id, BookingRoom.rate_plan_id,
+            BookingRoom.check_in, BookingRoom.check_out
+        )
+    )
+    if hotel_id:
+        stays_query = stays_query.where(BookingRoom.hotel_id == hotel_id)
+    if start_date:
+        stays_query = stays_query.where(BookingRoom.check_out > start_date)
+    if end_date:
+        stays_query = stays_query.where(BookingRoom.check_in <= end_date)
+    groups = (await session.execute(stays_query)).all()
+    if groups:
+        first = start_date or min(group[3] for group in groups)
+        last = end_date or max(group[4] for group in groups)
+        days = (last - first).days + 1
+        room_stays, revenue_stays = [], []
+        for row_hotel_id, room_type_id, rate_plan_id, check_in, check_out, rooms, total_price in groups:
+            key = (row_hotel_id, room_type_id, rate_plan_id or NO_RATE_PLAN)
+            room_stays.append((key, check_in, check_out, rooms))
+            revenue_stays.append((key, check_in, check_out, float(total_price) / (check_out - check_in).days))
+
+        rooms_by_key = occupancy_by_key(room_stays, first, days)
+        revenue_by_key = nightly_amounts_by_key(revenue_stays, first, days)
+        for key, counts in rooms_by_key.items():
+            row_hotel_id, room_type_id, rate_plan_id = key
+            for offset, (rooms, revenue) in enumerate(zip(counts, revenue_by_key[key])):
+                if not rooms:
+                    continue
+                night = first + timedelta(days=offset)
+                fact = totals.nights[(row_hotel_id, night, room_type_id, rate_plan_id)]
+                fact["rooms_sold"] += rooms
+                fact["room_revenue"] += revenue
+                day = totals.days[(row_hotel_id, night)]
+                day["rooms_sold"] += rooms
+                day["room_revenue"] += revenue
+    return totals
+
+
+async def rebuild_daily_stats(
+    session: AsyncSession,
+    hotel_id: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> int:
+    """
+    Stats rows (poori ya sirf range) bookings se dobara likhta hai.
+    Caller commit karta hai. Returns: likhi gayi rows.
+    """
+    totals = await compute_daily_stats(session, hotel_id, start_date, end_date)
+
+    clear = delete(DailyHotelStats)
+    if hotel_id:
+        clear = clear.where(DailyHotelStats.hotel_id == hotel_id)
+    if start_date:
+        clear = clear.where(DailyHotelStats.stat_date >= start_date)
+    if end_date:
+        clear = clear.where(DailyHotelStats.stat_date <= end_date)
+    await session.execute(clear)
+    clear_nights = delete(StayNightRevenue)
+    if hotel_id:
+        clear_nights = clear_nights.where(StayNightRevenue.hotel_id == hotel_id)
+    if start_date:
+        clear_nights = clear_nights.where(StayNightRevenue.stay_date >= start_date)
+    if end_date:
+        clear_nights = clear_nights.where(StayNightRevenue.stay_date <= end_date)
+    await session.execute(clear_nights)
+    _touched(session)["ranges"].append((hotel_id, start_date, end_date))
+
+    # Khaali table par upsert = plain insert
+    await apply_stat_deltas(session, totals)
+    return sum(1 for values in totals.days.values() if any(values.values()))
+
+
+async def last_closed_date(session: AsyncSession, hotel_id: str) -> Optional[date]:
+    """Night audit ka aakhri closed business day - usse pehle ke din immutable"""
+    return (await session.execute(
+        select(func.max(NightAudit.business_date)).where(NightAudit.hotel_id == hotel_id)
+    )).scalar()
+
+
+async def _query_daily_stats(
+    session: AsyncSession,
+    hotel_id: str,
+    start_date: date,
+    end_date: date,
+) -> Dict[date, DailyHotelStats]:
+    stats = DailyHotelStats.__table__
+    result = await session.execute(
+        select(*stats.c).where(
+            stats.c.hotel_id == hotel_id,
+            stats.c.stat_date >= start_date,
+            stats.c.stat_date <= end_date
+        )
+    )
+    # Session se detached rows - cache mein requests ke beech share hote hain
+    return {row.stat_date: DailyHotelStats(**row._mapping) for row in result}
+
+
+def _days(start_date: date, end_date: date) -> List[date]:
+    return [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+
+async def load_daily_stats(
+    session: AsyncSession,
+    hotel_id: str,
+    start_date: date,
+    end_date: date,
+) -> Dict[date, DailyHotelStats]:
+    """
+    Range ke pre-aggregated rows - {stat_date: row}, jis din kuch nahi hua woh missing.
+    Closed din cache se, DB se sirf pehle missing closed din se end_date tak -
+    warm cache par year-to-date bhi sirf open window padhta hai.
+    """
+    version = report_day_cache.version
+    last_closed = await last_closed_date(session, hotel_id)
+    closed_end = min(end_date, last_closed) if last_closed else None
+
+    stats: Dict[date, DailyHotelStats] = {}
+    missing: List[date] = []
+    query_start = start_date
+    if closed_end and closed_end >= start_date:
+        cached, missing = report_day_cache.get_many(hotel_id, _days(start_date, closed_end))
+        stats = {day: row for day, row in cached.items() if row is not None}
+        query_start = missing[0] if missing else closed_end + timedelta(days=1)
+
+    if query_start <= end_date:
+        loaded = await _query_daily_stats(session, hotel_id, query_start, end_date)
+        stats.update(loaded)
+        report_day_cache.put_many(hotel_id, {day: loaded.get(day) for day in missing}, version)
+    return stats
+
+
+async def bootstrap_daily_stats(session: AsyncSession) -> int:
+    """
+    Startup par call hota hai. Stats table khaali hai aur bookings hain
+    (purana database), ya rooms sold hain par stay_night_revenue / room_revenue
+    abhi bane nahi (upgrade) - toh ek baar poora rebuild.
+    """
+    existing = (await session.execute(select(func.count(DailyHotelStats.id)))).scalar() or 0
+    if existing:
+        sold_days = (await session.execute(
+            select(func.count(DailyHotelStats.id)).where(DailyHotelStats.rooms_sold > 0)
+        )).scalar() or 0
+        night_facts = (await session.execute(select(func.count(StayNightRevenue.id)))).scalar() or 0
+        if night_facts or not sold_days:
+            return 0
+    else:
+        booking_rows = (await session.execute(select(func.count(Booking.id)))).scalar() or 0
+        if not booking_rows:
+            return 0
+    written = await rebuild_daily_stats(session)
+    await session.commit()
+    return written
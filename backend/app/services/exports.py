@@ -0,0 +1,218 @@
+"""
+Export Service
+Accountants ke liye bookings / payments / daily occupancy ka poora dump.
+Rows server-side cursor (session.stream + yield_per) se batch mein aate hain
+aur har batch turant CSV / JSONL bytes ban kar nikal jaata hai - memory range
+ke size se nahi badhti.
+
+Har producer apna session kholta hai: response stream hote waqt request ka
+session band ho chuka hota hai.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+from enum import Enum
+from typing import AsyncIterator, List, Optional, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.database import async_session
+from app.models.booking import Booking, BookingRoom, BookingStatus, Guest
+from app.models.payment import Payment
+from app.models.stats import DailyHotelStats
+from app.services.daily_stats import occupancy_rate
+from app.services.reports import total_inventory
+
+EXPORT_FORMATS = ("csv", "jsonl")
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson"}
+
+# Ek cursor fetch / ek response chunk mein itni rows
+EXPORT_BATCH_SIZE = 1000
+
+BOOKING_EXPORT_COLUMNS = (
+    "booking_number", "status", "source", "check_in", "check_out", "rooms",
+    "total_amount", "paid_amount", "promo_code",
+    "first_name", "last_name", "email", "phone", "created_at",
+)
+PAYMENT_EXPORT_COLUMNS = (
+    "created_at", "booking_number", "guest_name", "amount", "currency",
+    "status", "payment_method", "gateway_reference",
+)
+OCCUPANCY_EXPORT_COLUMNS = (
+    "date", "occupied_rooms", "available_rooms", "occupancy_rate",
+    "room_revenue", "revenue", "arrivals", "departures", "cancellations",
+)
+
+ExportBatches = AsyncIterator[List[dict]]
+
+# Spreadsheet inhe formula samajhta hai - guest ke diye text (naam, email) se
+# formula injection na ho, isliye CSV mein aage ' lagta hai
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    value = _plain(value)
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+async def encode_export(batches: ExportBatches, columns: Sequence[str], fmt: str) -> AsyncIterator[bytes]:
+    """Har batch ek chunk - CSV header pehle hi nikal jaata hai (first byte query se pehle)"""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(columns)
+        yield buffer.getvalue().encode()
+
+    async for batch in batches:
+        if not batch:
+            continue
+        buffer = io.StringIO()
+        if fmt == "csv":
+            csv.writer(buffer).writerows(
+                [_csv_cell(row[column]) for column in columns] for row in batch
+            )
+        else:
+            for row in batch:
+                buffer.write(json.dumps({column: _plain(row[column]) for column in columns}))
+                buffer.write("\n")
+        yield buffer.getvalue().encode()
+
+
+async def _partitions(session: AsyncSession, query) -> AsyncIterator[Sequence]:
+    """Server-side cursor - ek baar mein EXPORT_BATCH_SIZE rows memory mein"""
+    result = await session.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    async for partition in result.partitions():
+        yield partition
+
+
+async def booking_export_rows(
+    hotel_id: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    status: Optional[BookingStatus] = None,
+) -> ExportBatches:
+    """Bookings check_in order mein, guest ke saath - range check_in par (inclusive)"""
+    rooms = (
+        select(func.count(BookingRoom.id))
+        .where(BookingRoom.booking_id == Booking.id)
+        .scalar_subquery()
+    )
+    query = (
+        select(
+            Booking.booking_number, Booking.status, Booking.source,
+            Booking.check_in, Booking.check_out, rooms.label("rooms"),
+            Booking.total_amount, Booking.paid_amount, Booking.promo_code,
+            Guest.first_name, Guest.last_name, Guest.email, Guest.phone,
+            Booking.created_at,
+        )
+        .join(Guest, Guest.id == Booking.guest_id)
+        .where(Booking.hotel_id == hotel_id)
+        .order_by(Booking.check_in, Booking.id)
+    )
+    if start_date:
+        query = query.where(Booking.check_in >= start_date)
+    if end_date:
+        query = query.where(Booking.check_in <= end_date)
+    if status:
+        query = query.where(Booking.status == status)
+
+    async with async_session() as session:
+        async for partition in _partitions(session, query):
+            yield [dict(row._mapping) for row in partition]
+
+
+async def payment_export_rows(
+    hotel_id: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> ExportBatches:
+    """Payments created_at order mein - range created_at ke din par (inclusive)"""
+    query = (
+        select(
+            Payment.created_at, Booking.booking_number, Guest.first_name, Guest.last_name,
+            Payment.amount, Payment.currency, Payment.status,
+            Payment.payment_method, Payment.gateway_reference,
+        )
+        .outerjoin(Booking, Booking.id == Payment.booking_id)
+        .outerjoin(Guest, Guest.id == Booking.guest_id)
+        .where(Payment.hotel_id == hotel_id)
+        .order_by(Payment.created_at, Payment.id)
+    )
+    if start_date:
+        query = query.where(Payment.created_at >= datetime.combine(start_date, datetime.min.time()))
+    if end_date:
+        query = query.where(Payment.created_at < datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+
+    async with async_session() as session:
+        async for partition in _partitions(session, query):
+            batch = []
+            for row in partition:
+                data = dict(row._mapping)
+                first_name, last_name = data.pop("first_name"), data.pop("last_name")
+                data["guest_name"] = f"{first_name} {last_name}" if first_name is not None else None
+                batch.append(data)
+            yield batch
+
+
+async def occupancy_export_rows(hotel_id: str, start_date: date, end_date: date) -> ExportBatches:
+    """
+    Har din ek row (/reports/occupancy jaisa) - room_revenue us raat ka
+    stay-night revenue, revenue us din check-in hui bookings ka total.
+    daily_hotel_stats stream,
+    jin din ka row nahi unke zero wale rows beech mein bhar dete hain.
+    """
+    def day_row(day: date, stats: Optional[dict] = None) -> dict:
+        occupied = stats["rooms_sold"] if stats else 0
+        return {
+            "date": day,
+            "occupied_rooms": occupied,
+            "available_rooms": inventory - occupied,
+            "occupancy_rate": occupancy_rate(occupied, inventory),
+            "room_revenue": round(stats["room_revenue"], 2) if stats else 0,
+            "revenue": stats["revenue"] if stats else 0,
+            "arrivals": stats["arrivals"] if stats else 0,
+            "departures": stats["departures"] if stats else 0,
+            "cancellations": stats["cancellations"] if stats else 0,
+        }
+
+    stats = DailyHotelStats.__table__
+    query = (
+        select(*stats.c)
+        .where(stats.c.hotel_id == hotel_id, stats.c.stat_date >= start_date, stats.c.stat_date <= end_date)
+        .order_by(stats.c.stat_date)
+    )
+    async with async_session() as session:
+        inventory = await total_inventory(session, hotel_id)
+
+        next_day = start_date
+        async for partition in _partitions(session, query):
+            batch = []
+            for row in partition:
+                while next_day < row.stat_date:
+                    batch.append(day_row(next_day))
+                    next_day += timedelta(days=1)
+                batch.append(day_row(row.stat_date, row._mapping))
+                next_day = row.stat_date + timedelta(days=1)
+            yield batch
+
+        # Aakhri stats row ke baad ke khaali din - EXPORT_BATCH_SIZE ke chunks
+        while next_day <= end_date:
+            batch = []
+            while next_day <= end_date and len(batch) < EXPORT_BATCH_SIZE:
+                batch.append(day_row(next_day))
+                next_day += timedelta(days=1)
+            yield batch
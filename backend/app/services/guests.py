@@ -0,0 +1,170 @@
+"""
+Guest Upsert Service
+(hotel_id, email) par unique index - guest ek atomic INSERT ... ON CONFLICT
+se banta ya milta hai. Pehle SELECT phir INSERT wala extra round trip nahi,
+aur concurrent bookings same email ke do guests nahi bana sakti.
+
+Existing guest ke khaali optional fields naye data se bhar jaate hain;
+jo pehle se bhara hai woh overwrite nahi hota.
+
+Purane database ke duplicates merge_duplicate_guests() merge karta hai
+(bookings keeper guest par re-point), tab unique index ban pata hai. Yeh
+data delete karta hai, isliye sirf `manage.py dedupe-guests` se chalta hai -
+startup nahi. Tab tak (index nahi) upsert SELECT + INSERT fallback se hota hai.
+"""
+from itertools import groupby
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, bindparam, delete, func, inspect, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.database import async_session, dialect_insert, engine
+from app.models.booking import Booking, Guest, GuestCreate
+
+GUEST_EMAIL_INDEX = "uq_guests_hotel_email"
+
+# Conflict par existing guest mein sirf khaali hon toh bharte hain
+FILL_FIELDS = ("phone", "nationality", "id_type", "id_number", "address")
+
+# Startup par check hota hai - unique index nahi toh ON CONFLICT nahi chal sakta
+_email_index_ready = True
+
+
+async def has_guest_email_index() -> bool:
+    def check(conn) -> bool:
+        return GUEST_EMAIL_INDEX in {index["name"] for index in inspect(conn).get_indexes("guests")}
+
+    async with engine.connect() as conn:
+        return await conn.run_sync(check)
+
+
+async def check_guest_email_index() -> bool:
+    """Startup: index hai ya nahi - nahi toh upserts fallback par (dedupe-guests ke baad restart)"""
+    global _email_index_ready
+    _email_index_ready = await has_guest_email_index()
+    return _email_index_ready
+
+
+def _upsert_statement():
+    guests = Guest.__table__
+    stmt = dialect_insert(guests)
+    return stmt.on_conflict_do_update(
+        index_elements=["hotel_id", "email"],
+        set_={field: func.coalesce(guests.c[field], stmt.excluded[field]) for field in FILL_FIELDS},
+    )
+
+
+async def upsert_guest(session: AsyncSession, hotel_id: str, guest_data: GuestCreate) -> Guest:
+    """Hotel ka guest email se - na ho toh naya. Ek statement, caller ke transaction mein."""
+    guest = Guest(**guest_data.model_dump(), hotel_id=hotel_id)
+    if not _email_index_ready:
+        guest_ids = await _upsert_without_index(session, [guest.model_dump()])
+        return await session.get(Guest, guest_ids[guest.email])
+    result = await session.execute(
+        _upsert_statement().values(guest.model_dump()).returning(*Guest.__table__.c)
+    )
+    return Guest(**result.one()._mapping)
+
+
+async def upsert_guests(session: AsyncSession, rows: List[dict]) -> Dict[str, str]:
+    """
+    Bulk upsert (executemany) - rows mein emails unique hone chahiye.
+    Returns: {email: guest_id}; id row ki apni id se alag ho toh guest pehle se tha.
+    """
+    if not rows:
+        return {}
+    if not _email_index_ready:
+        return await _upsert_without_index(session, rows)
+    guests = Guest.__table__
+    result = await session.execute(_upsert_statement().returning(guests.c.email, guests.c.id), rows)
+    return dict(result.all())
+
+
+async def _upsert_without_index(session: AsyncSession, rows: List[dict]) -> Dict[str, str]:
+    """
+    Unique index banne tak: existing guest (sabse purana) SELECT se, baaki INSERT.
+    Khaali fields fill nahi hote aur concurrent same email par duplicate ban sakta hai -
+    dedupe-guests chalne tak ka transitional path. Rows ek hi hotel ki.
+    """
+    hotel_id = rows[0]["hotel_id"]
+    result = await session.execute(
+        select(Guest.email, Guest.id)
+        .where(Guest.hotel_id == hotel_id, Guest.email.in_([row["email"] for row in rows]))
+        .order_by(Guest.created_at.desc(), Guest.id.desc())
+    )
+    # Desc order - dict mein aakhri (sabse purana) guest bachta hai, merge ka keeper bhi wahi
+    guest_ids = dict(result.all())
+    new_rows = [row for row in rows if row["email"] not in guest_ids]
+    if new_rows:
+        await session.execute(Guest.__table__.insert(), new_rows)
+        guest_ids.update({row["email"]: row["id"] for row in new_rows})
+    return guest_ids
+
+
+async def merge_duplicate_guests(
+    session: AsyncSession,
+    hotel_id: Optional[str] = None,
+    batch_size: int = 500,
+) -> int:
+    """
+    Same (hotel_id, email) wale guests ko sabse purane guest mein merge karta hai:
+    bookings keeper par re-point, keeper ke khaali fields duplicates se bharte
+    hain, duplicates delete. Har batch_size groups ke baad commit.
+    Returns: delete hue duplicate guests.
+    """
+    duplicated = (
+        select(Guest.hotel_id, Guest.email)
+        .group_by(Guest.hotel_id, Guest.email)
+        .having(func.count(Guest.id) > 1)
+    )
+    if hotel_id:
+        duplicated = duplicated.where(Guest.hotel_id == hotel_id)
+    duplicated = duplicated.subquery()
+
+    result = await session.execute(
+        select(Guest)
+        .join(duplicated, and_(Guest.hotel_id == duplicated.c.hotel_id, Guest.email == duplicated.c.email))
+        .order_by(Guest.hotel_id, Guest.email, Guest.created_at, Guest.id)
+    )
+    groups = [list(group) for _, group in groupby(result.scalars().all(), key=lambda g: (g.hotel_id, g.email))]
+
+    merged = 0
+    for offset in range(0, len(groups), batch_size):
+        remap: List[dict] = []
+        for keeper, *duplicates in groups[offset:offset + batch_size]:
+            for duplicate in duplicates:
+                for field in FILL_FIELDS:
+                    if getattr(keeper, field) is None and getattr(duplicate, field) is not None:
+                        setattr(keeper, field, getattr(duplicate, field))
+                remap.append({"duplicate_id": duplicate.id, "keeper_id": keeper.id})
+
+        bookings = Booking.__table__
+        await session.execute(
+            update(bookings)
+            .where(bookings.c.guest_id == bindparam("duplicate_id"))
+            .values(guest_id=bindparam("keeper_id")),
+            remap
+        )
+        duplicate_ids = [row["duplicate_id"] for row in remap]
+        await session.execute(delete(Guest).where(Guest.id.in_(duplicate_ids)))
+        await session.commit()
+        merged += len(remap)
+    return merged
+
+
+async def ensure_guest_email_index() -> int:
+    """
+    manage.py dedupe-guests: unique index nahi hai (purane duplicates ki wajah
+    se skip hua) toh duplicates merge karke index banao. Returns: merged guests.
+    """
+    if await has_guest_email_index():
+        return 0
+
+    async with async_session() as session:
+        merged = await merge_duplicate_guests(session)
+
+    index = next(index for index in Guest.__table__.indexes if index.name == GUEST_EMAIL_INDEX)
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: index.create(sync_conn, checkfirst=True))
+    return merged
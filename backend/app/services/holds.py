@@ -0,0 +1,266 @@
+"""
+Inventory Holds Service
+Public booking flow mein guest details bharte waqt room N minute ke liye
+hold hota hai. Hold ledger ke `held` column mein count hota hai, isliye
+search, availability aur booking guard sab use blocked maante hain.
+
+Expiry: HoldSweeper ek min-heap (expires_at, hold_id) rakhta hai aur sirf
+agle expiry tak sota hai - periodic full-table scan nahi. Doosre workers ke
+holds ke liye har HOLD_SWEEP_INTERVAL_SECONDS par ek indexed
+(status, expires_at) range query bhi chalti hai.
+"""
+import asyncio
+import heapq
+import logging
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import get_settings
+from app.core.database import async_session
+from app.models.inventory import HoldStatus, InventoryHold
+from app.services.inventory import adjust_ledger, reserve_ledger, stay_nights
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Expire fail hua (DB error) toh hold itne seconds baad dobara heap se try hota hai
+EXPIRE_RETRY_SECONDS = 5
+
+
+class HoldUnavailable(Exception):
+    """Hold expire, release ya pehle hi convert ho chuka hai"""
+
+
+class HoldLimitExceeded(Exception):
+    """Client ke active holds / held rooms per-client cap se upar jaate"""
+
+
+async def check_client_hold_limit(session: AsyncSession, hotel_id: str, client_ip: Optional[str], rooms: int) -> None:
+    """
+    Ek client ek hotel ki saari inventory hold karke har TTL par renew na kar
+    sake - active holds aur held rooms dono capped. Limit par HoldLimitExceeded.
+    """
+    if not client_ip:
+        return
+    active_holds, held_rooms = (await session.execute(
+        select(func.count(InventoryHold.id), func.coalesce(func.sum(InventoryHold.rooms), 0)).where(
+            InventoryHold.hotel_id == hotel_id,
+            InventoryHold.client_ip == client_ip,
+            InventoryHold.status == HoldStatus.ACTIVE,
+            InventoryHold.expires_at > datetime.utcnow(),
+        )
+    )).one()
+    if (
+        active_holds >= settings.HOLD_MAX_ACTIVE_PER_CLIENT
+        or held_rooms + rooms > settings.HOLD_MAX_ROOMS_PER_CLIENT
+    ):
+        raise HoldLimitExceeded(hotel_id, client_ip)
+
+
+async def create_hold(
+    session: AsyncSession,
+    hotel_id: str,
+    room_type_id: str,
+    rate_plan_id: Optional[str],
+    check_in: date,
+    check_out: date,
+    rooms: int,
+    client_ip: Optional[str] = None,
+) -> InventoryHold:
+    """
+    Hold row + ledger held reservation, phir commit. Inventory na ho toh
+    InsufficientInventory (reserve_ledger se), client cap par HoldLimitExceeded -
+    caller rollback karta hai.
+    """
+    await check_client_hold_limit(session, hotel_id, client_ip, rooms)
+    hold = InventoryHold(
+        hotel_id=hotel_id,
+        room_type_id=room_type_id,
+        rate_plan_id=rate_plan_id,
+        check_in=check_in,
+        check_out=check_out,
+        rooms=rooms,
+        expires_at=datetime.utcnow() + timedelta(minutes=settings.HOLD_TTL_MINUTES),
+        client_ip=client_ip,
+    )
+    await reserve_ledger(session, hotel_id, room_type_id, check_in, check_out, rooms, column="held")
+    session.add(hold)
+    await session.commit()
+    return hold
+
+
+async def _finish_hold(
+    session: AsyncSession,
+    hold_id: str,
+    new_status: HoldStatus,
+    *conditions,
+) -> Optional[InventoryHold]:
+    """
+    Active hold ko atomically new_status par le jaata hai (conditional UPDATE ...
+    RETURNING) - do workers ek hi hold ko do baar finish nahi kar sakte.
+    Returns: hold agar is call ne finish kiya, warna None.
+    """
+    holds = InventoryHold.__table__
+    result = await session.execute(
+        update(holds)
+        .where(holds.c.id == hold_id, holds.c.status == HoldStatus.ACTIVE, *conditions)
+        .values(status=new_status)
+        .returning(*holds.c)
+    )
+    row = result.first()
+    return InventoryHold(**row._mapping) if row else None
+
+
+async def claim_hold(session: AsyncSession, hotel_id: str, hold_id: str) -> InventoryHold:
+    """
+    Booking ke liye hold claim karo (caller ke transaction mein, commit nahi).
+    Inventory held se booked mein move karna caller ka kaam hai (convert_held).
+    """
+    holds = InventoryHold.__table__
+    hold = await _finish_hold(
+        session, hold_id, HoldStatus.CONVERTED,
+        holds.c.hotel_id == hotel_id,
+        holds.c.expires_at > datetime.utcnow(),
+    )
+    if hold is None:
+        raise HoldUnavailable(hold_id)
+    return hold
+
+
+async def release_hold(session: AsyncSession, hotel_id: str, hold_id: str) -> Optional[InventoryHold]:
+    """Guest ne flow chhod diya - rooms turant wapas. Commit karta hai."""
+    hold = await _finish_hold(
+        session, hold_id, HoldStatus.RELEASED, InventoryHold.__table__.c.hotel_id == hotel_id
+    )
+    if hold is None:
+        return None
+    await _return_rooms(session, hold)
+    await session.commit()
+    return hold
+
+
+async def expire_hold(session: AsyncSession, hold_id: str) -> Optional[InventoryHold]:
+    """Due hold expire karo - already finished ho toh no-op. Commit karta hai."""
+    hold = await _finish_hold(
+        session, hold_id, HoldStatus.EXPIRED,
+        InventoryHold.__table__.c.expires_at <= datetime.utcnow(),
+    )
+    if hold is None:
+        return None
+    await _return_rooms(session, hold)
+    await session.commit()
+    return hold
+
+
+async def _return_rooms(session: AsyncSession, hold: InventoryHold) -> None:
+    nights = stay_nights(hold.check_in, hold.check_out)
+    await adjust_ledger(session, hold.hotel_id, hold.room_type_id, nights, -hold.rooms, column="held")
+
+
+class HoldSweeper:
+    """
+    Hold expiry timer. schedule() har naye hold ke baad call karo;
+    background task sabse pehle expire hone wale hold tak sota hai.
+    """
+
+    def __init__(self, sweep_interval: int):
+        self.sweep_interval = sweep_interval
+        self._heap: List[Tuple[datetime, str]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def schedule(self, hold: InventoryHold) -> None:
+        heapq.heappush(self._heap, (hold.expires_at, hold.id))
+        # Naya hold sabse pehle expire hoga toh sleeper ko jaga do
+        if self._wakeup and self._heap[0][1] == hold.id:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        """Startup: active holds heap mein load karo aur sweeper task shuru"""
+        async with async_session() as session:
+            result = await session.execute(
+                select(InventoryHold.expires_at, InventoryHold.id)
+                .where(InventoryHold.status == HoldStatus.ACTIVE)
+            )
+            self._heap = [tuple(row) for row in result.all()]
+        heapq.heapify(self._heap)
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._wakeup = None
+
+    async def _expire_due(self) -> None:
+        now = datetime.utcnow()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[1])
+        if not due:
+            return
+        async with async_session() as session:
+            for hold_id in due:
+                if not await self._try_expire(session, hold_id):
+                    # Heap se nikal chuka hai - dobara daalo, warna stale sweep tak pada rahega
+                    retry_at = datetime.utcnow() + timedelta(seconds=EXPIRE_RETRY_SECONDS)
+                    heapq.heappush(self._heap, (retry_at, hold_id))
+
+    @staticmethod
+    async def _try_expire(session: AsyncSession, hold_id: str) -> bool:
+        """Ek hold ka failure baaki due holds ko na roke - False par caller retry karta hai"""
+        try:
+            await expire_hold(session, hold_id)
+            return True
+        except Exception as exc:
+            logger.warning("Hold sweeper: expiring hold %s failed: %s", hold_id, exc)
+            await session.rollback()
+            return False
+
+    async def _sweep_stale(self) -> None:
+        """Doosre workers ke due holds - (status, expires_at) index par range read"""
+        async with async_session() as session:
+            result = await session.execute(
+                select(InventoryHold.id).where(
+                    InventoryHold.status == HoldStatus.ACTIVE,
+                    InventoryHold.expires_at <= datetime.utcnow()
+                )
+            )
+            for hold_id in result.scalars().all():
+                # Fail hua toh agle sweep mein phir milega
+                await self._try_expire(session, hold_id)
+
+    async def _run(self) -> None:
+        last_sweep = datetime.utcnow()
+        while True:
+            try:
+                await self._expire_due()
+                now = datetime.utcnow()
+                if (now - last_sweep).total_seconds() >= self.sweep_interval:
+                    await self._sweep_stale()
+                    last_sweep = now
+            except Exception as exc:
+                # Ek kharab hold poore sweeper ko na roke - agle round mein dobara
+                logger.exception("Hold sweeper error: %s", exc)
+
+            # clear() pehle - timeout nikalne ke beech aaya schedule() miss na ho
+            self._wakeup.clear()
+            timeout = self.sweep_interval
+            if self._heap:
+                timeout = min(timeout, max((self._heap[0][0] - datetime.utcnow()).total_seconds(), 0))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+hold_sweeper = HoldSweeper(settings.HOLD_SWEEP_INTERVAL_SECONDS)
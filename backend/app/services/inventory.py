@@ -0,0 +1,467 @@
+"""
+Inventory Ledger Service
+Bookings se inventory_ledger table ko sync rakhta hai.
+Booking routes isko commit se pehle call karte hain taaki ledger aur
+booking ek hi transaction mein likhe jaayein.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import uuid
+
+from sqlalchemy import Date, cast, delete, func, literal, literal_column, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.database import dialect_insert, engine
+from app.models.booking import Booking, BookingRoom, BookingStatus
+from app.models.inventory import HoldStatus, InventoryHold, InventoryLedger, LedgerMismatch
+from app.models.room import RoomType
+from app.services.occupancy import occupancy_by_key
+
+
+class InsufficientInventory(Exception):
+    """Stay ki kisi raat par requested rooms free nahi hain - caller rollback kare"""
+
+    def __init__(self, room_type_id: str, rooms: int):
+        super().__init__(f"Not enough rooms of type {room_type_id} for {rooms} room(s)")
+        self.room_type_id = room_type_id
+        self.rooms = rooms
+
+
+# In statuses wali bookings rooms chhod deti hain
+RELEASED_STATUSES = (BookingStatus.CANCELLED, BookingStatus.NO_SHOW)
+
+
+def holds_inventory(status: BookingStatus) -> bool:
+    """Cancelled / no-show ke alawa har booking inventory block karti hai"""
+    return status not in RELEASED_STATUSES
+
+
+def room_type_counts(rooms: List[dict]) -> Dict[str, int]:
+    """Booking ke rooms JSON se {room_type_id: rooms_count} banata hai"""
+    counts: Dict[str, int] = defaultdict(int)
+    for booked_room in rooms or []:
+        room_type_id = booked_room.get("room_type_id")
+        if room_type_id:
+            counts[room_type_id] += 1
+    return counts
+
+
+def stay_nights(check_in: date, check_out: date) -> List[date]:
+    """Stay ki raatein - check_in included, check_out excluded"""
+    return [check_in + timedelta(days=i) for i in range((check_out - check_in).days)]
+
+
+async def adjust_ledger(
+    session: AsyncSession,
+    hotel_id: str,
+    room_type_id: str,
+    nights: List[date],
+    delta: int,
+    column: str = "booked",
+) -> None:
+    """
+    Ek room type ki given raaton par booked (ya held) count delta se badhata/ghatata hai.
+    Missing rows ON CONFLICT upsert se ban jaati hain - ek statement, koi read nahi.
+    """
+    if not nights or delta == 0:
+        return
+
+    now = datetime.utcnow()
+    counts = {"booked": 0, "held": 0, column: delta}
+    stmt = dialect_insert(InventoryLedger.__table__).values([
+        {
+            "id": str(uuid.uuid4()),
+            "hotel_id": hotel_id,
+            "room_type_id": room_type_id,
+            "stay_date": night,
+            **counts,
+            "updated_at": now,
+        }
+        for night in nights
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["room_type_id", "stay_date"],
+        set_={
+            column: InventoryLedger.__table__.c[column] + stmt.excluded[column],
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    await session.execute(stmt)
+
+
+async def add_booked_stays(
+    session: AsyncSession,
+    stays: List[Tuple[Tuple[str, str], date, date, int]],
+) -> None:
+    """
+    ((hotel_id, room_type_id), check_in, check_out, rooms) stays ko ledger ke
+    booked mein add karta hai - per-night counts ka ek executemany upsert.
+    Bulk import ke liye: capacity guard nahi, history source PMS jaisi hi aati hai.
+    """
+    counts = _expand_stays(stays)
+    if not counts:
+        return
+
+    now = datetime.utcnow()
+    ledger = InventoryLedger.__table__
+    stmt = dialect_insert(ledger)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["room_type_id", "stay_date"],
+        set_={"booked": ledger.c.booked + stmt.excluded.booked, "updated_at": stmt.excluded.updated_at},
+    )
+    await session.execute(stmt, [
+        {
+            "id": str(uuid.uuid4()),
+            "hotel_id": row_hotel_id,
+            "room_type_id": room_type_id,
+            "stay_date": stay_date,
+            "booked": booked,
+            "held": 0,
+            "updated_at": now,
+        }
+        for (row_hotel_id, room_type_id, stay_date), booked in counts.items()
+    ])
+
+
+async def reserve_ledger(
+    session: AsyncSession,
+    hotel_id: str,
+    room_type_id: str,
+    check_in: date,
+    check_out: date,
+    rooms: int,
+    column: str = "booked",
+) -> None:
+    """
+    Stay ki har raat par atomically `rooms` reserve karta hai (booking ke liye
+    booked, hold ke liye held column mein) ya InsufficientInventory raise karta hai.
+
+    Missing ledger rows pehle booked=0 ke saath ban jaati hain, phir ek guarded
+    UPDATE (booked + held + rooms <= total_inventory) - row locks ki wajah se do
+    concurrent transactions last room dono nahi le sakte. Kam rows update
+    hui toh koi raat full thi; partial update caller ke rollback se undo hota hai.
+    """
+    nights = stay_nights(check_in, check_out)
+    if not nights or rooms <= 0:
+        return
+
+    now = datetime.utcnow()
+    ledger = InventoryLedger.__table__
+    missing = dialect_insert(ledger).values([
+        {
+            "id": str(uuid.uuid4()),
+            "hotel_id": hotel_id,
+            "room_type_id": room_type_id,
+            "stay_date": night,
+            "booked": 0,
+            "held": 0,
+            "updated_at": now,
+        }
+        for night in nights
+    ]).on_conflict_do_nothing(index_elements=["room_type_id", "stay_date"])
+    await session.execute(missing)
+
+    capacity = (
+        select(RoomType.total_inventory)
+        .where(RoomType.id == room_type_id)
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        update(ledger)
+        .where(
+            ledger.c.room_type_id == room_type_id,
+            ledger.c.stay_date >= check_in,
+            ledger.c.stay_date < check_out,
+            ledger.c.booked + ledger.c.held + rooms <= capacity,
+        )
+        .values({column: ledger.c[column] + rooms, "updated_at": now})
+    )
+    if result.rowcount != len(nights):
+        raise InsufficientInventory(room_type_id, rooms)
+
+
+async def convert_held(
+    session: AsyncSession,
+    room_type_id: str,
+    check_in: date,
+    check_out: date,
+    rooms: int,
+) -> None:
+    """Hold ke rooms held se booked mein - inventory pehle se reserved hai, guard nahi chahiye"""
+    ledger = InventoryLedger.__table__
+    await session.execute(
+        update(ledger)
+        .where(
+            ledger.c.room_type_id == room_type_id,
+            ledger.c.stay_date >= check_in,
+            ledger.c.stay_date < check_out,
+        )
+        .values(
+            booked=ledger.c.booked + rooms,
+            held=ledger.c.held - rooms,
+            updated_at=datetime.utcnow(),
+        )
+    )
+
+
+async def _adjust_booking(session: AsyncSession, booking: Booking, sign: int) -> None:
+    """
+    Booking ke har room type ke liye stay nights par sign * rooms lagata hai.
+    Add guarded reservation hai; room types sorted order mein taaki
+    concurrent bookings ke row locks deadlock na karein.
+    """
+    nights = stay_nights(booking.check_in, booking.check_out)
+    for room_type_id, count in sorted(room_type_counts(booking.rooms).items()):
+        if sign > 0:
+            await reserve_ledger(
+                session, booking.hotel_id, room_type_id, booking.check_in, booking.check_out, sign * count
+            )
+        else:
+            await adjust_ledger(session, booking.hotel_id, room_type_id, nights, sign * count)
+
+
+async def apply_booking(session: AsyncSession, booking: Booking, sign: int = 1) -> None:
+    """
+    Booking ke rooms ko ledger mein add (sign=1) ya remove (sign=-1) karta hai.
+    Add par inventory na ho toh InsufficientInventory. Cancelled bookings ka koi effect nahi hota.
+    """
+    if holds_inventory(booking.status):
+        await _adjust_booking(session, booking, sign)
+
+
+async def sync_booking_status(
+    session: AsyncSession,
+    booking: Booking,
+    previous_status: BookingStatus,
+) -> None:
+    """
+    Status change ke baad ledger update karta hai.
+    Sirf cancel / no-show aur unka ulta hone par hi inventory badalti hai - restore bhi guarded hai.
+    """
+    was_holding = holds_inventory(previous_status)
+    is_holding = holds_inventory(booking.status)
+    if was_holding != is_holding:
+        await _adjust_booking(session, booking, 1 if is_holding else -1)
+
+
+async def get_booked_counts(
+    session: AsyncSession,
+    hotel_id: str,
+    start_date: date,
+    end_date: date,
+) -> Dict[Tuple[str, date], int]:
+    """
+    Ledger se {(room_type_id, stay_date): blocked} - ek indexed range read.
+    Active holds bhi room block karte hain, isliye blocked = booked + held.
+    """
+    result = await session.execute(
+        select(
+            InventoryLedger.room_type_id,
+            InventoryLedger.stay_date,
+            InventoryLedger.booked + InventoryLedger.held,
+        ).where(
+            InventoryLedger.hotel_id == hotel_id,
+            InventoryLedger.stay_date >= start_date,
+            InventoryLedger.stay_date <= end_date,
+        )
+    )
+    return {(room_type_id, stay_date): booked for room_type_id, stay_date, booked in result.all()}
+
+
+def stay_dates_cte(first_night: date, last_night: date):
+    """
+    Stay ki har raat ki ek row wala CTE (column: d).
+    PostgreSQL par generate_series, SQLite par recursive CTE.
+    """
+    if engine.dialect.name == "postgresql":
+        series = func.generate_series(
+            cast(literal(first_night), Date),
+            cast(literal(last_night), Date),
+            literal_column("interval '1 day'")
+        )
+        return select(cast(series, Date).label("d")).cte("stay_dates")
+
+    dates = select(literal(first_night, Date).label("d")).cte("stay_dates", recursive=True)
+    return dates.union_all(
+        select(func.date(dates.c.d, "+1 day")).where(dates.c.d < literal(last_night, Date))
+    )
+
+
+async def search_free_inventory(
+    session: AsyncSession,
+    hotel_id: str,
+    check_in: date,
+    check_out: date,
+    guests: int,
+) -> List[Tuple[RoomType, int]]:
+    """
+    Stay ki har raat par free rooms ka minimum, har active room type ke liye -
+    ek hi aggregate query. Sirf bookable (free > 0) room types return hote hain.
+    Holds bhi inventory block karte hain.
+    """
+    nights = stay_dates_cte(check_in, check_out - timedelta(days=1))
+    blocked = func.coalesce(InventoryLedger.booked + InventoryLedger.held, 0)
+    free = (RoomType.total_inventory - func.max(blocked)).label("free")
+    query = (
+        select(RoomType, free)
+        .join(nights, literal(True))
+        .outerjoin(
+            InventoryLedger,
+            (InventoryLedger.room_type_id == RoomType.id) & (InventoryLedger.stay_date == nights.c.d)
+        )
+        .where(
+            RoomType.hotel_id == hotel_id,
+            RoomType.is_active == True,
+            RoomType.max_occupancy >= guests
+        )
+        .group_by(RoomType.id)
+        .having(free > 0)
+    )
+    result = await session.execute(query)
+    return [(room_type, free_rooms) for room_type, free_rooms in result.all()]
+
+
+def _expand_stays(stays: List[Tuple[Tuple[str, str], date, date, int]]) -> Dict[Tuple[str, str, date], int]:
+    """(hotel, room_type) stays ko per-night counts mein - poore span par ek difference-array pass"""
+    if not stays:
+        return {}
+    start_date = min(stay[1] for stay in stays)
+    days = (max(stay[2] for stay in stays) - start_date).days
+    expanded: Dict[Tuple[str, str, date], int] = {}
+    for (row_hotel_id, room_type_id), counts in occupancy_by_key(stays, start_date, days).items():
+        for offset, count in enumerate(counts):
+            if count:
+                expanded[(row_hotel_id, room_type_id, start_date + timedelta(days=offset))] = count
+    return expanded
+
+
+async def compute_expected(
+    session: AsyncSession,
+    hotel_id: Optional[str] = None,
+) -> Dict[Tuple[str, str, date], int]:
+    """Bookings table se ledger dobara calculate karta hai - {(hotel_id, room_type_id, date): booked}"""
+    # booking_rooms par ek GROUP BY - JSON Python mein parse nahi karna padta
+    query = (
+        select(
+            BookingRoom.hotel_id,
+            BookingRoom.room_type_id,
+            BookingRoom.check_in,
+            BookingRoom.check_out,
+            func.count(BookingRoom.id),
+        )
+        .join(Booking, Booking.id == BookingRoom.booking_id)
+        .where(Booking.status.notin_(RELEASED_STATUSES))
+        .group_by(BookingRoom.hotel_id, BookingRoom.room_type_id, BookingRoom.check_in, BookingRoom.check_out)
+    )
+    if hotel_id:
+        query = query.where(BookingRoom.hotel_id == hotel_id)
+
+    result = await session.execute(query)
+    return _expand_stays([
+        ((row_hotel_id, room_type_id), check_in, check_out, count)
+        for row_hotel_id, room_type_id, check_in, check_out, count in result.all()
+    ])
+
+
+async def compute_expected_held(
+    session: AsyncSession,
+    hotel_id: Optional[str] = None,
+) -> Dict[Tuple[str, str, date], int]:
+    """Active holds se held counts - {(hotel_id, room_type_id, date): held}"""
+    query = select(
+        InventoryHold.hotel_id,
+        InventoryHold.room_type_id,
+        InventoryHold.check_in,
+        InventoryHold.check_out,
+        InventoryHold.rooms,
+    ).where(InventoryHold.status == HoldStatus.ACTIVE)
+    if hotel_id:
+        query = query.where(InventoryHold.hotel_id == hotel_id)
+
+    result = await session.execute(query)
+    return _expand_stays([
+        ((row_hotel_id, room_type_id), check_in, check_out, rooms)
+        for row_hotel_id, room_type_id, check_in, check_out, rooms in result.all()
+    ])
+
+
+async def rebuild_ledger(session: AsyncSession, hotel_id: Optional[str] = None) -> int:
+    """
+    Ledger ko bookings aur active holds se scratch se rebuild karta hai.
+    Caller commit karta hai. Returns: likhi gayi rows ka count.
+    """
+    expected = await compute_expected(session, hotel_id)
+    expected_held = await compute_expected_held(session, hotel_id)
+
+    clear = delete(InventoryLedger)
+    if hotel_id:
+        clear = clear.where(InventoryLedger.hotel_id == hotel_id)
+    await session.execute(clear)
+
+    now = datetime.utcnow()
+    rows = []
+    for key in set(expected) | set(expected_held):
+        row_hotel_id, room_type_id, stay_date = key
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "hotel_id": row_hotel_id,
+            "room_type_id": room_type_id,
+            "stay_date": stay_date,
+            "booked": expected.get(key, 0),
+            "held": expected_held.get(key, 0),
+            "updated_at": now,
+        })
+    if rows:
+        await session.execute(InventoryLedger.__table__.insert(), rows)
+    return len(rows)
+
+
+async def verify_ledger(session: AsyncSession, hotel_id: Optional[str] = None) -> List[LedgerMismatch]:
+    """Ledger ko bookings aur active holds se compare karta hai aur mismatches return karta hai"""
+    expected = await compute_expected(session, hotel_id)
+    expected_held = await compute_expected_held(session, hotel_id)
+
+    query = select(InventoryLedger)
+    if hotel_id:
+        query = query.where(InventoryLedger.hotel_id == hotel_id)
+    result = await session.execute(query)
+    actual = {
+        (row.hotel_id, row.room_type_id, row.stay_date): (row.booked, row.held)
+        for row in result.scalars()
+    }
+
+    mismatches = []
+    for key in sorted(set(expected) | set(expected_held) | set(actual)):
+        ledger_count, ledger_held = actual.get(key, (0, 0))
+        expected_count = expected.get(key, 0)
+        held_count = expected_held.get(key, 0)
+        if (ledger_count, ledger_held) != (expected_count, held_count):
+            row_hotel_id, room_type_id, stay_date = key
+            mismatches.append(LedgerMismatch(
+                hotel_id=row_hotel_id,
+                room_type_id=room_type_id,
+                stay_date=stay_date,
+                ledger=ledger_count,
+                expected=expected_count,
+                ledger_held=ledger_held,
+                expected_held=held_count,
+            ))
+    return mismatches
+
+
+async def bootstrap_ledger(session: AsyncSession) -> int:
+    """
+    Startup par call hota hai. Agar ledger khaali hai lekin bookings hain
+    (purana database), toh ek baar rebuild kar deta hai.
+    """
+    ledger_rows = (await session.execute(select(func.count(InventoryLedger.id)))).scalar() or 0
+    if ledger_rows:
+        return 0
+    booking_rows = (await session.execute(select(func.count(Booking.id)))).scalar() or 0
+    if not booking_rows:
+        return 0
+    written = await rebuild_ledger(session)
+    await session.commit()
+    return written
@@ -0,0 +1,243 @@
+"""
+Night Audit Service
+Business day close karta hai - har booking par PATCH ki jagah set-based
+UPDATEs, ek transaction mein:
+
+1. No-shows: pichhle closed din ke baad se business_date tak ke arrivals jo
+   abhi bhi pending/confirmed hain -> NO_SHOW, unke rooms ledger se release,
+   affected din ke daily stats rebuild
+2. Departures: business_date tak check_out wale CHECKED_IN -> CHECKED_OUT
+3. Snapshot: din ke numbers night_audits mein upsert (yahi closed-day marker hai)
+4. Pace: aage ki raaton ka on-the-books pace_snapshots mein (business_date ke naam se)
+
+Saare hotels ke liye run_night_audits() - semaphore se bounded parallelism,
+har hotel apna session/transaction.
+"""
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import get_settings
+from app.core.database import async_session, dialect_insert, run_transaction
+from app.models.booking import Booking, BookingRoom, BookingStatus
+from app.models.hotel import Hotel
+from app.models.inventory import InventoryLedger
+from app.models.night_audit import NightAudit
+from app.models.room import RoomType
+from app.services.daily_stats import REVENUE_STATUSES, rebuild_daily_stats
+from app.services.pace import take_pace_snapshot
+
+settings = get_settings()
+
+# Arrival date nikal gayi aur guest nahi aaya - in statuses se no-show
+NO_SHOW_CANDIDATES = (BookingStatus.PENDING, BookingStatus.CONFIRMED)
+
+# Ledger release UPDATE mein ek baar itni booking ids
+RELEASE_CHUNK_SIZE = 500
+
+AuditOutcome = Tuple[str, Optional[NightAudit], Optional[Exception]]
+
+
+def default_business_date() -> date:
+    """Audit aadhi raat ke baad chalta hai - default pichhla din close hota hai"""
+    return date.today() - timedelta(days=1)
+
+
+async def _first_open_date(session: AsyncSession, hotel_id: str, business_date: date) -> date:
+    """Pichhle closed din ke agle din se - pehla audit ho toh sirf business_date"""
+    last_closed = (await session.execute(
+        select(func.max(NightAudit.business_date)).where(
+            NightAudit.hotel_id == hotel_id,
+            NightAudit.business_date < business_date
+        )
+    )).scalar()
+    return last_closed + timedelta(days=1) if last_closed else business_date
+
+
+async def _release_ledger(session: AsyncSession, hotel_id: str, booking_ids: List[str], start: date, end: date) -> None:
+    """No-show bookings ke rooms ledger se ghatao - har ledger row par correlated count, ek UPDATE"""
+    ledger = InventoryLedger.__table__
+    released = (
+        select(func.count(BookingRoom.id))
+        .where(
+            BookingRoom.booking_id.in_(booking_ids),
+            BookingRoom.room_type_id == ledger.c.room_type_id,
+            BookingRoom.check_in <= ledger.c.stay_date,
+            BookingRoom.check_out > ledger.c.stay_date
+        )
+        .scalar_subquery()
+    )
+    await session.execute(
+        update(ledger)
+        .where(
+            ledger.c.hotel_id == hotel_id,
+            ledger.c.stay_date >= start,
+            ledger.c.stay_date < end,
+            released > 0
+        )
+        .values(booked=ledger.c.booked - released, updated_at=datetime.utcnow())
+    )
+
+
+async def mark_no_shows(session: AsyncSession, hotel_id: str, first_date: date, business_date: date) -> int:
+    """first_date..business_date ke un-arrived bookings NO_SHOW - rooms wapas inventory mein"""
+    bookings = Booking.__table__
+    result = await session.execute(
+        update(bookings)
+        .where(
+            bookings.c.hotel_id == hotel_id,
+            bookings.c.status.in_(NO_SHOW_CANDIDATES),
+            bookings.c.check_in >= first_date,
+            bookings.c.check_in <= business_date
+        )
+        .values(status=BookingStatus.NO_SHOW, updated_at=datetime.utcnow())
+        .returning(bookings.c.id, bookings.c.check_in, bookings.c.check_out)
+    )
+    rows = result.all()
+    for offset in range(0, len(rows), RELEASE_CHUNK_SIZE):
+        chunk = rows[offset:offset + RELEASE_CHUNK_SIZE]
+        await _release_ledger(
+            session, hotel_id, [row.id for row in chunk],
+            min(row.check_in for row in chunk), max(row.check_out for row in chunk)
+        )
+    if rows:
+        # Purana status (pending/confirmed) RETURNING mein nahi - affected din set-based rebuild
+        await rebuild_daily_stats(
+            session, hotel_id, min(row.check_in for row in rows), max(row.check_out for row in rows)
+        )
+    return len(rows)
+
+
+async def roll_departures(session: AsyncSession, hotel_id: str, business_date: date) -> int:
+    """check_out nikal gaya aur abhi bhi CHECKED_IN - CHECKED_OUT. Inventory unchanged."""
+    bookings = Booking.__table__
+    result = await session.execute(
+        update(bookings)
+        .where(
+            bookings.c.hotel_id == hotel_id,
+            bookings.c.status == BookingStatus.CHECKED_IN,
+            bookings.c.check_out <= business_date
+        )
+        .values(status=BookingStatus.CHECKED_OUT, updated_at=datetime.utcnow())
+    )
+    return result.rowcount
+
+
+async def _day_numbers(session: AsyncSession, hotel_id: str, business_date: date) -> dict:
+    """Snapshot ke saare numbers - scalar subqueries, ek round trip"""
+    rooms_available = (
+        select(func.coalesce(func.sum(RoomType.total_inventory), 0))
+        .where(RoomType.hotel_id == hotel_id, RoomType.is_active == True)
+        .scalar_subquery()
+    )
+    sold_rooms = (
+        select(BookingRoom.price_per_night)
+        .join(Booking, Booking.id == BookingRoom.booking_id)
+        .where(
+            BookingRoom.hotel_id == hotel_id,
+            BookingRoom.check_in <= business_date,
+            BookingRoom.check_out > business_date,
+            # Daily stats jaisa - pending booking sold nahi ginti
+            Booking.status.in_(REVENUE_STATUSES)
+        )
+        .subquery()
+    )
+    rooms_sold = select(func.count()).select_from(sold_rooms).scalar_subquery()
+    room_revenue = select(func.coalesce(func.sum(sold_rooms.c.price_per_night), 0)).scalar_subquery()
+
+    arrived = and_(
+        Booking.check_in == business_date,
+        Booking.status.in_([BookingStatus.CHECKED_IN, BookingStatus.CHECKED_OUT])
+    )
+    departed = and_(Booking.check_out == business_date, Booking.status == BookingStatus.CHECKED_OUT)
+    movements = (
+        select(
+            func.coalesce(func.sum(case((arrived, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((departed, 1), else_=0)), 0),
+        )
+        .where(
+            Booking.hotel_id == hotel_id,
+            (Booking.check_in == business_date) | (Booking.check_out == business_date)
+        )
+        .subquery()
+    )
+    row = (await session.execute(
+        select(rooms_available, rooms_sold, room_revenue, *movements.c)
+    )).one()
+    return {
+        "rooms_available": row[0],
+        "rooms_sold": row[1],
+        "room_revenue": float(row[2]),
+        "arrivals": row[3],
+        "departures": row[4],
+    }
+
+
+async def _close_day(session: AsyncSession, hotel_id: str, business_date: date) -> NightAudit:
+    first_date = await _first_open_date(session, hotel_id, business_date)
+    no_shows = await mark_no_shows(session, hotel_id, first_date, business_date)
+    checked_out = await roll_departures(session, hotel_id, business_date)
+    numbers = await _day_numbers(session, hotel_id, business_date)
+
+    audits = NightAudit.__table__
+    stmt = dialect_insert(audits).values(
+        NightAudit(
+            hotel_id=hotel_id,
+            business_date=business_date,
+            no_shows=no_shows,
+            checked_out=checked_out,
+            **numbers
+        ).model_dump()
+    )
+    # Dobara audit: numbers refresh, transitions pichhle runs mein jodte hain
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["hotel_id", "business_date"],
+        set_={
+            **{name: stmt.excluded[name] for name in numbers},
+            "no_shows": audits.c.no_shows + stmt.excluded.no_shows,
+            "checked_out": audits.c.checked_out + stmt.excluded.checked_out,
+            "closed_at": stmt.excluded.closed_at,
+        },
+    ).returning(*audits.c)
+    row = (await session.execute(stmt)).one()
+    # No-shows release hone ke baad - snapshot mein woh rooms nahi gine jaate
+    await take_pace_snapshot(session, hotel_id, business_date)
+    await session.commit()
+    return NightAudit(**row._mapping)
+
+
+async def run_night_audit(session: AsyncSession, hotel_id: str, business_date: date) -> NightAudit:
+    """Ek hotel ka business day close karo. Deadlock/lock par poora audit retry hota hai."""
+    return await run_transaction(session, lambda: _close_day(session, hotel_id, business_date))
+
+
+async def run_night_audits(
+    business_date: date,
+    hotel_ids: Optional[List[str]] = None,
+    concurrency: int = settings.NIGHT_AUDIT_CONCURRENCY,
+) -> List[AuditOutcome]:
+    """
+    Saare active hotels (ya diye gaye) ka audit, ek waqt mein `concurrency` tak.
+    Ek hotel fail ho toh baaki chalte rehte hain - outcome mein error aata hai.
+    """
+    if hotel_ids is None:
+        async with async_session() as session:
+            hotel_ids = list((await session.execute(
+                select(Hotel.id).where(Hotel.is_active == True)
+            )).scalars().all())
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def audit_hotel(hotel_id: str) -> AuditOutcome:
+        async with semaphore:
+            async with async_session() as session:
+                try:
+                    return hotel_id, await run_night_audit(session, hotel_id, business_date), None
+                except Exception as exc:
+                    return hotel_id, None, exc
+
+    return await asyncio.gather(*(audit_hotel(hotel_id) for hotel_id in hotel_ids))
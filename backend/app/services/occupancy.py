@@ -0,0 +1,123 @@
+"""
+Occupancy Kernel
+Bookings ko per-day occupancy counts (ya nightly amounts) mein convert karta hai.
+Difference array + cumulative sum - O(bookings + days), har din par
+har booking loop karne ki zarurat nahi.
+Flexible search ke liye sliding window min/sum helpers bhi yahin hain.
+NumPy (requirements.txt mein) se vectorized path; import na ho sake toh
+pure Python fallback - dono ka result same (test_occupancy.py).
+"""
+from collections import deque
+from datetime import date
+from itertools import accumulate
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Minimal install - pure Python fallback
+    np = None
+
+
+# (key, check_in, check_out, rooms) - key usually room_type_id hota hai
+Stay = Tuple[Hashable, date, date, int]
+
+
+def _clip(value: int, days: int) -> int:
+    return 0 if value < 0 else days if value > days else value
+
+
+def _counts_python(stays: List[Stay], start_date: date, days: int) -> Dict[Hashable, list]:
+    origin = start_date.toordinal()
+    diffs: Dict[Hashable, List[int]] = {}
+    for key, check_in, check_out, rooms in stays:
+        diff = diffs.get(key)
+        if diff is None:
+            diff = diffs[key] = [0] * (days + 1)
+        diff[_clip(check_in.toordinal() - origin, days)] += rooms
+        diff[_clip(check_out.toordinal() - origin, days)] -= rooms
+    return {key: list(accumulate(diff[:days])) for key, diff in diffs.items()}
+
+
+def _counts_numpy(stays: List[Stay], start_date: date, days: int, dtype: str = "int64") -> Dict[Hashable, list]:
+    origin = start_date.toordinal()
+    keys: Dict[Hashable, int] = {}
+    key_idx = np.fromiter((keys.setdefault(s[0], len(keys)) for s in stays), dtype=np.int64, count=len(stays))
+    check_ins = np.fromiter((s[1].toordinal() - origin for s in stays), dtype=np.int64, count=len(stays))
+    check_outs = np.fromiter((s[2].toordinal() - origin for s in stays), dtype=np.int64, count=len(stays))
+    rooms = np.fromiter((s[3] for s in stays), dtype=dtype, count=len(stays))
+
+    diff = np.zeros((len(keys), days + 1), dtype=dtype)
+    np.add.at(diff, (key_idx, np.clip(check_ins, 0, days)), rooms)
+    np.add.at(diff, (key_idx, np.clip(check_outs, 0, days)), -rooms)
+    counts = np.cumsum(diff[:, :days], axis=1)
+    return {key: counts[idx].tolist() for key, idx in keys.items()}
+
+
+def occupancy_by_key(stays: Iterable[Stay], start_date: date, days: int) -> Dict[Hashable, List[int]]:
+    """
+    Har key ke liye start_date se `days` raaton ka occupied rooms count.
+    Stay ki raatein check_in <= night < check_out hoti hain; range ke bahar
+    wala hissa clip ho jaata hai. Jo key kisi stay mein nahi hai woh result
+    mein nahi aati.
+    """
+    stays = list(stays)
+    if not stays or days <= 0:
+        return {}
+    if np is not None:
+        return _counts_numpy(stays, start_date, days)
+    return _counts_python(stays, start_date, days)
+
+
+def nightly_amounts_by_key(stays: Iterable[Stay], start_date: date, days: int) -> Dict[Hashable, List[float]]:
+    """
+    occupancy_by_key jaisa, par stay ka chautha field per-night amount (float)
+    hai - jaise nightly room revenue. Har raat ka total milta hai.
+    """
+    stays = list(stays)
+    if not stays or days <= 0:
+        return {}
+    if np is not None:
+        return _counts_numpy(stays, start_date, days, dtype="float64")
+    return _counts_python(stays, start_date, days)
+
+
+def nightly_occupancy(stays: Iterable[Stay], start_date: date, days: int) -> List[int]:
+    """Saari keys ek saath - hotel level per-night occupied rooms"""
+    counts = occupancy_by_key(((None, s[1], s[2], s[3]) for s in stays), start_date, days)
+    return counts.get(None, [0] * max(days, 0))
+
+
+def sliding_min(values: List[int], window: int) -> List[int]:
+    """
+    Har `window` length ke window ka minimum - result[i] = min(values[i:i+window]).
+    NumPy par sliding_window_view, warna monotonic deque - dono O(n).
+    """
+    if window <= 0 or window > len(values):
+        return []
+    if np is not None:
+        view = np.lib.stride_tricks.sliding_window_view(np.asarray(values), window)
+        return view.min(axis=1).tolist()
+
+    result: List[int] = []
+    candidates: deque = deque()
+    for i, value in enumerate(values):
+        while candidates and values[candidates[-1]] >= value:
+            candidates.pop()
+        candidates.append(i)
+        if candidates[0] <= i - window:
+            candidates.popleft()
+        if i >= window - 1:
+            result.append(values[candidates[0]])
+    return result
+
+
+def sliding_sum(values: List[float], window: int) -> List[float]:
+    """Har `window` length ke window ka sum - prefix sums se O(n)"""
+    if window <= 0 or window > len(values):
+        return []
+    if np is not None:
+        prefix = np.concatenate(([0.0], np.cumsum(np.asarray(values, dtype=float))))
+        return (prefix[window:] - prefix[:-window]).tolist()
+
+    prefix = [0.0] + list(accumulate(values))
+    return [prefix[i + window] - prefix[i] for i in range(len(values) - window + 1)]
@@ -0,0 +1,215 @@
+"""
+Pace Service
+Booking pace / pickup: night audit har hotel ke liye aage ki stay dates ke
+on-the-books rooms + revenue ka snapshot likhta hai (pace_snapshots).
+Pace report sirf snapshots padhti hai - bookings table ko touch nahi karti.
+
+Snapshot stay_night_revenue se aata hai (room type x raat par ek GROUP BY),
+jo booking writes ke saath hi update hota hai.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select, func
+
+from app.core.config import get_settings
+from app.core.database import dialect_insert
+from app.models.pace import PaceSnapshot
+from app.models.room import RoomType
+from app.models.stats import StayNightRevenue
+
+settings = get_settings()
+
+DEFAULT_PACE_DAYS_OUT = (30, 14, 7)
+# Pichhla saal = 52 hafte pehle, taaki weekday same rahe
+LAST_YEAR_OFFSET = timedelta(days=364)
+# Stay range na di ho toh aaj se itne din aage
+DEFAULT_PACE_RANGE_DAYS = 30
+
+
+async def take_pace_snapshot(
+    session: AsyncSession,
+    hotel_id: str,
+    snapshot_date: date,
+    horizon_days: int = settings.PACE_HORIZON_DAYS,
+) -> int:
+    """
+    snapshot_date se horizon_days raat aage tak ka on-the-books - har room type
+    ki ek row (jin types par kuch nahi bika unki zero wali row bhi, taaki
+    "snapshot nahi hai" aur "0 rooms" alag rahein). Same din dobara chale toh
+    row replace. Caller commit karta hai. Returns: likhi gayi rows.
+    """
+    last_stay_date = snapshot_date + timedelta(days=horizon_days - 1)
+    result = await session.execute(
+        select(
+            StayNightRevenue.room_type_id,
+            StayNightRevenue.stay_date,
+            func.sum(StayNightRevenue.rooms_sold),
+            func.sum(StayNightRevenue.room_revenue),
+        )
+        .where(
+            StayNightRevenue.hotel_id == hotel_id,
+            StayNightRevenue.stay_date >= snapshot_date,
+            StayNightRevenue.stay_date <= last_stay_date,
+        )
+        .group_by(StayNightRevenue.room_type_id, StayNightRevenue.stay_date)
+    )
+    room_type_ids = (await session.execute(
+        select(RoomType.id).where(RoomType.hotel_id == hotel_id)
+    )).scalars().all()
+
+    rooms: Dict[str, List[int]] = {room_type_id: [0] * horizon_days for room_type_id in room_type_ids}
+    revenue: Dict[str, List[float]] = {room_type_id: [0.0] * horizon_days for room_type_id in room_type_ids}
+    for room_type_id, stay_date, rooms_sold, room_revenue in result.all():
+        # Delete ho chuke room type ki bookings bhi on-the-books hain
+        if room_type_id not in rooms:
+            rooms[room_type_id] = [0] * horizon_days
+            revenue[room_type_id] = [0.0] * horizon_days
+        offset = (stay_date - snapshot_date).days
+        rooms[room_type_id][offset] = int(rooms_sold or 0)
+        revenue[room_type_id][offset] = round(float(room_revenue or 0), 2)
+
+    if not rooms:
+        return 0
+
+    now = datetime.utcnow()
+    snapshots = PaceSnapshot.__table__
+    stmt = dialect_insert(snapshots).values([
+        PaceSnapshot(
+            hotel_id=hotel_id,
+            room_type_id=room_type_id,
+            snapshot_date=snapshot_date,
+            first_stay_date=snapshot_date,
+            rooms=rooms[room_type_id],
+            revenue=revenue[room_type_id],
+            created_at=now,
+        ).model_dump()
+        for room_type_id in rooms
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["hotel_id", "snapshot_date", "room_type_id"],
+        set_={name: stmt.excluded[name] for name in ("first_stay_date", "rooms", "revenue", "created_at")},
+    )
+    await session.execute(stmt)
+    return len(rooms)
+
+
+def pace_range(start_date: Optional[date], end_date: Optional[date]) -> Tuple[date, date]:
+    """Default: aaj se DEFAULT_PACE_RANGE_DAYS aage tak ki stay dates"""
+    if not start_date:
+        start_date = date.today()
+    if not end_date:
+        end_date = start_date + timedelta(days=DEFAULT_PACE_RANGE_DAYS)
+    return start_date, end_date
+
+
+class _SnapshotDay:
+    """Ek snapshot_date ke saare (filtered) room type rows - stay date par sum"""
+
+    def __init__(self):
+        self.rows: List[PaceSnapshot] = []
+
+    def on_the_books(self, stay_date: date) -> Optional[Tuple[int, float]]:
+        """(rooms, revenue) - stay date snapshot ke horizon ke bahar ho toh None"""
+        rooms, revenue, covered = 0, 0.0, False
+        for row in self.rows:
+            offset = (stay_date - row.first_stay_date).days
+            if 0 <= offset < len(row.rooms):
+                covered = True
+                rooms += row.rooms[offset]
+                revenue += row.revenue[offset]
+        return (rooms, round(revenue, 2)) if covered else None
+
+
+async def build_pace_report(
+    session: AsyncSession,
+    hotel_id: str,
+    start_date: date,
+    end_date: date,
+    days_out: Sequence[int] = DEFAULT_PACE_DAYS_OUT,
+    room_type_id: Optional[str] = None,
+) -> dict:
+    """
+    Har stay date ke liye `days_out` din pehle on-the-books rooms / revenue,
+    pichhle saal (364 din pehle, same weekday) ki usi lead ke saath, plus
+    latest snapshot ka on-the-books. Jis din ka snapshot nahi liya gaya
+    (audit nahi chala / abhi aaya nahi) uski values None.
+    """
+    days_out = sorted(set(days_out), reverse=True)
+    latest = (await session.execute(
+        select(func.max(PaceSnapshot.snapshot_date)).where(PaceSnapshot.hotel_id == hotel_id)
+    )).scalar()
+
+    # Sirf zaroori snapshot dates: is saal aur pichhle saal ki lead windows
+    windows = [
+        PaceSnapshot.snapshot_date.between(start_date - timedelta(days=days_out[0]), end_date - timedelta(days=days_out[-1])),
+        PaceSnapshot.snapshot_date.between(
+            start_date - LAST_YEAR_OFFSET - timedelta(days=days_out[0]),
+            end_date - LAST_YEAR_OFFSET - timedelta(days=days_out[-1]),
+        ),
+    ]
+    if latest:
+        windows.append(PaceSnapshot.snapshot_date == latest)
+    query = select(PaceSnapshot).where(PaceSnapshot.hotel_id == hotel_id, or_(*windows))
+    if room_type_id:
+        query = query.where(PaceSnapshot.room_type_id == room_type_id)
+
+    snapshots: Dict[date, _SnapshotDay] = defaultdict(_SnapshotDay)
+    for row in (await session.execute(query)).scalars().all():
+        snapshots[row.snapshot_date].rows.append(row)
+
+    def lookup(snapshot_date: Optional[date], stay_date: date) -> Optional[Tuple[int, float]]:
+        day = snapshots.get(snapshot_date)
+        return day.on_the_books(stay_date) if day else None
+
+    totals = {
+        lead: {"days_out": lead, "rooms": 0, "revenue": 0.0, "last_year_rooms": 0, "last_year_revenue": 0.0}
+        for lead in days_out
+    }
+    dates = []
+    for i in range((end_date - start_date).days + 1):
+        stay_date = start_date + timedelta(days=i)
+        last_year_date = stay_date - LAST_YEAR_OFFSET
+        pace = []
+        for lead in days_out:
+            current = lookup(stay_date - timedelta(days=lead), stay_date)
+            last_year = lookup(last_year_date - timedelta(days=lead), last_year_date)
+            pace.append({
+                "days_out": lead,
+                "rooms": current[0] if current else None,
+                "revenue": current[1] if current else None,
+                "last_year_rooms": last_year[0] if last_year else None,
+                "last_year_revenue": last_year[1] if last_year else None,
+            })
+            total = totals[lead]
+            if current:
+                total["rooms"] += current[0]
+                total["revenue"] += current[1]
+            if last_year:
+                total["last_year_rooms"] += last_year[0]
+                total["last_year_revenue"] += last_year[1]
+
+        on_the_books = lookup(latest, stay_date)
+        dates.append({
+            "date": stay_date.isoformat(),
+            "last_year_date": last_year_date.isoformat(),
+            "on_the_books": {"rooms": on_the_books[0], "revenue": on_the_books[1]} if on_the_books else None,
+            "pace": pace,
+        })
+
+    for total in totals.values():
+        total["revenue"] = round(total["revenue"], 2)
+        total["last_year_revenue"] = round(total["last_year_revenue"], 2)
+
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "room_type_id": room_type_id,
+        "days_out": days_out,
+        "latest_snapshot_date": latest.isoformat() if latest else None,
+        "totals": [totals[lead] for lead in days_out],
+        "dates": dates,
+    }
@@ -0,0 +1,188 @@
+"""
+Stay Price Quote Engine
+RoomRate date ranges se kisi bhi stay ka nightly price nikalta hai.
+Har (room_type, rate_plan) ke liye ranges ek sorted, non-overlapping
+segment index mein flatten hoti hain; stay quote = ek bisect + stay ke
+segments, yaani O(log n) per stay.
+
+Rules:
+- RoomRate.date_to inclusive hai (last night jis par rate lagta hai)
+- Overlapping ranges mein chhoti (zyada specific) range jeetti hai,
+  barabar length par baad mein shuru hone wali
+- Jis raat ka koi rate nahi, wahan RoomType.base_price lagta hai
+"""
+import heapq
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.rates import RatePlan, RoomRate
+from app.models.room import RoomType
+
+
+# (date_from, date_to inclusive, price)
+RateRange = Tuple[date, date, float]
+
+
+@dataclass
+class RateIndex:
+    """Ek (room_type, rate_plan) ke non-overlapping segments - [start, end) ordinals"""
+    starts: List[int] = field(default_factory=list)
+    ends: List[int] = field(default_factory=list)
+    prices: List[float] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, ranges: Iterable[RateRange]) -> "RateIndex":
+        """
+        Overlapping ranges ko flatten karta hai - boundaries par sweep,
+        active ranges ek heap mein (chhoti range, phir late start pehle).
+        """
+        items = sorted(
+            (date_from.toordinal(), date_to.toordinal() + 1, price)
+            for date_from, date_to, price in ranges
+            if date_to >= date_from
+        )
+        boundaries = sorted({start for start, _, _ in items} | {end for _, end, _ in items})
+
+        index = cls()
+        active: List[Tuple[int, int, int, float]] = []
+        next_item = 0
+        for left, right in zip(boundaries, boundaries[1:]):
+            while next_item < len(items) and items[next_item][0] <= left:
+                start, end, price = items[next_item]
+                heapq.heappush(active, (end - start, -start, end, price))
+                next_item += 1
+            while active and active[0][2] <= left:
+                heapq.heappop(active)
+            if not active:
+                continue
+            price = active[0][3]
+            if index.ends and index.ends[-1] == left and index.prices[-1] == price:
+                index.ends[-1] = right
+            else:
+                index.starts.append(left)
+                index.ends.append(right)
+                index.prices.append(price)
+        return index
+
+    def nightly_prices(self, check_in: date, check_out: date, fallback: float) -> List[float]:
+        """Stay ki har raat ka price - segment na mile toh fallback"""
+        first, last = check_in.toordinal(), check_out.toordinal()
+        prices = [fallback] * max(last - first, 0)
+        pos = max(bisect_right(self.starts, first) - 1, 0)
+        while pos < len(self.starts) and self.starts[pos] < last:
+            lo = max(self.starts[pos], first)
+            hi = min(self.ends[pos], last)
+            for night in range(lo, hi):
+                prices[night - first] = self.prices[pos]
+            pos += 1
+        return prices
+
+
+class RateQuoter:
+    """
+    Hotel ke rates ka quote engine. load_quoter() se banao -
+    sirf requested date window ke rates load hote hain.
+    """
+
+    def __init__(self, room_types: Iterable[RoomType], rates: Iterable[RoomRate], plans: Iterable[RatePlan] = ()):
+        self.room_types: Dict[str, RoomType] = {rt.id: rt for rt in room_types}
+        self.plans: Dict[str, RatePlan] = {plan.id: plan for plan in plans}
+
+        grouped: Dict[Tuple[str, str], List[RateRange]] = {}
+        for rate in rates:
+            grouped.setdefault((rate.room_type_id, rate.rate_plan_id), []).append(
+                (rate.date_from, rate.date_to, rate.price)
+            )
+        self._indexes: Dict[Tuple[str, str], RateIndex] = {
+            key: RateIndex.build(ranges) for key, ranges in grouped.items()
+        }
+
+    def base_price(self, room_type_id: str) -> float:
+        room_type = self.room_types.get(room_type_id)
+        return room_type.base_price if room_type else 0.0
+
+    def plans_for(self, room_type_id: str) -> List[str]:
+        """Room type ke rate plans jinke rates hain"""
+        return [plan_id for rt_id, plan_id in self._indexes if rt_id == room_type_id]
+
+    def nightly_prices(
+        self,
+        room_type_id: str,
+        rate_plan_id: Optional[str],
+        check_in: date,
+        check_out: date,
+    ) -> List[float]:
+        fallback = self.base_price(room_type_id)
+        index = self._indexes.get((room_type_id, rate_plan_id))
+        if index is None:
+            return [fallback] * max((check_out - check_in).days, 0)
+        return index.nightly_prices(check_in, check_out, fallback)
+
+    def quote(self, room_type_id: str, rate_plan_id: Optional[str], check_in: date, check_out: date) -> float:
+        """Poori stay ka price"""
+        return sum(self.nightly_prices(room_type_id, rate_plan_id, check_in, check_out))
+
+    def best_quote(self, room_type_id: str, check_in: date, check_out: date) -> Tuple[Optional[str], float]:
+        """
+        Sabse sasta (rate_plan_id, stay price). Koi plan na ho toh
+        (None, base_price * nights).
+        """
+        plan_ids = self.plans_for(room_type_id)
+        if not plan_ids:
+            return None, self.quote(room_type_id, None, check_in, check_out)
+        return min(
+            ((plan_id, self.quote(room_type_id, plan_id, check_in, check_out)) for plan_id in plan_ids),
+            key=lambda item: item[1]
+        )
+
+
+async def load_quoter(
+    session: AsyncSession,
+    hotel_id: str,
+    check_in: date,
+    check_out: date,
+    room_type_ids: Optional[List[str]] = None,
+) -> RateQuoter:
+    """Hotel ke room types, active plans aur [check_in, check_out) ko chhoone wale rates load karta hai"""
+    room_type_query = select(RoomType).where(RoomType.hotel_id == hotel_id)
+    if room_type_ids is not None:
+        room_type_query = room_type_query.where(RoomType.id.in_(room_type_ids))
+    room_types = (await session.execute(room_type_query)).scalars().all()
+
+    plans = (await session.execute(
+        select(RatePlan).where(RatePlan.hotel_id == hotel_id, RatePlan.is_active == True)
+    )).scalars().all()
+
+    rate_query = select(RoomRate).where(
+        RoomRate.hotel_id == hotel_id,
+        RoomRate.rate_plan_id.in_([plan.id for plan in plans]),
+        RoomRate.date_from <= check_out - timedelta(days=1),
+        RoomRate.date_to >= check_in
+    )
+    if room_type_ids is not None:
+        rate_query = rate_query.where(RoomRate.room_type_id.in_(room_type_ids))
+    rates = (await session.execute(rate_query)).scalars().all()
+
+    return RateQuoter(room_types, rates, plans)
+
+
+def price_rooms(quoter: RateQuoter, rooms: List[dict], check_in: date, check_out: date) -> List[dict]:
+    """
+    Booking ke rooms JSON par server-side price_per_night/total_price set karta hai.
+    Client ka bheja price ignore hota hai. Room types aur rate plans (quoter.plans
+    mein hone chahiye) pehle validate kar lo - anjaan plan base_price par quote hota hai.
+    """
+    nights = max((check_out - check_in).days, 1)
+    priced = []
+    for room in rooms:
+        room = dict(room)
+        total_price = quoter.quote(room["room_type_id"], room.get("rate_plan_id"), check_in, check_out)
+        room["total_price"] = total_price
+        room["price_per_night"] = total_price / nights
+        priced.append(room)
+    return priced
@@ -0,0 +1,175 @@
+"""
+Bulk Rate Upload Service
+Revenue managers ke rate matrix (JSON ya CSV rows) ko existing RoomRate
+ranges mein merge karta hai. Har (room_type, rate_plan) ke ranges
+split/overwrite hote hain, phir adjacent equal-price ranges coalesce
+hokar compact set ke roop mein wapas likhe jaate hain.
+Poora batch ek transaction; kharab rows sirf errors mein report hoti hain.
+"""
+import csv
+import io
+import uuid
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.rates import RatePlan, RoomRate, RoomRateCreate, RateBulkResult, RateRowError
+from app.models.room import RoomType
+from app.services.pricing import RateIndex
+
+# Ek row kitne din cover kar sakti hai - galti se 100 saal na likh dein
+MAX_RANGE_DAYS = 3 * 366
+
+# (date_from ordinal, date_to ordinal inclusive, price)
+Segment = Tuple[int, int, float]
+
+
+def parse_csv_rows(content: bytes) -> List[dict]:
+    """
+    CSV header: room_type_id, rate_plan_id, date_from, date_to, price.
+    Single day ke liye date_from/date_to ki jagah `date` column bhi chalta hai.
+    """
+    reader = csv.DictReader(io.StringIO(content.decode("utf-8-sig")))
+    rows = []
+    for row in reader:
+        row = {key.strip(): (value or "").strip() for key, value in row.items() if key}
+        if row.get("date") and not row.get("date_from"):
+            row["date_from"] = row["date_to"] = row["date"]
+        rows.append(row)
+    return rows
+
+
+def merge_segments(existing: Iterable[Segment], updates: Iterable[Segment]) -> List[Segment]:
+    """
+    Existing segments par updates paint karta hai (baad wali update jeetti hai),
+    phir adjacent equal-price days coalesce karta hai.
+    """
+    nights: Dict[int, float] = {}
+    for start, end, price in list(existing) + list(updates):
+        for night in range(start, end + 1):
+            nights[night] = price
+
+    merged: List[Segment] = []
+    for night in sorted(nights):
+        price = nights[night]
+        if merged and merged[-1][1] == night - 1 and merged[-1][2] == price:
+            merged[-1] = (merged[-1][0], night, price)
+        else:
+            merged.append((night, night, price))
+    return merged
+
+
+def _validate_rows(
+    rows: List[dict],
+    room_type_ids: set,
+    rate_plan_ids: set,
+) -> Tuple[Dict[Tuple[str, str], List[Segment]], List[RateRowError], int]:
+    """Rows validate karke (room_type, plan) wise segments - errors alag"""
+    updates: Dict[Tuple[str, str], List[Segment]] = {}
+    errors: List[RateRowError] = []
+    applied = 0
+
+    for row_number, raw in enumerate(rows, start=1):
+        try:
+            rate = RoomRateCreate.model_validate(raw)
+        except ValidationError as exc:
+            first = exc.errors()[0]
+            field = ".".join(str(part) for part in first["loc"])
+            errors.append(RateRowError(row=row_number, error=f"{field}: {first['msg']}"))
+            continue
+
+        if rate.room_type_id not in room_type_ids:
+            errors.append(RateRowError(row=row_number, error="Room type not found"))
+        elif rate.rate_plan_id not in rate_plan_ids:
+            errors.append(RateRowError(row=row_number, error="Rate plan not found"))
+        elif rate.date_to < rate.date_from:
+            errors.append(RateRowError(row=row_number, error="date_to must not be before date_from"))
+        elif (rate.date_to - rate.date_from).days >= MAX_RANGE_DAYS:
+            errors.append(RateRowError(row=row_number, error=f"Range cannot exceed {MAX_RANGE_DAYS} days"))
+        elif rate.price < 0:
+            errors.append(RateRowError(row=row_number, error="price must not be negative"))
+        else:
+            updates.setdefault((rate.room_type_id, rate.rate_plan_id), []).append(
+                (rate.date_from.toordinal(), rate.date_to.toordinal(), rate.price)
+            )
+            applied += 1
+
+    return updates, errors, applied
+
+
+async def apply_rate_rows(session: AsyncSession, hotel_id: str, rows: List[dict]) -> RateBulkResult:
+    """
+    Rows ko hotel ke rates mein merge karta hai. Sirf touched (room_type, plan)
+    keys ke ranges dobara likhe jaate hain. Caller commit karta hai.
+    """
+    room_type_ids = set((await session.execute(
+        select(RoomType.id).where(RoomType.hotel_id == hotel_id)
+    )).scalars().all())
+    rate_plan_ids = set((await session.execute(
+        select(RatePlan.id).where(RatePlan.hotel_id == hotel_id)
+    )).scalars().all())
+
+    updates, errors, applied = _validate_rows(rows, room_type_ids, rate_plan_ids)
+
+    deleted = 0
+    new_rows: List[dict] = []
+    if updates:
+        touched_room_types = {room_type_id for room_type_id, _ in updates}
+        existing_result = await session.execute(
+            select(RoomRate).where(
+                RoomRate.hotel_id == hotel_id,
+                RoomRate.room_type_id.in_(touched_room_types)
+            )
+        )
+        existing: Dict[Tuple[str, str], List[RoomRate]] = {}
+        for rate in existing_result.scalars():
+            existing.setdefault((rate.room_type_id, rate.rate_plan_id), []).append(rate)
+
+        stale_ids: List[str] = []
+        for (room_type_id, rate_plan_id), key_updates in updates.items():
+            current = existing.get((room_type_id, rate_plan_id), [])
+            # Legacy overlapping ranges pehle quote engine ke rule se flatten
+            index = RateIndex.build((rate.date_from, rate.date_to, rate.price) for rate in current)
+            current_segments = [
+                (start, end - 1, price)
+                for start, end, price in zip(index.starts, index.ends, index.prices)
+            ]
+            merged = merge_segments(current_segments, key_updates)
+
+            current_exact = sorted(
+                (rate.date_from.toordinal(), rate.date_to.toordinal(), rate.price) for rate in current
+            )
+            if merged == current_exact:
+                continue
+
+            stale_ids.extend(rate.id for rate in current)
+            new_rows.extend(
+                {
+                    "id": str(uuid.uuid4()),
+                    "hotel_id": hotel_id,
+                    "room_type_id": room_type_id,
+                    "rate_plan_id": rate_plan_id,
+                    "date_from": date.fromordinal(start),
+                    "date_to": date.fromordinal(end),
+                    "price": price,
+                }
+                for start, end, price in merged
+            )
+
+        if stale_ids:
+            await session.execute(delete(RoomRate).where(RoomRate.id.in_(stale_ids)))
+            deleted = len(stale_ids)
+        if new_rows:
+            await session.execute(RoomRate.__table__.insert(), new_rows)
+
+    return RateBulkResult(
+        rows_received=len(rows),
+        rows_applied=applied,
+        ranges_deleted=deleted,
+        ranges_written=len(new_rows),
+        errors=errors,
+    )
@@ -0,0 +1,199 @@
+"""
+Report Jobs
+Lambi range ki reports request ke bahar chalti hain - POST se job banta hai,
+client status poll karta hai aur result alag se fetch karta hai.
+
+- Ek waqt mein REPORT_JOB_CONCURRENCY jobs (semaphore), har job apna session
+- Same hotel + kind + params ka job chal raha ho, ya REPORT_JOB_REUSE_SECONDS
+  ke andar done hua ho aur tab se stats nahi badle, toh wahi job milta hai
+- Hotel ke queued / running jobs aur poore store par cap - upar submit reject
+- Result ek baar JSON bytes mein serialize hota hai, TTL tak har download free
+- Store process-local hai (OrderedDict); TTL ya max_jobs par purane jobs hat'te hain
+"""
+import asyncio
+import json
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database import async_session
+from app.models.report_job import ReportJobRead, ReportJobStatus, ReportKind
+from app.services.daily_stats import report_day_cache
+from app.services.reports import build_dashboard_report, build_occupancy_report, build_revenue_report
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+ReportBuilder = Callable[..., Awaitable[dict]]
+
+# kind -> builder(session, hotel_id, **params)
+REPORT_BUILDERS: Dict[ReportKind, ReportBuilder] = {
+    ReportKind.DASHBOARD: build_dashboard_report,
+    ReportKind.OCCUPANCY: build_occupancy_report,
+    ReportKind.REVENUE: build_revenue_report,
+}
+
+FINISHED_STATUSES = (ReportJobStatus.DONE, ReportJobStatus.FAILED)
+
+
+class ReportJobLimitExceeded(Exception):
+    """Hotel ke pending jobs ya store ki limit poori - naya job nahi"""
+
+
+def _job_key(hotel_id: str, kind: ReportKind, params: dict) -> Hashable:
+    return hotel_id, kind, tuple(sorted(params.items()))
+
+
+@dataclass
+class ReportJob:
+    hotel_id: str
+    kind: ReportKind
+    params: dict
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: ReportJobStatus = ReportJobStatus.QUEUED
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[bytes] = None
+    # Submit ke waqt stats cache ka version - baad mein stats likhe gaye toh result reuse nahi
+    stats_version: int = 0
+
+    def read(self) -> ReportJobRead:
+        return ReportJobRead(
+            id=self.id,
+            kind=self.kind,
+            status=self.status,
+            params=self.params,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            expires_at=self.expires_at,
+            error=self.error,
+        )
+
+
+class ReportJobQueue:
+    def __init__(
+        self,
+        concurrency: int,
+        result_ttl_seconds: int,
+        max_jobs: int = 1000,
+        reuse_seconds: int = 60,
+        max_pending_per_hotel: int = 5,
+    ):
+        self.result_ttl = timedelta(seconds=result_ttl_seconds)
+        self.reuse_window = timedelta(seconds=reuse_seconds)
+        self.max_jobs = max_jobs
+        self.max_pending_per_hotel = max_pending_per_hotel
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._jobs: "OrderedDict[str, ReportJob]" = OrderedDict()
+        # Dedupe key -> job id
+        self._by_key: Dict[Hashable, str] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(self, hotel_id: str, kind: ReportKind, params: dict) -> ReportJob:
+        """
+        Naya job, ya same request ka chalta / abhi reuse hone layak job.
+        Hotel ke pending jobs ya store full ho toh ReportJobLimitExceeded.
+        """
+        self._evict()
+        key = _job_key(hotel_id, kind, params)
+        existing = self._jobs.get(self._by_key.get(key))
+        if existing and self._reusable(existing):
+            return existing
+
+        pending = [job for job in self._jobs.values() if job.status not in FINISHED_STATUSES]
+        if (
+            sum(1 for job in pending if job.hotel_id == hotel_id) >= self.max_pending_per_hotel
+            or len(pending) >= self.max_jobs
+        ):
+            raise ReportJobLimitExceeded(hotel_id)
+
+        job = ReportJob(hotel_id=hotel_id, kind=kind, params=params, stats_version=report_day_cache.version)
+        self._jobs[job.id] = job
+        self._by_key[key] = job.id
+        self._tasks[job.id] = asyncio.create_task(self._run(job))
+        return job
+
+    def _reusable(self, job: ReportJob) -> bool:
+        """Chalta job hamesha; done job sirf reuse window mein aur jab tak stats nahi badle"""
+        if job.status == ReportJobStatus.FAILED:
+            return False
+        if job.status != ReportJobStatus.DONE:
+            return True
+        return (
+            job.finished_at + self.reuse_window > datetime.utcnow()
+            and job.stats_version == report_day_cache.version
+        )
+
+    def get(self, hotel_id: str, job_id: str) -> Optional[ReportJob]:
+        """Sirf apne hotel ka job - expire ho gaya toh None"""
+        self._evict()
+        job = self._jobs.get(job_id)
+        return job if job and job.hotel_id == hotel_id else None
+
+    async def stop(self) -> None:
+        """Shutdown: chalte / queued jobs cancel"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _run(self, job: ReportJob) -> None:
+        try:
+            async with self._semaphore:
+                job.status = ReportJobStatus.RUNNING
+                job.started_at = datetime.utcnow()
+                try:
+                    async with async_session() as session:
+                        result = await self._build(session, job)
+                    # Ek hi baar serialize - har download yahi bytes bhejta hai
+                    job.result = json.dumps(jsonable_encoder(result)).encode()
+                    job.status = ReportJobStatus.DONE
+                except Exception as exc:
+                    logger.exception("Report job %s (%s) failed: %s", job.id, job.kind.value, exc)
+                    job.error = "Report generation failed"
+                    job.status = ReportJobStatus.FAILED
+                job.finished_at = datetime.utcnow()
+                job.expires_at = job.finished_at + self.result_ttl
+        finally:
+            self._tasks.pop(job.id, None)
+
+    @staticmethod
+    async def _build(session: AsyncSession, job: ReportJob) -> dict:
+        return await REPORT_BUILDERS[job.kind](session, job.hotel_id, **job.params)
+
+    def _evict(self) -> None:
+        now = datetime.utcnow()
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.expires_at and job.expires_at <= now]:
+            self._remove(job_id)
+        # Limit se zyada - sabse purane finished jobs pehle (chalte jobs nahi hatte)
+        if len(self._jobs) > self.max_jobs:
+            finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATUSES]
+            for job_id in finished[:len(self._jobs) - self.max_jobs]:
+                self._remove(job_id)
+
+    def _remove(self, job_id: str) -> None:
+        job = self._jobs.pop(job_id)
+        key = _job_key(job.hotel_id, job.kind, job.params)
+        if self._by_key.get(key) == job_id:
+            del self._by_key[key]
+
+
+report_jobs = ReportJobQueue(
+    settings.REPORT_JOB_CONCURRENCY,
+    settings.REPORT_JOB_RESULT_TTL_SECONDS,
+    settings.REPORT_JOB_MAX_JOBS,
+    settings.REPORT_JOB_REUSE_SECONDS,
+    settings.REPORT_JOB_MAX_PENDING_PER_HOTEL,
+)
@@ -0,0 +1,226 @@
+"""
+Reports Service
+Dashboard aur occupancy reports ka computation - /reports endpoints inline
+chalate hain, lambi ranges report jobs (app.services.report_jobs) mein.
+Dono daily_hotel_stats (pre-aggregated) se padhte hain; ADR / RevPAR per
+room type / rate plan stay_night_revenue par ek GROUP BY.
+"""
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import case
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select, func
+
+from app.models.payment import Payment, PaymentStatus
+from app.models.rates import RatePlan
+from app.models.room import RoomType
+from app.models.stats import NO_RATE_PLAN, StayNightRevenue
+from app.services.daily_stats import load_daily_stats, occupancy_rate
+
+# Dates na di hon toh pichhle itne din
+DEFAULT_REPORT_DAYS = 30
+
+
+def report_range(start_date: Optional[date], end_date: Optional[date]) -> Tuple[date, date]:
+    """Default: end_date aaj, start_date usse DEFAULT_REPORT_DAYS pehle"""
+    if not end_date:
+        end_date = date.today()
+    if not start_date:
+        start_date = end_date - timedelta(days=DEFAULT_REPORT_DAYS)
+    return start_date, end_date
+
+
+async def total_inventory(session: AsyncSession, hotel_id: str) -> int:
+    result = await session.execute(
+        select(func.sum(RoomType.total_inventory)).where(RoomType.hotel_id == hotel_id)
+    )
+    return result.scalar() or 0
+
+
+def adr(room_revenue: float, rooms_sold: int) -> float:
+    """Average Daily Rate - bechi gayi room-night ka average revenue"""
+    return round(room_revenue / rooms_sold, 2) if rooms_sold else 0
+
+
+def revpar(room_revenue: float, rooms_available: int) -> float:
+    """Revenue Per Available Room - available room-nights par revenue"""
+    return round(room_revenue / rooms_available, 2) if rooms_available else 0
+
+
+async def net_collected(session: AsyncSession, hotel_id: str, start_date: date, end_date: date) -> float:
+    """Range mein completed payments minus refunded payments (created_at ke din se)"""
+    signed_amount = case(
+        (Payment.status == PaymentStatus.COMPLETED, Payment.amount),
+        (Payment.status == PaymentStatus.REFUNDED, -Payment.amount),
+        else_=0
+    )
+    result = await session.execute(
+        select(func.coalesce(func.sum(signed_amount), 0)).where(
+            Payment.hotel_id == hotel_id,
+            Payment.created_at >= datetime.combine(start_date, datetime.min.time()),
+            Payment.created_at < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+        )
+    )
+    return float(result.scalar())
+
+
+async def build_dashboard_report(session: AsyncSession, hotel_id: str, days: int) -> dict:
+    """Pichhle N din ka summary + chart data - N+1 stats rows, bookings scan nahi"""
+    end_date = date.today()
+    start_date = end_date - timedelta(days=days)
+
+    stats = await load_daily_stats(session, hotel_id, start_date, end_date)
+    inventory = await total_inventory(session, hotel_id)
+
+    # Revenue us raat ka room revenue (stay-night), bookings check-in date par,
+    # occupancy us raat ke occupied rooms
+    chart_data = []
+    for i in range(days + 1):
+        d = start_date + timedelta(days=i)
+        row = stats.get(d)
+        chart_data.append({
+            "date": d.isoformat(),
+            "revenue": round(row.room_revenue, 2) if row else 0,
+            "occupancy": occupancy_rate(row.rooms_sold, inventory) if row else 0,
+            "bookings": row.arrivals if row else 0
+        })
+
+    total_revenue = round(sum(row.room_revenue for row in stats.values()), 2)
+    total_bookings = sum(d["bookings"] for d in chart_data)
+    rooms_sold = sum(row.rooms_sold for row in stats.values())
+
+    # Occupancy Rate (Average of period)
+    avg_occupancy = sum(d["occupancy"] for d in chart_data) / len(chart_data) if chart_data else 0
+
+    return {
+        "summary": {
+            "totalRevenue": total_revenue,
+            "totalBookings": total_bookings,
+            "occupancyRate": int(avg_occupancy),
+            "adr": adr(total_revenue, rooms_sold),
+            "revpar": revpar(total_revenue, inventory * len(chart_data)),
+            # Period mein actually collect hua paisa (completed minus refunded payments)
+            "netCollected": await net_collected(session, hotel_id, start_date, end_date)
+        },
+        "revenueChart": chart_data,
+        "occupancyChart": chart_data
+    }
+
+
+async def build_occupancy_report(session: AsyncSession, hotel_id: str, start_date: date, end_date: date) -> dict:
+    """start_date..end_date (inclusive) - har din ek row"""
+    inventory = await total_inventory(session, hotel_id)
+
+    if inventory == 0:
+        return {
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "total_inventory": 0,
+            "average_occupancy": 0,
+            "daily_occupancy": []
+        }
+
+    stats = await load_daily_stats(session, hotel_id, start_date, end_date)
+
+    days_count = (end_date - start_date).days + 1
+    daily_occupancy = []
+    total_occupancy = 0
+
+    for i in range(days_count):
+        d = start_date + timedelta(days=i)
+        occupied = stats[d].rooms_sold if d in stats else 0
+        rate = occupancy_rate(occupied, inventory)
+        daily_occupancy.append({
+            "date": d.isoformat(),
+            "occupied_rooms": occupied,
+            "available_rooms": inventory - occupied,
+            "occupancy_rate": rate
+        })
+        total_occupancy += rate
+
+    average_occupancy = int(total_occupancy / days_count) if days_count > 0 else 0
+
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "total_inventory": inventory,
+        "average_occupancy": average_occupancy,
+        "daily_occupancy": daily_occupancy
+    }
+
+
+REVENUE_GROUPS = ("room_type", "rate_plan")
+
+
+async def build_revenue_report(
+    session: AsyncSession,
+    hotel_id: str,
+    start_date: date,
+    end_date: date,
+    group_by: str = "room_type",
+) -> dict:
+    """
+    Room type ya rate plan wise rooms sold, room revenue, occupancy, ADR, RevPAR.
+    stay_night_revenue par database mein ek GROUP BY - Python mein per booking loop nahi.
+    Rate plans poore hotel ke hote hain, isliye unka occupancy / RevPAR hotel ki
+    available room-nights par hai; room type ka us type ki inventory par.
+    """
+    nights = (end_date - start_date).days + 1
+    dimension = StayNightRevenue.room_type_id if group_by == "room_type" else StayNightRevenue.rate_plan_id
+    result = await session.execute(
+        select(dimension, func.sum(StayNightRevenue.rooms_sold), func.sum(StayNightRevenue.room_revenue))
+        .where(
+            StayNightRevenue.hotel_id == hotel_id,
+            StayNightRevenue.stay_date >= start_date,
+            StayNightRevenue.stay_date <= end_date
+        )
+        .group_by(dimension)
+    )
+    sold = {key: (int(rooms or 0), float(revenue or 0)) for key, rooms, revenue in result.all()}
+
+    room_types = (await session.execute(
+        select(RoomType.id, RoomType.name, RoomType.total_inventory).where(RoomType.hotel_id == hotel_id)
+    )).all()
+    hotel_room_nights = sum(row.total_inventory for row in room_types) * nights
+
+    if group_by == "room_type":
+        dimensions = [(row.id, row.name, row.total_inventory * nights) for row in room_types]
+    else:
+        rate_plans = (await session.execute(
+            select(RatePlan.id, RatePlan.name).where(RatePlan.hotel_id == hotel_id)
+        )).all()
+        dimensions = [(row.id, row.name, hotel_room_nights) for row in rate_plans]
+        if NO_RATE_PLAN in sold:
+            dimensions.append((NO_RATE_PLAN, "No rate plan", hotel_room_nights))
+    # Delete ho chuke room types / rate plans ki purani bookings bhi dikhni chahiye
+    known = {dimension_id for dimension_id, _, _ in dimensions}
+    dimensions += [
+        (key, None, hotel_room_nights if group_by == "rate_plan" else 0)
+        for key in sold if key not in known
+    ]
+
+    def metrics(rooms_available: int, rooms_sold: int, room_revenue: float) -> dict:
+        return {
+            "rooms_available": rooms_available,
+            "rooms_sold": rooms_sold,
+            "room_revenue": round(room_revenue, 2),
+            "occupancy_rate": occupancy_rate(rooms_sold, rooms_available),
+            "adr": adr(room_revenue, rooms_sold),
+            "revpar": revpar(room_revenue, rooms_available),
+        }
+
+    rows = []
+    for dimension_id, name, rooms_available in dimensions:
+        rooms_sold, room_revenue = sold.get(dimension_id, (0, 0.0))
+        rows.append({"id": dimension_id, "name": name, **metrics(rooms_available, rooms_sold, room_revenue)})
+
+    total_sold = sum(rooms for rooms, _ in sold.values())
+    total_revenue = sum(revenue for _, revenue in sold.values())
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "group_by": group_by,
+        "totals": metrics(hotel_room_nights, total_sold, total_revenue),
+        "rows": rows,
+    }
@@ -0,0 +1,207 @@
+"""
+Guest & Booking Search
+Front desk search - guest ka naam, email, phone ya booking number.
+
+- SQLite: FTS5 table `guest_search`, guests par triggers se sync rehti hai,
+  bm25 se ranked (last name ka weight sabse zyada)
+- PostgreSQL: pg_trgm GIN index guest document expression par - index
+  Postgres khud maintain karta hai, ranking similarity() se
+- Booking number: prefix range scan existing unique index par
+"""
+import logging
+import re
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlmodel import select
+
+from app.models.booking import Booking, BookingSearchHit, Guest
+
+logger = logging.getLogger(__name__)
+
+# Phone ke separators hata kar digits hi index hote hain - country code ke bina
+# search ho sake isliye last 10 digits alag token bhi
+_PHONE_STRIP_SQLITE = "replace(replace(replace(replace(replace(replace(coalesce({col}, ''), ' ', ''), '-', ''), '+', ''), '(', ''), ')', ''), '.', '')"
+
+_FTS_COLUMNS = "guest_id, hotel_id, first_name, last_name, email, phone"
+
+
+def _fts_values(row: str) -> str:
+    digits = _PHONE_STRIP_SQLITE.format(col=row + ".phone")
+    return (
+        f"{row}.id, {row}.hotel_id, {row}.first_name, {row}.last_name, "
+        f"{row}.email, {digits} || ' ' || substr({digits}, -10)"
+    )
+
+
+SQLITE_SETUP = [
+    """
+    CREATE VIRTUAL TABLE guest_search USING fts5(
+        guest_id UNINDEXED, hotel_id UNINDEXED, first_name, last_name, email, phone,
+        tokenize = "unicode61 remove_diacritics 2", prefix = '2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS guests_search_ai AFTER INSERT ON guests BEGIN
+        INSERT INTO guest_search({_FTS_COLUMNS}) VALUES ({_fts_values('new')});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS guests_search_ad AFTER DELETE ON guests BEGIN
+        DELETE FROM guest_search WHERE guest_id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS guests_search_au AFTER UPDATE ON guests BEGIN
+        DELETE FROM guest_search WHERE guest_id = old.id;
+        INSERT INTO guest_search({_FTS_COLUMNS}) VALUES ({_fts_values('new')});
+    END
+    """,
+    f"INSERT INTO guest_search({_FTS_COLUMNS}) SELECT {_fts_values('guests')} FROM guests",
+]
+
+# Lowercased searchable document - index aur query dono yahi expression use karte hain
+PG_GUEST_DOCUMENT = (
+    "lower(first_name || ' ' || last_name || ' ' || email || ' ' "
+    "|| regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g'))"
+)
+
+PG_SETUP = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_guests_search_trgm ON guests USING gin (({PG_GUEST_DOCUMENT}) gin_trgm_ops)",
+]
+
+_TERM_RE = re.compile(r"[\w@.+-]+", re.UNICODE)
+_PHONE_SEPARATORS_RE = re.compile(r"[\s()+.-]")
+
+# setup_search_index() set karta hai - pg_trgm na ho toh ranking created_at se
+_trigram_ready = False
+
+
+async def setup_search_index(engine: AsyncEngine) -> bool:
+    """
+    Startup par search index banata hai (idempotent). Purane guests pehli
+    baar mein index ho jaate hain. Returns: index ready hai ya nahi.
+    """
+    global _trigram_ready
+    if engine.dialect.name == "sqlite":
+        async with engine.begin() as conn:
+            exists = (await conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'guest_search'"
+            ))).first()
+            if not exists:
+                for statement in SQLITE_SETUP:
+                    await conn.execute(text(statement))
+        return True
+    if engine.dialect.name == "postgresql":
+        try:
+            async with engine.begin() as conn:
+                for statement in PG_SETUP:
+                    await conn.execute(text(statement))
+            _trigram_ready = True
+            return True
+        except Exception as exc:
+            # Managed Postgres par extension permission na ho - search tab bhi chalega, bas slow
+            logger.warning("pg_trgm search index unavailable: %s", exc)
+    return False
+
+
+def search_terms(query: str) -> List[str]:
+    """User input se search terms - punctuation aur operators hata kar"""
+    # "+91 98765-43210" poora ek phone number hai
+    digits = _PHONE_SEPARATORS_RE.sub("", query)
+    if digits.isdigit():
+        return [digits]
+    return _TERM_RE.findall(query.lower())
+
+
+def _fts_match(terms: List[str]) -> str:
+    """Har term ek quoted prefix query - sab AND"""
+    parts = []
+    for term in terms:
+        for token in re.findall(r"\w+", term, re.UNICODE):
+            parts.append('"' + token.replace('"', '') + '"*')
+    return " ".join(parts)
+
+
+async def search_guests(session: AsyncSession, hotel_id: str, query: str, limit: int) -> List[Guest]:
+    """Ranked guest matches"""
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        match = _fts_match(terms)
+        if not match:
+            return []
+        result = await session.execute(
+            text(
+                "SELECT guest_id FROM guest_search "
+                "WHERE guest_search MATCH :match AND hotel_id = :hotel_id "
+                "ORDER BY bm25(guest_search, 0, 0, 2.0, 4.0, 1.0, 1.0) LIMIT :limit"
+            ),
+            {"match": match, "hotel_id": hotel_id, "limit": limit}
+        )
+    else:
+        params = {"hotel_id": hotel_id, "limit": limit, "query": " ".join(terms)}
+        conditions = []
+        for position, term in enumerate(terms):
+            params[f"term_{position}"] = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            conditions.append(f"{PG_GUEST_DOCUMENT} LIKE :term_{position}")
+        rank = f"word_similarity(:query, {PG_GUEST_DOCUMENT}) DESC, " if _trigram_ready else ""
+        result = await session.execute(
+            text(
+                f"SELECT id FROM guests WHERE hotel_id = :hotel_id AND {' AND '.join(conditions)} "
+                f"ORDER BY {rank}created_at DESC LIMIT :limit"
+            ),
+            params
+        )
+    guest_ids = [row[0] for row in result.all()]
+    if not guest_ids:
+        return []
+
+    guests = (await session.execute(select(Guest).where(Guest.id.in_(guest_ids)))).scalars().all()
+    by_id = {guest.id: guest for guest in guests}
+    return [by_id[guest_id] for guest_id in guest_ids if guest_id in by_id]
+
+
+def booking_number_prefix(query: str) -> Optional[str]:
+    """Query booking number jaisi dikhe (BK...) toh normalized prefix"""
+    prefix = re.sub(r"[^0-9A-Za-z]", "", query).upper()
+    return prefix if len(prefix) >= 3 and prefix.startswith("BK") else None
+
+
+async def search_bookings(session: AsyncSession, hotel_id: str, query: str, limit: int) -> List[BookingSearchHit]:
+    """
+    Booking number prefix match - range condition taaki unique index
+    dono dialects par seek ho (LIKE collation par depend nahi karta).
+    """
+    prefix = booking_number_prefix(query)
+    if not prefix:
+        return []
+    result = await session.execute(
+        select(Booking, Guest.first_name, Guest.last_name)
+        .join(Guest, Guest.id == Booking.guest_id)
+        .where(
+            Booking.hotel_id == hotel_id,
+            Booking.booking_number >= prefix,
+            Booking.booking_number < prefix + "\uffff"
+        )
+        .order_by(Booking.booking_number.desc())
+        .limit(limit)
+    )
+    return [
+        BookingSearchHit(
+            id=booking.id,
+            booking_number=booking.booking_number,
+            status=booking.status,
+            check_in=booking.check_in,
+            check_out=booking.check_out,
+            total_amount=booking.total_amount,
+            guest_id=booking.guest_id,
+            guest_name=f"{first_name} {last_name}",
+        )
+        for booking, first_name, last_name in result.all()
+    ]
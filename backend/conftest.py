@@ -0,0 +1,94 @@
+"""
+Pytest setup - tests ek temporary SQLite database par chalte hain.
+App import hone se pehle env set hona zaroori hai (settings cached hain).
+
+Fixtures:
+- hotel_api: scenario(client) ko apne event loop mein chalata hai - naya
+  hotel signup + login, phir HotelClient; end mein client band aur engine dispose
+"""
+import asyncio
+import os
+import tempfile
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Iterable, TypeVar
+
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ["DEBUG"] = "false"
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+T = TypeVar("T")
+
+PASSWORD = "Password123"
+
+
+class HotelClient(httpx.AsyncClient):
+    """Ek hotel owner ke token wala API client, booking helpers ke saath"""
+
+    hotel_id: str
+
+    async def create_room_type(self, name: str, base_price: float, total_inventory: int) -> str:
+        response = await self.post("/rooms", json={
+            "name": name, "base_price": base_price, "total_inventory": total_inventory
+        })
+        assert response.status_code in (200, 201), response.text
+        return response.json()["id"]
+
+    async def create_booking(
+        self, room_type_ids: Iterable[str], check_in: date, nights: int, email: str
+    ) -> dict:
+        response = await self.post("/bookings", json=booking_payload(room_type_ids, check_in, nights, email))
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    async def set_status(self, booking: dict, *statuses: str) -> None:
+        for booking_status in statuses:
+            response = await self.patch(f"/bookings/{booking['id']}", json={"status": booking_status})
+            assert response.status_code == 200, response.text
+
+
+def booking_payload(room_type_ids: Iterable[str], check_in: date, nights: int, email: str) -> dict:
+    return {
+        "check_in": check_in.isoformat(),
+        "check_out": (check_in + timedelta(days=nights)).isoformat(),
+        "guest": {"first_name": "Guest", "last_name": email, "email": email},
+        "rooms": [{"room_type_id": room_type_id} for room_type_id in room_type_ids]
+    }
+
+
+async def _signup(app, email: str, timeout: float) -> HotelClient:
+    client = HotelClient(transport=httpx.ASGITransport(app=app), base_url="http://test/api/v1", timeout=timeout)
+    await client.post("/auth/signup", json={
+        "email": email,
+        "password": PASSWORD,
+        "name": "Test Owner",
+        "hotel_name": f"Hotel {email}"
+    })
+    login = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+    client.hotel_id = (await client.get("/users/me")).json()["hotel_id"]
+    return client
+
+
+@pytest.fixture
+def hotel_api() -> Callable[..., T]:
+    """hotel_api(scenario, email) - scenario(client) ka result return karta hai"""
+    # main saare models import karta hai - init_db se pehle metadata poora chahiye
+    from main import app
+    from app.core.database import engine, init_db
+
+    def run(scenario: Callable[[HotelClient], Awaitable[T]], email: str, timeout: float = 5) -> T:
+        async def main() -> T:
+            await init_db()
+            client = await _signup(app, email, timeout)
+            try:
+                return await scenario(client)
+            finally:
+                await client.aclose()
+                # Har test ka apna event loop - pool ke connections purane loop ke hain
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
@@ -8,10 +8,19 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import get_settings
-from app.core.database import init_db
+from app.core.database import init_db, async_session, engine
+from app.api.idempotency import REPLAYED_HEADER
+from app.api.pagination import PAGE_HEADERS
+from app.services.booking_rooms import bootstrap_booking_rooms
+from app.services.daily_stats import bootstrap_daily_stats
+from app.services.guests import check_guest_email_index
+from app.services.inventory import bootstrap_ledger
+from app.services.holds import hold_sweeper
+from app.services.report_jobs import report_jobs
+from app.services.search import setup_search_index
 
 # Import routers
-from app.api.v1 import auth, users, hotels, rooms, bookings, dashboard, rates, payments, availability, reports, public, integration
+from app.api.v1 import auth, users, hotels, rooms, bookings, dashboard, rates, payments, availability, reports, public, integration, search, night_audit
 
 settings = get_settings()
 
@@ -26,9 +35,34 @@ async def lifespan(app: FastAPI):
     print("Starting Hotelier Hub API...")
     await init_db()
     print("Database initialized successfully!")
+    # (hotel_id, email) unique index purane duplicates ki wajah se skip hua ho toh sirf warning -
+    # merge guest rows delete karta hai, woh manage.py dedupe-guests se explicitly
+    if not await check_guest_email_index():
+        print(
+            "Warning: guests have duplicate (hotel_id, email) rows, unique index not created. "
+            "Guest upserts use a slower fallback until `python manage.py dedupe-guests` is run "
+            "and the server restarted."
+        )
+    # Guest search index (FTS5 / pg_trgm) - idempotent
+    await setup_search_index(engine)
+    # Purane database ke liye booking_rooms, inventory ledger aur daily stats ek baar build karo
+    async with async_session() as session:
+        backfilled = await bootstrap_booking_rooms(session)
+        written = await bootstrap_ledger(session)
+        stats_written = await bootstrap_daily_stats(session)
+    if backfilled:
+        print(f"Booking rooms backfilled ({backfilled} rows)")
+    if written:
+        print(f"Inventory ledger bootstrapped ({written} rows)")
+    if stats_written:
+        print(f"Daily stats bootstrapped ({stats_written} rows)")
+    # Public holds ka expiry timer
+    await hold_sweeper.start()
     yield
     # Shutdown: Cleanup if needed
     print("Shutting down...")
+    await hold_sweeper.stop()
+    await report_jobs.stop()
 
 
 # FastAPI app create karo
@@ -48,6 +82,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination / idempotency headers frontend JS ko dikhne chahiye
+    expose_headers=PAGE_HEADERS + [REPLAYED_HEADER],
 )
 
 
@@ -73,6 +109,8 @@ app.include_router(availability.router, prefix=API_V1_PREFIX)
 app.include_router(reports.router, prefix=API_V1_PREFIX)
 app.include_router(public.router, prefix=API_V1_PREFIX)
 app.include_router(integration.router, prefix=API_V1_PREFIX)
+app.include_router(search.router, prefix=API_V1_PREFIX)
+app.include_router(night_audit.router, prefix=API_V1_PREFIX)
 
 
 # Root endpoint
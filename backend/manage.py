@@ -0,0 +1,227 @@
+"""
+Management Commands
+Maintenance tasks jo request cycle ke bahar chalte hain.
+
+Usage:
+    python manage.py rebuild-ledger [--hotel-id ID]
+    python manage.py verify-ledger [--hotel-id ID]
+    python manage.py backfill-booking-rooms [--hotel-id ID]
+    python manage.py import-bookings --hotel-id ID FILE [--format jsonl|csv] [--batch-size N]
+    python manage.py night-audit [--hotel-id ID] [--date YYYY-MM-DD] [--concurrency N]
+    python manage.py dedupe-guests [--hotel-id ID]
+    python manage.py rebuild-daily-stats [--hotel-id ID]
+    python manage.py pace-snapshot [--hotel-id ID] [--date YYYY-MM-DD] [--force]
+
+Stats likhne wale commands (import, rebuild, audit, dedupe) alag process hain -
+chalte server ki reports mein closed din REPORT_DAY_CACHE_TTL_SECONDS ke
+andar refresh hote hain (turant chahiye toh server restart).
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date
+
+from sqlmodel import select
+
+from app.core.config import get_settings
+from app.core.database import init_db, async_session
+# Saare models import karo - warna metadata mein hotels/users tables nahi hote aur FKs resolve nahi hote
+from app.models import hotel, user, room, rates, payment, integration, night_audit, stats, pace  # noqa: F401
+from app.models.booking import BookingImportResult
+from app.models.hotel import Hotel
+from app.models.pace import PaceSnapshot
+from app.services.booking_import import (
+    IMPORT_BATCH_SIZE, IMPORT_FORMATS, import_bookings, import_format, iter_import_rows
+)
+from app.services.booking_rooms import backfill_booking_rooms
+from app.services.daily_stats import rebuild_daily_stats
+from app.services.guests import ensure_guest_email_index, merge_duplicate_guests
+from app.services.inventory import rebuild_ledger, verify_ledger
+from app.services.night_audit import default_business_date, run_night_audits
+from app.services.pace import take_pace_snapshot
+
+settings = get_settings()
+
+
+async def cmd_rebuild_ledger(args) -> int:
+    """Inventory ledger bookings aur active holds se dobara banata hai"""
+    async with async_session() as session:
+        written = await rebuild_ledger(session, args.hotel_id)
+        await session.commit()
+    print(f"Ledger rebuilt: {written} rows written")
+    return 0
+
+
+async def cmd_verify_ledger(args) -> int:
+    """Ledger ko bookings se compare karta hai - mismatch par exit code 1"""
+    async with async_session() as session:
+        mismatches = await verify_ledger(session, args.hotel_id)
+    for m in mismatches:
+        print(
+            f"{m.hotel_id} {m.room_type_id} {m.stay_date}: ledger={m.ledger} expected={m.expected} "
+            f"held={m.ledger_held} expected_held={m.expected_held}"
+        )
+    print(f"{len(mismatches)} mismatches found")
+    return 1 if mismatches else 0
+
+
+async def cmd_backfill_booking_rooms(args) -> int:
+    """Purane bookings ke rooms JSON se booking_rooms rows banata hai"""
+    async with async_session() as session:
+        written = await backfill_booking_rooms(session, args.hotel_id)
+        await session.commit()
+    print(f"Booking rooms backfilled: {written} rows written")
+    return 0
+
+
+def _print_progress(result: BookingImportResult) -> None:
+    print(
+        f"{result.rows_received} rows read, {result.bookings_created} bookings imported, "
+        f"{result.error_count} errors",
+        flush=True
+    )
+
+
+async def cmd_import_bookings(args) -> int:
+    """JSONL/CSV bookings hotel mein bulk import - errors par exit code 1"""
+    fmt = import_format(args.file, args.format)
+    with open(args.file, encoding="utf-8-sig", newline="") as stream:
+        async with async_session() as session:
+            result = await import_bookings(
+                session, args.hotel_id, iter_import_rows(stream, fmt),
+                batch_size=args.batch_size, on_progress=_print_progress
+            )
+    for error in result.errors:
+        print(f"row {error.row}: {error.error}")
+    if result.error_count > len(result.errors):
+        print(f"... {result.error_count - len(result.errors)} more errors")
+    print(
+        f"Import done: {result.bookings_created} bookings, {result.guests_created} new guests, "
+        f"{result.guests_matched} matched guests, {result.error_count} errors"
+    )
+    return 1 if result.error_count else 0
+
+
+async def cmd_night_audit(args) -> int:
+    """Business day close - saare hotels, bounded parallelism. Kisi hotel ke fail hone par exit code 1"""
+    business_date = args.date or default_business_date()
+    hotel_ids = [args.hotel_id] if args.hotel_id else None
+    outcomes = await run_night_audits(business_date, hotel_ids, concurrency=args.concurrency)
+    failed = 0
+    for hotel_id, audit, error in outcomes:
+        if error:
+            failed += 1
+            print(f"{hotel_id}: FAILED {error}")
+        else:
+            print(
+                f"{hotel_id}: sold={audit.rooms_sold}/{audit.rooms_available} revenue={audit.room_revenue:.2f} "
+                f"no_shows={audit.no_shows} checked_out={audit.checked_out}"
+            )
+    print(f"Night audit {business_date}: {len(outcomes) - failed} hotels closed, {failed} failed")
+    return 1 if failed else 0
+
+
+async def cmd_dedupe_guests(args) -> int:
+    """Same (hotel, email) ke guests merge - bookings keeper guest par, phir unique index"""
+    async with async_session() as session:
+        merged = await merge_duplicate_guests(session, args.hotel_id)
+    print(f"Duplicate guests merged: {merged}")
+    if not args.hotel_id:
+        await ensure_guest_email_index()
+        print("Unique (hotel_id, email) index ready")
+    return 0
+
+
+
+async def cmd_rebuild_daily_stats(args) -> int:
+    """daily_hotel_stats bookings se dobara banata hai"""
+    async with async_session() as session:
+        written = await rebuild_daily_stats(session, args.hotel_id)
+        await session.commit()
+    print(f"Daily stats rebuilt: {written} rows written")
+    return 0
+
+
+async def cmd_pace_snapshot(args) -> int:
+    """
+    Audit ke bina abhi ka on-the-books snapshot (jaise pehli baar, audit se pehle).
+    Default aaj ki date - jis hotel ka us din ka snapshot (jaise audit wala) pehle
+    se hai woh --force ke bina skip, warna purani pace history overwrite ho jaati.
+    """
+    snapshot_date = args.date or date.today()
+    async with async_session() as session:
+        if args.hotel_id:
+            hotel_ids = [args.hotel_id]
+        else:
+            hotel_ids = (await session.execute(
+                select(Hotel.id).where(Hotel.is_active == True)
+            )).scalars().all()
+        existing = set()
+        if not args.force:
+            existing = set((await session.execute(
+                select(PaceSnapshot.hotel_id).distinct().where(
+                    PaceSnapshot.snapshot_date == snapshot_date,
+                    PaceSnapshot.hotel_id.in_(hotel_ids),
+                )
+            )).scalars().all())
+        written = 0
+        for hotel_id in hotel_ids:
+            if hotel_id in existing:
+                print(f"{hotel_id}: snapshot for {snapshot_date} already exists, skipping (use --force to overwrite)")
+                continue
+            written += await take_pace_snapshot(session, hotel_id, snapshot_date)
+        await session.commit()
+    print(
+        f"Pace snapshot {snapshot_date}: {written} rows written for {len(hotel_ids) - len(existing)} hotels, "
+        f"{len(existing)} skipped"
+    )
+    return 0
+
+
+COMMANDS = {
+    "rebuild-ledger": cmd_rebuild_ledger,
+    "verify-ledger": cmd_verify_ledger,
+    "backfill-booking-rooms": cmd_backfill_booking_rooms,
+    "import-bookings": cmd_import_bookings,
+    "night-audit": cmd_night_audit,
+    "dedupe-guests": cmd_dedupe_guests,
+    "rebuild-daily-stats": cmd_rebuild_daily_stats,
+    "pace-snapshot": cmd_pace_snapshot,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Hotelier Hub management commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("rebuild-ledger", "verify-ledger", "backfill-booking-rooms", "dedupe-guests", "rebuild-daily-stats"):
+        sub = subparsers.add_parser(name)
+        sub.add_argument("--hotel-id", default=None, help="Sirf ek hotel ke liye chalao")
+
+    importer = subparsers.add_parser("import-bookings")
+    importer.add_argument("file", help="JSONL ya CSV file")
+    importer.add_argument("--hotel-id", required=True)
+    importer.add_argument("--format", choices=IMPORT_FORMATS, default=None, help="Default: file extension se")
+    importer.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    audit = subparsers.add_parser("night-audit")
+    audit.add_argument("--hotel-id", default=None, help="Sirf ek hotel ke liye chalao")
+    audit.add_argument("--date", type=date.fromisoformat, default=None, help="Business date (default: kal)")
+    audit.add_argument("--concurrency", type=int, default=settings.NIGHT_AUDIT_CONCURRENCY)
+
+    snapshot = subparsers.add_parser("pace-snapshot")
+    snapshot.add_argument("--hotel-id", default=None, help="Sirf ek hotel ke liye chalao")
+    snapshot.add_argument("--date", type=date.fromisoformat, default=None, help="Snapshot date (default: aaj)")
+    snapshot.add_argument("--force", action="store_true", help="Us din ka maujooda snapshot overwrite karo")
+
+    return parser
+
+
+async def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    await init_db()
+    return await COMMANDS[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
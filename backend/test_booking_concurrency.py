@@ -0,0 +1,67 @@
+"""
+Concurrent Booking Stress Test
+Ek room type par saikdon concurrent bookings - koi bhi raat total_inventory
+se zyada nahi bikni chahiye, baaki requests clean 409 paayein, aur poora
+burst reasonable time mein khatam ho.
+
+Run: pytest backend/test_booking_concurrency.py
+"""
+import asyncio
+import time
+from datetime import date, timedelta
+
+from sqlmodel import select
+
+from app.core.database import async_session
+from app.models.inventory import InventoryLedger
+from app.services.inventory import verify_ledger
+from conftest import booking_payload
+
+INVENTORY = 25
+REQUESTS = 300
+MIN_REQUESTS_PER_SECOND = 20
+
+
+async def _scenario(client) -> float:
+    room_type_id = await client.create_room_type("Sale Room", 99, INVENTORY)
+    first_night = date(2031, 6, 1)
+
+    # Overlapping stays: sab 1 June touch karte hain, lengths alag
+    payloads = [
+        booking_payload([room_type_id], first_night + timedelta(days=i % 3), 1 + i % 4, f"flash{i}@example.com")
+        for i in range(REQUESTS)
+    ]
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(client.post("/bookings", json=payload) for payload in payloads))
+    elapsed = time.perf_counter() - started
+
+    codes = [response.status_code for response in responses]
+    assert set(codes) <= {201, 409}, sorted(set(codes))
+    assert codes.count(201) >= INVENTORY
+
+    async with async_session() as session:
+        ledger = (await session.execute(
+            select(InventoryLedger.stay_date, InventoryLedger.booked)
+            .where(InventoryLedger.room_type_id == room_type_id)
+        )).all()
+        mismatches = await verify_ledger(session)
+
+    # Zero overbooking, aur ledger bookings se exactly match
+    assert ledger and max(booked for _, booked in ledger) <= INVENTORY, ledger
+    assert max(booked for _, booked in ledger) == INVENTORY
+    assert mismatches == [], mismatches
+
+    # 409 sirf sold-out ki wajah se - rejected stay ki koi raat full honi chahiye
+    booked_on = dict(ledger)
+    for payload, code in zip(payloads, codes):
+        if code == 409:
+            check_in = date.fromisoformat(payload["check_in"])
+            check_out = date.fromisoformat(payload["check_out"])
+            nights = [check_in + timedelta(days=i) for i in range((check_out - check_in).days)]
+            assert any(booked_on.get(night, 0) >= INVENTORY for night in nights), payload
+    return elapsed
+
+
+def test_concurrent_bookings_never_overbook(hotel_api):
+    elapsed = hotel_api(_scenario, "flash-sale@example.com", timeout=120)
+    assert REQUESTS / elapsed >= MIN_REQUESTS_PER_SECOND, f"{REQUESTS / elapsed:.1f} req/s"
@@ -0,0 +1,57 @@
+"""
+Bookings List Query Count Test
+GET /bookings ko constant number of SQL statements mein chalna chahiye,
+chahe page par kitni bhi bookings hon (N+1 guest lookup regression guard).
+
+Run: pytest backend/test_booking_queries.py
+"""
+from datetime import date
+
+from sqlalchemy import event
+
+from app.core.database import engine
+
+
+class StatementCounter:
+    """Engine par chalne wale SQL statements count karta hai"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+async def _create_bookings(client, room_type_id: str, count: int, offset: int) -> None:
+    for i in range(count):
+        await client.create_booking([room_type_id], date(2030, 1, 1), 2, f"guest{offset + i}@example.com")
+
+
+async def _count_list_statements(client) -> int:
+    counter = StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    try:
+        response = await client.get("/bookings", params={"limit": 100})
+        assert response.status_code == 200, response.text
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+    return counter.count
+
+
+async def _scenario(client):
+    room_type_id = await client.create_room_type("Deluxe", 100, 100)
+
+    await _create_bookings(client, room_type_id, 3, offset=0)
+    small_page = await _count_list_statements(client)
+
+    await _create_bookings(client, room_type_id, 30, offset=3)
+    large_page = await _count_list_statements(client)
+    return small_page, large_page
+
+
+def test_bookings_list_runs_constant_number_of_queries(hotel_api):
+    small_page, large_page = hotel_api(_scenario, "queries@example.com")
+
+    # Auth user lookup + bookings-with-guests join
+    assert small_page == large_page, (small_page, large_page)
+    assert large_page <= 2, large_page
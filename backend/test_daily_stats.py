@@ -0,0 +1,83 @@
+"""
+Incremental Daily Stats Test
+Booking create / confirm / cancel / check-in har write par daily_hotel_stats
+aur stay_night_revenue update karte hain - yeh rows bookings se scratch
+rebuild (compute_daily_stats) ke barabar honi chahiye.
+
+Run: pytest backend/test_daily_stats.py
+"""
+from datetime import date, timedelta
+
+from sqlmodel import select
+
+from app.core.database import async_session
+from app.models.stats import DailyHotelStats, StayNightRevenue
+from app.services.daily_stats import NIGHT_FIELDS, STAT_FIELDS, compute_daily_stats
+
+
+def _non_zero(rows: dict) -> dict:
+    """Sab-zero rows (jaise cancel ke baad bachi) rebuild mein nahi hoti"""
+    return {key: values for key, values in rows.items() if any(values.values())}
+
+
+async def _stored_and_rebuilt(hotel_id: str):
+    async with async_session() as session:
+        days = (await session.execute(
+            select(DailyHotelStats).where(DailyHotelStats.hotel_id == hotel_id)
+        )).scalars().all()
+        nights = (await session.execute(
+            select(StayNightRevenue).where(StayNightRevenue.hotel_id == hotel_id)
+        )).scalars().all()
+        rebuilt = await compute_daily_stats(session, hotel_id)
+
+    stored_days = {
+        (row.hotel_id, row.stat_date): {name: round(getattr(row, name), 6) for name in STAT_FIELDS}
+        for row in days
+    }
+    stored_nights = {
+        (row.hotel_id, row.stay_date, row.room_type_id, row.rate_plan_id): {
+            name: round(getattr(row, name), 6) for name in NIGHT_FIELDS
+        }
+        for row in nights
+    }
+    rebuilt_days = {
+        key: {name: round(values[name], 6) for name in STAT_FIELDS} for key, values in rebuilt.days.items()
+    }
+    rebuilt_nights = {
+        key: {name: round(values[name], 6) for name in NIGHT_FIELDS} for key, values in rebuilt.nights.items()
+    }
+    return (
+        (_non_zero(stored_days), _non_zero(stored_nights)),
+        (_non_zero(rebuilt_days), _non_zero(rebuilt_nights)),
+    )
+
+
+async def _scenario(client):
+    deluxe = await client.create_room_type("Deluxe", 120, 10)
+    standard = await client.create_room_type("Standard", 70, 5)
+
+    today = date.today()
+    checked_in = await client.create_booking([deluxe], today, 3, "checked-in@example.com")
+    await client.set_status(checked_in, "confirmed", "checked_in")
+
+    cancelled = await client.create_booking([deluxe, standard], today + timedelta(days=1), 2, "cancelled@example.com")
+    await client.set_status(cancelled, "confirmed", "cancelled")
+
+    confirmed = await client.create_booking([standard, standard], today + timedelta(days=2), 4, "confirmed@example.com")
+    await client.set_status(confirmed, "confirmed")
+
+    await client.create_booking([deluxe], today + timedelta(days=5), 1, "pending@example.com")
+
+    return await _stored_and_rebuilt(client.hotel_id)
+
+
+def test_incremental_stats_match_rebuild(hotel_api):
+    stored, rebuilt = hotel_api(_scenario, "stats@example.com")
+
+    stored_days, stored_nights = stored
+    rebuilt_days, rebuilt_nights = rebuilt
+    assert stored_days == rebuilt_days
+    assert stored_nights == rebuilt_nights
+    # Guard: comparison khaali data par pass na ho jaaye
+    assert sum(values["rooms_sold"] for values in stored_days.values()) == 3 + 2 * 4
+    assert sum(values["cancellations"] for values in stored_days.values()) == 1
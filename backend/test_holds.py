@@ -0,0 +1,70 @@
+"""
+Inventory Holds Test
+Hold inventory block karta hai (ek saath aaye holds bhi total se upar nahi
+jaate), expire hone par rooms wapas aate hain aur expired / converted hold
+se booking 410 deti hai.
+
+Run: pytest backend/test_holds.py
+"""
+import asyncio
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import update
+
+from app.core.database import async_session
+from app.models.inventory import InventoryHold
+from app.services.holds import expire_hold
+
+CHECK_IN = date(2032, 9, 1)
+
+
+async def _hold(client, room_type_id: str):
+    return await client.post(f"/public/hotels/{client.hotel_id}/holds", json={
+        "room_type_id": room_type_id,
+        "check_in": CHECK_IN.isoformat(),
+        "check_out": (CHECK_IN + timedelta(days=2)).isoformat(),
+    })
+
+
+async def _book(client, hold_id: str):
+    return await client.post(f"/public/hotels/{client.hotel_id}/holds/{hold_id}/book", json={
+        "guest": {"first_name": "Hold", "last_name": "Guest", "email": "hold-guest@example.com"}
+    })
+
+
+async def _expire(hold_id: str) -> None:
+    """Sweeper jaisa - expires_at beet chuka, phir expire_hold"""
+    async with async_session() as session:
+        await session.execute(
+            update(InventoryHold).where(InventoryHold.id == hold_id)
+            .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+        )
+        await session.commit()
+        assert await expire_hold(session, hold_id) is not None
+
+
+async def _scenario(client) -> None:
+    room_type_id = await client.create_room_type("Deluxe", 100, 2)
+
+    # 2 rooms par 3 holds ek saath - sirf 2 milte hain
+    responses = await asyncio.gather(*(_hold(client, room_type_id) for _ in range(3)))
+    assert sorted(response.status_code for response in responses) == [201, 201, 409]
+    first, second = [response.json() for response in responses if response.status_code == 201]
+
+    await _expire(first["id"])
+    assert (await _book(client, first["id"])).status_code == 410
+    # Expired hold ke rooms wapas - naya hold mil jaata hai
+    replacement = await _hold(client, room_type_id)
+    assert replacement.status_code == 201, replacement.text
+
+    booked = await _book(client, second["id"])
+    assert booked.status_code == 201, booked.text
+    hold = (await client.get(f"/public/hotels/{client.hotel_id}/holds/{second['id']}")).json()
+    assert hold["status"] == "converted"
+    assert (await _book(client, second["id"])).status_code == 410
+    # Converted hold ka room booking ne le liya - inventory abhi bhi full
+    assert (await _hold(client, room_type_id)).status_code == 409
+
+
+def test_hold_create_expire_and_book(hotel_api):
+    hotel_api(_scenario, "holds@example.com")
@@ -0,0 +1,40 @@
+"""
+Idempotency-Key Test
+2xx response replay hota hai (handler dobara nahi chalta); 409 yaad nahi
+rehta - inventory free hone par same key ka retry booking bana deta hai.
+
+Run: pytest backend/test_idempotency.py
+"""
+from datetime import date
+
+from app.api.idempotency import REPLAYED_HEADER
+from conftest import booking_payload
+
+CHECK_IN = date(2032, 10, 1)
+
+
+async def _scenario(client) -> None:
+    room_type_id = await client.create_room_type("Deluxe", 100, 1)
+    blocking = await client.create_booking([room_type_id], CHECK_IN, 2, "blocking@example.com")
+
+    payload = booking_payload([room_type_id], CHECK_IN, 2, "retry@example.com")
+    headers = {"Idempotency-Key": "retry-booking-1"}
+    full = await client.post("/bookings", json=payload, headers=headers)
+    assert full.status_code == 409, full.text
+
+    await client.set_status(blocking, "cancelled")
+    created = await client.post("/bookings", json=payload, headers=headers)
+    assert created.status_code == 201, created.text
+    assert REPLAYED_HEADER not in created.headers
+
+    replayed = await client.post("/bookings", json=payload, headers=headers)
+    assert replayed.status_code == 201
+    assert replayed.headers[REPLAYED_HEADER] == "true"
+    assert replayed.json()["id"] == created.json()["id"]
+
+    reused = await client.post("/bookings", json={**payload, "special_requests": "late"}, headers=headers)
+    assert reused.status_code == 422
+
+
+def test_only_success_responses_are_replayed(hotel_api):
+    hotel_api(_scenario, "idempotency@example.com")
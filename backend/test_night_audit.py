@@ -0,0 +1,37 @@
+"""
+Night Audit Test
+Sirf beeta hua business day close hota hai (aaj / kal par 400); snapshot
+ke rooms_sold daily stats jaisa pending bookings nahi ginta.
+
+Run: pytest backend/test_night_audit.py
+"""
+from datetime import date, timedelta
+
+
+async def _scenario(client) -> None:
+    deluxe = await client.create_room_type("Deluxe", 100, 10)
+    today = date.today()
+    business_date = today - timedelta(days=1)
+
+    for day in (today, today + timedelta(days=1)):
+        response = await client.post("/night-audit", json={"business_date": day.isoformat()})
+        assert response.status_code == 400, response.text
+
+    staying = await client.create_booking([deluxe], today - timedelta(days=3), 4, "audit-staying@example.com")
+    await client.set_status(staying, "confirmed", "checked_in")
+    # Pehla audit sirf business_date ke arrivals no-show karta hai - yeh pending rehti hai
+    await client.create_booking([deluxe], today - timedelta(days=3), 4, "audit-pending@example.com")
+    no_show = await client.create_booking([deluxe], business_date, 2, "audit-no-show@example.com")
+    await client.set_status(no_show, "confirmed")
+
+    response = await client.post("/night-audit", json={"business_date": business_date.isoformat()})
+    assert response.status_code == 200, response.text
+    audit = response.json()
+    assert audit["business_date"] == business_date.isoformat()
+    assert audit["no_shows"] == 1
+    assert audit["rooms_sold"] == 1
+    assert audit["room_revenue"] == round(staying["total_amount"] / 4, 2)
+
+
+def test_night_audit_closes_only_past_days(hotel_api):
+    hotel_api(_scenario, "night-audit@example.com")
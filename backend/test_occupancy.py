@@ -0,0 +1,64 @@
+"""
+Occupancy Kernel Test
+NumPy aur pure Python dono paths ek hi stays par same counts, nightly
+amounts aur sliding window results dene chahiye.
+
+Run: pytest backend/test_occupancy.py
+"""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.services import occupancy
+
+START = date(2031, 3, 1)
+DAYS = 60
+
+
+def _stays(seed: int, amounts: bool = False) -> list:
+    rng = random.Random(seed)
+    stays = []
+    for _ in range(500):
+        # Range ke pehle / baad shuru hone wale stays bhi - clipping cover ho
+        check_in = START + timedelta(days=rng.randint(-10, DAYS + 5))
+        check_out = check_in + timedelta(days=rng.randint(1, 14))
+        value = round(rng.uniform(40, 400), 2) if amounts else rng.randint(1, 3)
+        stays.append((rng.choice(["deluxe", "standard", "suite"]), check_in, check_out, value))
+    return stays
+
+
+def _run_both(monkeypatch, func, *args):
+    vectorized = func(*args)
+    monkeypatch.setattr(occupancy, "np", None)
+    fallback = func(*args)
+    monkeypatch.undo()
+    return vectorized, fallback
+
+
+def test_numpy_path_is_available():
+    assert occupancy.np is not None
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_numpy_and_python_paths_match(monkeypatch, seed):
+    stays = _stays(seed)
+    vectorized, fallback = _run_both(monkeypatch, occupancy.occupancy_by_key, stays, START, DAYS)
+    assert vectorized == fallback
+    assert set(vectorized) == {"deluxe", "standard", "suite"}
+
+    vectorized, fallback = _run_both(monkeypatch, occupancy.nightly_occupancy, stays, START, DAYS)
+    assert vectorized == fallback
+
+    amounts = _stays(seed, amounts=True)
+    vectorized, fallback = _run_both(monkeypatch, occupancy.nightly_amounts_by_key, amounts, START, DAYS)
+    assert vectorized.keys() == fallback.keys()
+    for key in vectorized:
+        assert vectorized[key] == pytest.approx(fallback[key])
+
+    counts = occupancy.nightly_occupancy(stays, START, DAYS)
+    for window in (1, 7, DAYS):
+        vectorized, fallback = _run_both(monkeypatch, occupancy.sliding_min, counts, window)
+        assert vectorized == fallback
+        vectorized, fallback = _run_both(monkeypatch, occupancy.sliding_sum, counts, window)
+        assert vectorized == pytest.approx(fallback)
@@ -0,0 +1,43 @@
+"""
+Public Room Search Test
+Bina login wala search free inventory ledger se aata hai, aur stay ki lambai
+MAX_STAY_NIGHTS tak hi - lambi stay (search ya hold) par 400.
+
+Run: pytest backend/test_public_search.py
+"""
+from datetime import date, timedelta
+
+from app.api.v1.public import MAX_STAY_NIGHTS
+
+
+async def _scenario(client) -> None:
+    deluxe = await client.create_room_type("Deluxe", 100, 3)
+    check_in = date(2032, 5, 1)
+    booking = await client.create_booking([deluxe], check_in, 2, "public-search@example.com")
+    await client.set_status(booking, "confirmed")
+
+    def search(nights: int):
+        return client.get(f"/public/hotels/{client.hotel_id}/rooms", params={
+            "check_in": check_in.isoformat(),
+            "check_out": (check_in + timedelta(days=nights)).isoformat(),
+        })
+
+    response = await search(2)
+    assert response.status_code == 200, response.text
+    assert [(room["id"], room["available_rooms"]) for room in response.json()] == [(deluxe, 2)]
+
+    assert (await search(MAX_STAY_NIGHTS)).status_code == 200
+    assert (await search(MAX_STAY_NIGHTS + 1)).status_code == 400
+    assert (await search(0)).status_code == 400
+
+    hold = await client.post(f"/public/hotels/{client.hotel_id}/holds", json={
+        "room_type_id": deluxe,
+        "check_in": check_in.isoformat(),
+        "check_out": (check_in + timedelta(days=MAX_STAY_NIGHTS + 1)).isoformat(),
+        "rooms": 1,
+    })
+    assert hold.status_code == 400, hold.text
+
+
+def test_public_search_caps_stay_length(hotel_api):
+    hotel_api(_scenario, "public-search@example.com")
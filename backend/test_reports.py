@@ -0,0 +1,161 @@
+"""
+Report Endpoints Test
+- /reports/occupancy: night audit se closed din cache se aate hain
+  (dusre process ka DB write TTL tak nahi dikhta, is process ka write turant)
+- /reports/revenue aur /reports/dashboard: stay-night revenue, ADR, RevPAR, netCollected
+- /reports/pace: audit ke snapshot se days-out on-the-books
+- Inline reports REPORT_INLINE_MAX_RANGE_DAYS tak, lambi range sirf /reports/jobs
+
+Run: pytest backend/test_reports.py
+"""
+from datetime import date, timedelta
+
+from sqlmodel import select
+
+from app.core.config import get_settings
+from app.core.database import async_session
+from app.models.stats import DailyHotelStats
+from app.services.daily_stats import report_day_cache
+from app.services.night_audit import run_night_audit
+
+
+async def _close_yesterday(client) -> date:
+    """Kal tak ke din night audit se closed - returns business date"""
+    business_date = date.today() - timedelta(days=1)
+    async with async_session() as session:
+        await run_night_audit(session, client.hotel_id, business_date)
+    return business_date
+
+
+async def _occupied(client, day: date) -> int:
+    response = await client.get("/reports/occupancy", params={"start_date": day.isoformat(), "end_date": day.isoformat()})
+    assert response.status_code == 200, response.text
+    return response.json()["daily_occupancy"][0]["occupied_rooms"]
+
+
+async def _closed_days_scenario(client) -> list:
+    deluxe = await client.create_room_type("Deluxe", 100, 10)
+    stay_date = date.today() - timedelta(days=9)
+    # Beeta hua stay - audit tak checked out
+    past = await client.create_booking([deluxe], stay_date - timedelta(days=1), 2, "past@example.com")
+    await client.set_status(past, "confirmed", "checked_in")
+    await _close_yesterday(client)
+
+    seen = [await _occupied(client, stay_date)]
+    _, missing = report_day_cache.get_many(client.hotel_id, [stay_date])
+    assert not missing
+
+    # manage.py jaisa dusra process - is process ka cache invalidate nahi hota
+    async with async_session() as session:
+        row = (await session.execute(
+            select(DailyHotelStats).where(
+                DailyHotelStats.hotel_id == client.hotel_id, DailyHotelStats.stat_date == stay_date
+            )
+        )).scalar_one()
+        row.rooms_sold = 7
+        await session.commit()
+    seen.append(await _occupied(client, stay_date))
+
+    # Is process ka booking write closed din bhi invalidate karta hai
+    await client.set_status(past, "cancelled")
+    seen.append(await _occupied(client, stay_date))
+    return seen
+
+
+def test_closed_days_served_from_cache_until_local_write(hotel_api):
+    assert hotel_api(_closed_days_scenario, "report-cache@example.com") == [1, 1, 6]
+
+
+async def _revenue_scenario(client) -> None:
+    deluxe = await client.create_room_type("Deluxe", 100, 10)
+    await client.create_room_type("Standard", 50, 5)
+    first_night = date.today() + timedelta(days=7)
+    nights = 3
+    booking = await client.create_booking([deluxe], first_night, nights, "revenue@example.com")
+    await client.set_status(booking, "confirmed")
+
+    response = await client.get("/reports/revenue", params={
+        "start_date": first_night.isoformat(),
+        "end_date": (first_night + timedelta(days=nights - 1)).isoformat(),
+    })
+    assert response.status_code == 200, response.text
+    report = response.json()
+    room_revenue = booking["total_amount"]
+    # Hotel: Deluxe 10 + Standard 5 rooms
+    assert report["totals"]["rooms_sold"] == nights
+    assert report["totals"]["room_revenue"] == round(room_revenue, 2)
+    assert report["totals"]["adr"] == round(room_revenue / nights, 2)
+    assert report["totals"]["revpar"] == round(room_revenue / (15 * nights), 2)
+    deluxe_row = next(row for row in report["rows"] if row["id"] == deluxe)
+    assert deluxe_row["rooms_available"] == 10 * nights
+    assert deluxe_row["revpar"] == round(room_revenue / (10 * nights), 2)
+
+    bad_range = await client.get("/reports/revenue", params={"start_date": "2030-01-02", "end_date": "2030-01-01"})
+    assert bad_range.status_code == 400
+
+    for amount, payment_status in ((200, "completed"), (50, "refunded"), (80, "pending")):
+        response = await client.post("/payments", json={
+            "booking_id": booking["id"], "amount": amount, "status": payment_status
+        })
+        assert response.status_code == 200, response.text
+    response = await client.get("/reports/dashboard", params={"days": 0})
+    assert response.status_code == 200, response.text
+    summary = response.json()["summary"]
+    assert summary["netCollected"] == 150
+    assert "netProfit" not in summary
+
+
+def test_revenue_report_and_net_collected(hotel_api):
+    hotel_api(_revenue_scenario, "report-revenue@example.com")
+
+
+async def _pace_scenario(client) -> None:
+    deluxe = await client.create_room_type("Deluxe", 100, 10)
+    stay_date = date.today() + timedelta(days=7)
+    booking = await client.create_booking([deluxe], stay_date, 3, "pace@example.com")
+    await client.set_status(booking, "confirmed")
+    business_date = await _close_yesterday(client)
+    lead = (stay_date - business_date).days
+
+    response = await client.get("/reports/pace", params={
+        "start_date": stay_date.isoformat(),
+        "end_date": stay_date.isoformat(),
+        "days_out": [lead, 30],
+    })
+    assert response.status_code == 200, response.text
+    day = response.json()["dates"][0]
+    pace = {entry["days_out"]: entry for entry in day["pace"]}
+    assert pace[lead]["rooms"] == 1
+    assert pace[lead]["revenue"] == round(booking["total_amount"] / 3, 2)
+    # 30 din pehle ka snapshot nahi liya gaya - 0 nahi, None
+    assert pace[30]["rooms"] is None
+    assert day["on_the_books"]["rooms"] == 1
+
+    bad_lead = await client.get("/reports/pace", params={"days_out": [-1]})
+    assert bad_lead.status_code == 400
+
+
+def test_pace_report_reads_audit_snapshots(hotel_api):
+    hotel_api(_pace_scenario, "report-pace@example.com")
+
+
+async def _range_cap_scenario(client) -> None:
+    max_days = get_settings().REPORT_INLINE_MAX_RANGE_DAYS
+    end_date = date.today()
+    longest = {"start_date": (end_date - timedelta(days=max_days)).isoformat(), "end_date": end_date.isoformat()}
+    too_long = {**longest, "start_date": (end_date - timedelta(days=max_days + 1)).isoformat()}
+
+    for path in ("/reports/occupancy", "/reports/revenue"):
+        assert (await client.get(path, params=longest)).status_code == 200, path
+        response = await client.get(path, params=too_long)
+        assert response.status_code == 400, path
+        assert "/reports/jobs" in response.json()["detail"]
+    assert (await client.get("/reports/dashboard", params={"days": max_days})).status_code == 200
+    assert (await client.get("/reports/dashboard", params={"days": max_days + 1})).status_code == 400
+
+    job = await client.post("/reports/jobs", json={"kind": "occupancy", **too_long})
+    assert job.status_code == 202, job.text
+
+
+def test_inline_reports_cap_range(hotel_api):
+    hotel_api(_range_cap_scenario, "report-range@example.com")
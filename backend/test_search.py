@@ -0,0 +1,55 @@
+"""
+Guest & Booking Search Test
+FTS5 index: last name ka match first name se upar rank hota hai, phone
+kisi bhi format (country code / separators) mein milta hai, aur booking
+number prefix se.
+
+Run: pytest backend/test_search.py
+"""
+from datetime import date
+
+from app.core.database import engine
+from app.services.search import search_terms, setup_search_index
+from conftest import booking_payload
+
+
+async def _add_guest(client, room_type_id: str, first_name: str, last_name: str, email: str, phone: str) -> dict:
+    payload = booking_payload([room_type_id], date(2032, 8, 1), 1, email)
+    payload["guest"].update(first_name=first_name, last_name=last_name, phone=phone)
+    response = await client.post("/bookings", json=payload)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def _search(client, query: str) -> dict:
+    response = await client.get("/search", params={"q": query})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def _scenario(client) -> None:
+    await setup_search_index(engine)
+    room_type_id = await client.create_room_type("Deluxe", 100, 10)
+    await _add_guest(client, room_type_id, "Sharma", "Iyer", "first@example.com", "+44 20 7946 0000")
+    by_last_name = await _add_guest(client, room_type_id, "Priya", "Sharma", "last@example.com", "+91 98765-43210")
+
+    guests = (await _search(client, "sharma"))["guests"]
+    assert [guest["email"] for guest in guests] == ["last@example.com", "first@example.com"]
+
+    # Prefix match
+    assert [guest["email"] for guest in (await _search(client, "shar"))["guests"]][0] == "last@example.com"
+
+    for phone in ("+91 98765 43210", "9876543210", "(987) 654-3210"):
+        assert [guest["email"] for guest in (await _search(client, phone))["guests"]] == ["last@example.com"], phone
+
+    bookings = (await _search(client, by_last_name["booking_number"][:6].lower()))["bookings"]
+    assert by_last_name["id"] in [booking["id"] for booking in bookings]
+
+
+def test_search_terms_normalise_phone_numbers():
+    assert search_terms("+91 98765-43210") == ["919876543210"]
+    assert search_terms("Priya  SHARMA!") == ["priya", "sharma"]
+
+
+def test_guest_search_ranking_and_phone_formats(hotel_api):
+    hotel_api(_scenario, "search@example.com")
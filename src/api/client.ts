@@ -154,6 +154,15 @@ const tryRefreshToken = async (): Promise<boolean> => {
   return refreshPromise;
 };
 
+// Cursor paginated list ka ek page
+export interface CursorPage<T> {
+  items: T[];
+  nextCursor: string | null;
+  // include_total=true par X-Total-Count (bade lists par estimate)
+  total: number | null;
+  totalEstimated: boolean;
+}
+
 // Main API client
 export const apiClient = {
   get: async <T>(endpoint: string, params?: Record<string, string>): Promise<T> => {
@@ -183,6 +192,46 @@ export const apiClient = {
     }
   },
 
+  // Cursor paginated list ka ek page - next cursor X-Next-Cursor header mein
+  getPage: async <T>(endpoint: string, params?: Record<string, string>): Promise<CursorPage<T>> => {
+    const url = new URL(`${API_BASE_URL}${endpoint}`);
+    if (params) {
+      Object.entries(params).forEach(([key, value]) => {
+        url.searchParams.append(key, value);
+      });
+    }
+
+    const controller = new AbortController();
+    const timeoutId = setTimeout(() => controller.abort(), 30000);
+
+    // Token refresh ke baad retry ho toh headers usi (last) response ke
+    const last: { response?: Response } = {};
+    const makeRequest = async () => {
+      last.response = await fetch(url.toString(), {
+        method: 'GET',
+        headers: getHeaders(),
+        signal: controller.signal,
+      });
+      return last.response;
+    };
+
+    try {
+      const items = await handleResponse<T[]>(await makeRequest(), makeRequest);
+      clearTimeout(timeoutId);
+      const headers = last.response?.headers;
+      const total = headers?.get('X-Total-Count');
+      return {
+        items,
+        nextCursor: headers?.get('X-Next-Cursor') ?? null,
+        total: total ? Number(total) : null,
+        totalEstimated: headers?.get('X-Total-Count-Estimated') === 'true',
+      };
+    } catch (error) {
+      clearTimeout(timeoutId);
+      throw error;
+    }
+  },
+
   post: async <T>(endpoint: string, data?: unknown): Promise<T> => {
     const controller = new AbortController();
     const timeoutId = setTimeout(() => controller.abort(), 30000);
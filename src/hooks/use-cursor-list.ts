@@ -0,0 +1,60 @@
+import * as React from "react";
+
+import { apiClient } from "@/api/client";
+
+const DEFAULT_PAGE_SIZE = 50;
+
+// Cursor paginated list - pehla page mount par, agla page sirf loadMore() par (X-Next-Cursor se)
+export function useCursorList<T>(endpoint: string, pageSize: number = DEFAULT_PAGE_SIZE) {
+  const [items, setItems] = React.useState<T[]>([]);
+  const [nextCursor, setNextCursor] = React.useState<string | null>(null);
+  const [total, setTotal] = React.useState<number | null>(null);
+  const [totalEstimated, setTotalEstimated] = React.useState(false);
+  const [isLoading, setIsLoading] = React.useState(true);
+  const [isLoadingMore, setIsLoadingMore] = React.useState(false);
+
+  React.useEffect(() => {
+    let cancelled = false;
+    setIsLoading(true);
+    apiClient
+      .getPage<T>(endpoint, { limit: String(pageSize), include_total: "true" })
+      .then((page) => {
+        if (cancelled) return;
+        setItems(page.items);
+        setNextCursor(page.nextCursor);
+        setTotal(page.total);
+        setTotalEstimated(page.totalEstimated);
+      })
+      .catch((error) => console.error(`Failed to fetch ${endpoint}:`, error))
+      .finally(() => {
+        if (!cancelled) setIsLoading(false);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [endpoint, pageSize]);
+
+  const loadMore = React.useCallback(async () => {
+    if (!nextCursor || isLoadingMore) return;
+    setIsLoadingMore(true);
+    try {
+      const page = await apiClient.getPage<T>(endpoint, { limit: String(pageSize), cursor: nextCursor });
+      setItems((current) => [...current, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error(`Failed to fetch more ${endpoint}:`, error);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  }, [endpoint, pageSize, nextCursor, isLoadingMore]);
+
+  return {
+    items,
+    total,
+    totalEstimated,
+    hasMore: nextCursor !== null,
+    isLoading,
+    isLoadingMore,
+    loadMore,
+  };
+}
@@ -52,6 +52,7 @@ const statusConfig: Record<string, { label: string; variant: 'default' | 'second
   checked_in: { label: 'Checked In', variant: 'secondary' },
   checked_out: { label: 'Checked Out', variant: 'secondary' },
   cancelled: { label: 'Cancelled', variant: 'destructive' },
+  no_show: { label: 'No Show', variant: 'destructive' },
 };
 
 export function BookingsPage() {
@@ -145,6 +146,7 @@ export function BookingsPage() {
             <SelectItem value="confirmed">Confirmed</SelectItem>
             <SelectItem value="checked_in">Checked In</SelectItem>
             <SelectItem value="cancelled">Cancelled</SelectItem>
+            <SelectItem value="no_show">No Show</SelectItem>
           </SelectContent>
         </Select>
         <Button variant="outline" className="gap-2" onClick={() => toast({ title: 'Feature Coming Soon', description: 'Advanced filtering options are under development.' })}>
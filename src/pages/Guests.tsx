@@ -20,35 +20,50 @@ import {
 } from '@/components/ui/dropdown-menu';
 import { Avatar, AvatarFallback } from '@/components/ui/avatar';
 import { apiClient } from '@/api/client';
+import { useCursorList } from '@/hooks/use-cursor-list';
 import { Guest } from '@/types/api';
 
+// Itne characters se search server par (poori directory), usse kam par paged list
+const MIN_SEARCH_LENGTH = 2;
+const SEARCH_LIMIT = 50;
+
 export function GuestsPage() {
-  const [guests, setGuests] = useState<Guest[]>([]);
-  const [isLoading, setIsLoading] = useState(true);
+  // Note: The endpoint is currently nested under /bookings/guests in the backend
+  const {
+    items: guests,
+    total,
+    totalEstimated,
+    hasMore,
+    isLoading,
+    isLoadingMore,
+    loadMore,
+  } = useCursorList<Guest>('/bookings/guests');
   const [searchQuery, setSearchQuery] = useState('');
+  const [searchResults, setSearchResults] = useState<Guest[] | null>(null);
 
+  // Search indexed /search endpoint se - sirf loaded pages filter nahi karte
   useEffect(() => {
-    const fetchGuests = async () => {
+    const query = searchQuery.trim();
+    if (query.length < MIN_SEARCH_LENGTH) {
+      setSearchResults(null);
+      return;
+    }
+    let cancelled = false;
+    const timeoutId = setTimeout(async () => {
       try {
-        setIsLoading(true);
-        // Note: The endpoint is currently nested under /bookings/guests in the backend
-        const data = await apiClient.get<Guest[]>('/bookings/guests');
-        setGuests(data);
+        const data = await apiClient.get<{ guests: Guest[] }>('/search', { q: query, limit: String(SEARCH_LIMIT) });
+        if (!cancelled) setSearchResults(data.guests);
       } catch (error) {
-        console.error('Failed to fetch guests:', error);
-      } finally {
-        setIsLoading(false);
+        console.error('Failed to search guests:', error);
       }
+    }, 300);
+    return () => {
+      cancelled = true;
+      clearTimeout(timeoutId);
     };
+  }, [searchQuery]);
 
-    fetchGuests();
-  }, []);
-
-  const filteredGuests = guests.filter(guest =>
-    guest.first_name.toLowerCase().includes(searchQuery.toLowerCase()) ||
-    guest.last_name.toLowerCase().includes(searchQuery.toLowerCase()) ||
-    guest.email.toLowerCase().includes(searchQuery.toLowerCase())
-  );
+  const filteredGuests = searchResults ?? guests;
 
   const formatCurrency = (amount: number) => {
     return new Intl.NumberFormat('en-IN', {
@@ -92,7 +107,10 @@ export function GuestsPage() {
             </div>
             <div>
               <p className="text-sm text-muted-foreground">Total Guests</p>
-              <p className="text-2xl font-bold">{guests.length}</p>
+              <p className="text-2xl font-bold">
+                {total ?? guests.length}
+                {totalEstimated ? '+' : ''}
+              </p>
             </div>
           </CardContent>
         </Card>
@@ -104,7 +122,7 @@ export function GuestsPage() {
             <div>
               <p className="text-sm text-muted-foreground">Repeat Guests</p>
               {/* Assuming we might add total_stays to Guest model later, for now mock calculation specific to this view */}
-              <p className="text-2xl font-bold">{guests.length > 0 ? Math.floor(guests.length * 0.3) : 0}</p>
+              <p className="text-2xl font-bold">{guests.length > 0 ? Math.floor((total ?? guests.length) * 0.3) : 0}</p>
             </div>
           </CardContent>
         </Card>
@@ -218,6 +236,16 @@ export function GuestsPage() {
           </CardContent>
         </Card>
       )}
+
+      {/* Agla page - search results par nahi */}
+      {searchResults === null && hasMore && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={loadMore} disabled={isLoadingMore}>
+            {isLoadingMore && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+            Load more
+          </Button>
+        </div>
+      )}
     </div>
   );
 }
@@ -1,5 +1,5 @@
 // Payments Page - Payment Management (Real API)
-import { useState, useEffect } from 'react';
+import { useState } from 'react';
 import { Search, CreditCard, IndianRupee, ArrowUpRight, ArrowDownRight, MoreHorizontal, Eye, Download, Loader2 } from 'lucide-react';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -26,7 +26,7 @@ import {
   SelectTrigger,
   SelectValue,
 } from '@/components/ui/select';
-import { apiClient } from '@/api/client';
+import { useCursorList } from '@/hooks/use-cursor-list';
 import { Payment } from '@/types/api';
 
 const statusConfig: Record<string, { label: string; variant: 'default' | 'secondary' | 'destructive' | 'outline' }> = {
@@ -44,27 +44,18 @@ interface PaymentWithDetails extends Payment {
 }
 
 export function PaymentsPage() {
-  const [payments, setPayments] = useState<PaymentWithDetails[]>([]);
-  const [isLoading, setIsLoading] = useState(true);
+  const {
+    items: payments,
+    total,
+    totalEstimated,
+    hasMore,
+    isLoading,
+    isLoadingMore,
+    loadMore,
+  } = useCursorList<PaymentWithDetails>('/payments');
   const [searchQuery, setSearchQuery] = useState('');
   const [statusFilter, setStatusFilter] = useState('all');
 
-  useEffect(() => {
-    const fetchPayments = async () => {
-      try {
-        setIsLoading(true);
-        const data = await apiClient.get<PaymentWithDetails[]>('/payments');
-        setPayments(data);
-      } catch (error) {
-        console.error('Failed to fetch payments:', error);
-      } finally {
-        setIsLoading(false);
-      }
-    };
-
-    fetchPayments();
-  }, []);
-
   const formatCurrency = (amount: number) => {
     return new Intl.NumberFormat('en-IN', {
       style: 'currency',
@@ -128,7 +119,9 @@ export function PaymentsPage() {
             <div className="text-2xl font-bold text-success">{formatCurrency(totalRevenue)}</div>
             <div className="flex items-center text-xs text-muted-foreground">
               <span className="text-success">Live</span>
-              <span className="ml-1">from {payments.length} transactions</span>
+              <span className="ml-1">
+                from {payments.length} of {total ?? payments.length}{totalEstimated ? '+' : ''} loaded transactions
+              </span>
             </div>
           </CardContent>
         </Card>
@@ -245,6 +238,16 @@ export function PaymentsPage() {
           )}
         </CardContent>
       </Card>
+
+      {/* Agla page X-Next-Cursor se - filters loaded payments par */}
+      {hasMore && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={loadMore} disabled={isLoadingMore}>
+            {isLoadingMore && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+            Load more
+          </Button>
+        </div>
+      )}
     </div>
   );
 }
@@ -32,7 +32,9 @@ interface DashboardStats {
     totalRevenue: number;
     totalBookings: number;
     occupancyRate: number;
-    netProfit: number;
+    adr: number;
+    revpar: number;
+    netCollected: number;
   };
   revenueChart: { date: string; revenue: number; bookings: number }[];
   occupancyChart: { date: string; occupancy: number }[];
@@ -234,12 +236,14 @@ export function ReportsPage() {
 
         <Card>
           <CardHeader className="flex flex-row items-center justify-between space-y-0 pb-2">
-            <CardTitle className="text-sm font-medium">Net Profit (Est.)</CardTitle>
+            <CardTitle className="text-sm font-medium">Net Collected</CardTitle>
             <IndianRupee className="h-4 w-4 text-muted-foreground" />
           </CardHeader>
           <CardContent>
-            <div className="text-2xl font-bold">{formatCurrency(stats?.summary.netProfit ?? 0)}</div>
-            <p className="text-xs text-muted-foreground">~70% margin</p>
+            <div className="text-2xl font-bold">{formatCurrency(stats?.summary.netCollected ?? 0)}</div>
+            <p className="text-xs text-muted-foreground">
+              ADR {formatCurrency(stats?.summary.adr ?? 0)} · RevPAR {formatCurrency(stats?.summary.revpar ?? 0)}
+            </p>
           </CardContent>
         </Card>
       </div>
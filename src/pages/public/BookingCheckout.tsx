@@ -77,7 +77,8 @@ export default function BookingCheckout() {
                         price_per_night: room.price_per_night,
                         total_price: totalPrice,
                         guests: Number(guests) || 1,
-                        rate_plan_id: room.rate_plan_id || 'standard',
+                        // Plan na ho toh null - server base price lagata hai (anjaan plan id par 400)
+                        rate_plan_id: room.rate_plan_id || null,
                         rate_plan_name: room.rate_plan_name || 'Standard Rate'
                     }
                 ],
@@ -173,7 +173,7 @@ export interface AvailabilityUpdate {
 }
 
 // ============== Booking Types ==============
-export type BookingStatus = 'pending' | 'confirmed' | 'cancelled' | 'checked_in' | 'checked_out';
+export type BookingStatus = 'pending' | 'confirmed' | 'cancelled' | 'checked_in' | 'checked_out' | 'no_show';
 
 export interface Booking {
   id: string;